@@ -1,6 +1,14 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.database import engine, Base
+from core.cache import full_view_cache
+from core.events import event_broker
+from core.background import start_background_jobs, stop_background_jobs, background_job_stats
+from core.config import get_settings
+from core.rate_limit import RateLimitMiddleware, make_backend
+from core.compression import CompressionMiddleware
+from core.single_flight import single_flight
 from modules.testing_request.routes import router as testing_router
 from modules.design_request.routes import router as design_router
 from modules.calibration_request.routes import router as calibration_router
@@ -9,13 +17,50 @@ from modules.debugging_request.routes import router as debugging_router
 from modules.simulation_request.routes import router as simulation_request_router
 from modules.product_details.routes import router as product_details_router
 from modules.auth.routes import router as auth_router
-from modules.lab_request.routes import router as lab_request_router
+from modules.auth.token_cache import token_cache, user_cache
+from modules.auth.hashing import password_hasher
+from modules.auth.dependencies import rate_limit_identity
+from modules.lab_request.routes import router as lab_request_router, status_config_router
 from modules.labs.routes import router as labs_router
+from modules.changes.routes import router as changes_router
+from modules.analytics.routes import router as analytics_router
+from modules.search.routes import router as search_router
+from modules.catalog.routes import router as catalog_router
+from modules.export.routes import router as export_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background jobs (lab sync outbox dispatcher, ...)
+    start_background_jobs()
+    yield
+    stop_background_jobs()
+    password_hasher.shutdown()
 
 app = FastAPI(
     title="Compliance Services Platform - All Modules",
     description="Backend API for compliance testing services",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+settings = get_settings()
+
+# ✅ gzip / brotli for large JSON, NDJSON and CSV responses; responses that
+# are already encoded (precompressed cached payloads) pass straight through
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY
+)
+
+# ✅ Rate limiting per user / IP and route class (added before CORS so that
+# 429 responses still carry the CORS headers)
+app.add_middleware(
+    RateLimitMiddleware,
+    backend=make_backend(settings.RATE_LIMIT_BACKEND, settings.RATE_LIMIT_SQLITE_PATH),
+    limits=settings.RATE_LIMITS,
+    identify=rate_limit_identity
 )
 
 # ✅ CORS Configuration - Allow frontend access
@@ -44,7 +89,13 @@ app.include_router(simulation_request_router)
 app.include_router(product_details_router)  # ✅ NEW ROUTER
 app.include_router(auth_router)
 app.include_router(lab_request_router)  # ✅ Lab Request Router
+app.include_router(status_config_router)
 app.include_router(labs_router, prefix="/api")
+app.include_router(changes_router)
+app.include_router(analytics_router)
+app.include_router(search_router)
+app.include_router(catalog_router)
+app.include_router(export_router)
 
 @app.get("/")
 def root():
@@ -61,8 +112,19 @@ def root():
             "debugging": "/debugging-requests",
             "simulation": "/simulation-requests",
             "auth": "/auth",
+            "changes": "/changes?since=<seq>",
+            "status_config": "/status-config",
+            "lab_analytics": "/analytics/labs",
+            "search": "/search?q=<serial / model / product name>",
+            "catalog": "/catalog/requests?standard=&region=",
+            "export": "/export/{lab-requests|product-submissions}.{csv|ndjson}",
             "docs": "/docs",
-            "health": "/health"
+            "health": "/health",
+            "cache_stats": "/health/cache",
+            "auth_cache_stats": "/health/auth",
+            "event_stats": "/health/events",
+            "job_stats": "/health/jobs",
+            "coalescing_stats": "/health/coalescing"
         }
     }
 
@@ -74,6 +136,31 @@ def health_check():
         "version": "1.0.0"
     }
 
+@app.get("/health/cache")
+def cache_stats():
+    """Hit/miss counters for the /{service}/{id}/full response cache"""
+    return full_view_cache.stats()
+
+@app.get("/health/auth")
+def auth_cache_stats():
+    """Hit/miss counters for the decoded-token and user caches, hash pool load"""
+    return {"tokens": token_cache.stats(), "users": user_cache.stats(), "hashing": password_hasher.stats()}
+
+@app.get("/health/events")
+def event_stats():
+    """Open Server-Sent Events subscriptions"""
+    return event_broker.stats()
+
+@app.get("/health/jobs")
+def job_stats():
+    """Background job runs/failures (e.g. lab sync outbox dispatcher)"""
+    return background_job_stats()
+
+@app.get("/health/coalescing")
+def coalescing_stats():
+    """Computed vs coalesced (shared in-flight) list reads"""
+    return single_flight.stats()
+
 # Add a test endpoint for lab requests
 @app.get("/test/lab-requests")
 def test_lab_requests():
@@ -0,0 +1,95 @@
+"""
+Periodic background jobs that run in daemon threads next to the API.
+
+Each job calls its function every ``interval`` seconds, or sooner when
+``wake()`` is called (e.g. right after a commit that produced new work).
+``initial_delay`` postpones the first run (e.g. nightly jobs wait for their
+hour instead of running on every startup).
+Jobs are registered at import time and started / stopped from the app's
+startup and shutdown hooks.
+"""
+import threading
+import traceback
+
+
+class PeriodicJob:
+    def __init__(self, name: str, interval: float, func, initial_delay: float = 0):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.initial_delay = initial_delay
+        self.runs = 0
+        self.failures = 0
+        self.last_result = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        self._wake.set()
+
+    def run_once(self):
+        try:
+            self.last_result = self.func()
+        except Exception as e:
+            self.failures += 1
+            print(f"⚠️ Background job '{self.name}' failed: {str(e)}")
+            traceback.print_exc()
+        finally:
+            self.runs += 1
+        return self.last_result
+
+    def _loop(self):
+        if self.initial_delay:
+            self._wake.wait(self.initial_delay)
+            self._wake.clear()
+        while not self._stop.is_set():
+            self.run_once()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def stats(self):
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "interval_seconds": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_result": self.last_result
+        }
+
+
+_jobs = {}
+
+
+def register_job(name: str, interval: float, func, initial_delay: float = 0) -> PeriodicJob:
+    job = PeriodicJob(name, interval, func, initial_delay)
+    _jobs[name] = job
+    return job
+
+
+def start_background_jobs():
+    for job in _jobs.values():
+        job.start()
+
+
+def stop_background_jobs():
+    for job in _jobs.values():
+        job.stop()
+
+
+def background_job_stats():
+    return {name: job.stats() for name, job in _jobs.items()}
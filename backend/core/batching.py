@@ -0,0 +1,42 @@
+"""
+Helpers for loading many records at once.
+
+Batch loaders fetch every child table with a single ``IN (...)`` query and
+then group the rows in Python, instead of issuing one query per parent row.
+"""
+from collections import defaultdict
+
+
+def unique_ids(ids):
+    """Drop duplicates from a list of ids while keeping the caller's order."""
+    return list(dict.fromkeys(ids))
+
+
+def index_by(rows, attr):
+    """Map ``getattr(row, attr)`` -> first row with that value."""
+    result = {}
+    for row in rows:
+        result.setdefault(getattr(row, attr), row)
+    return result
+
+
+def group_by(rows, attr):
+    """Map ``getattr(row, attr)`` -> list of rows with that value (order kept)."""
+    result = defaultdict(list)
+    for row in rows:
+        result[getattr(row, attr)].append(row)
+    return result
+
+
+def batch_response(requested_ids, found):
+    """
+    Shape a ``full:batch`` response.
+
+    ``found`` maps id -> payload; results keep the order the ids were requested
+    in and ids that do not exist are reported separately.
+    """
+    ids = unique_ids(requested_ids)
+    return {
+        "requests": [found[i] for i in ids if i in found],
+        "not_found": [i for i in ids if i not in found]
+    }
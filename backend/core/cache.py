@@ -0,0 +1,160 @@
+"""
+In-process cache for the nested ``/{service}/{id}/full`` views.
+
+Entries are keyed by ``(service, request_id, version)``. Write paths bump the
+version of the record they touched (after their transaction commits), which
+makes every older entry unreachable; stale entries then age out through the
+LRU / TTL limits. A cache hit never touches the database. The reverse index
+of dependencies only links entries still in the LRU: evicting an entry
+unlinks it.
+
+The cache is per process. With several uvicorn workers each worker keeps its
+own copy, and a write only invalidates the copy in the worker that served it,
+so the TTL bounds how stale another worker can be.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.config import get_settings
+
+_PENDING_KEY = "full_view_cache_pending"
+
+
+class FullViewCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # (service, id, version) -> (expires_at, value, dependencies)
+        self._versions = {}             # (service, id) -> int
+        self._dependents = {}           # (service, id) -> {(service, id, version), ...}
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------
+    # READ
+    # ------------------------------------------------------------
+    def get_many(self, service: str, ids: list, loader, depends_on=None):
+        """
+        Return {id: value} for ``ids``, calling ``loader(missing_ids)`` once for
+        the ids that are not cached. ``loader`` returns {id: value} for the ids
+        that exist. ``depends_on(value)`` may name other (service, id) keys
+        whose invalidation must also invalidate this entry.
+
+        Cached values are shared between callers and must not be mutated.
+        """
+        found = {}
+        missing = {}
+        now = time.monotonic()
+
+        with self._lock:
+            for request_id in ids:
+                version = self._versions.get((service, request_id), 0)
+                key = (service, request_id, version)
+                entry = self._entries.get(key)
+                if entry and entry[0] > now:
+                    self._entries.move_to_end(key)
+                    found[request_id] = entry[1]
+                    self.hits += 1
+                else:
+                    if entry:
+                        self._drop(key)
+                    missing[request_id] = version
+                    self.misses += 1
+
+        if not missing:
+            return found
+
+        # Versions were captured before loading: if a write commits while we
+        # read, the result is stored under the old version and never served.
+        loaded = loader(list(missing))
+
+        with self._lock:
+            expires_at = time.monotonic() + self.ttl
+            for request_id, value in loaded.items():
+                key = (service, request_id, missing[request_id])
+                self._drop(key)
+                dependencies = tuple(depends_on(value)) if depends_on else ()
+                self._entries[key] = (expires_at, value, dependencies)
+                for dependency in dependencies:
+                    self._dependents.setdefault(dependency, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._drop(next(iter(self._entries)))
+
+        found.update(loaded)
+        return found
+
+    # ------------------------------------------------------------
+    # INVALIDATION
+    # ------------------------------------------------------------
+    def _drop(self, key):
+        """Remove one entry and unlink it from the reverse index. Lock held."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for dependency in entry[2]:
+            dependents = self._dependents.get(dependency)
+            if dependents is not None:
+                dependents.discard(key)
+                if not dependents:
+                    del self._dependents[dependency]
+
+    def bump(self, service: str, request_id: int):
+        """Invalidate one record and every cached view that depends on it."""
+        with self._lock:
+            records = {(service, request_id)}
+            for key in self._dependents.pop((service, request_id), ()):
+                self._drop(key)
+                # Entries of older versions were already unreachable
+                if self._versions.get(key[:2], 0) == key[2]:
+                    records.add(key[:2])
+            for record in records:
+                version = self._versions.get(record, 0)
+                self._drop(record + (version,))
+                self._versions[record] = version + 1
+
+    def invalidate_on_commit(self, db: Session, service: str, request_id: int):
+        """Bump ``(service, request_id)`` once ``db`` commits; dropped on rollback."""
+        db.info.setdefault(_PENDING_KEY, set()).add((service, request_id))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dependents.clear()
+            self._versions.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "maxsize": self.maxsize,
+                "dependencies": len(self._dependents),
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+
+settings = get_settings()
+
+full_view_cache = FullViewCache(
+    maxsize=settings.FULL_VIEW_CACHE_SIZE,
+    ttl=settings.FULL_VIEW_CACHE_TTL
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_invalidations(session):
+    for service, request_id in session.info.pop(_PENDING_KEY, ()):
+        full_view_cache.bump(service, request_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session):
+    session.info.pop(_PENDING_KEY, None)
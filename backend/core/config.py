@@ -1,4 +1,5 @@
 import os
+import json
 from functools import lru_cache
 
 class Settings:
@@ -10,6 +11,81 @@ class Settings:
         "sqlite:///database/app.db"
     )
 
+    # In-process cache for /{service}/{id}/full views
+    FULL_VIEW_CACHE_SIZE: int = int(os.getenv("FULL_VIEW_CACHE_SIZE", "2048"))
+    FULL_VIEW_CACHE_TTL: int = int(os.getenv("FULL_VIEW_CACHE_TTL", "300"))
+
+    # Server-Sent Events for lab status/progress
+    SSE_QUEUE_SIZE: int = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+    SSE_KEEPALIVE_SECONDS: int = int(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+    # Outbox dispatcher that mirrors lab changes onto service requests
+    LAB_SYNC_INTERVAL_SECONDS: int = int(os.getenv("LAB_SYNC_INTERVAL_SECONDS", "5"))
+    LAB_SYNC_BATCH_SIZE: int = int(os.getenv("LAB_SYNC_BATCH_SIZE", "200"))
+    LAB_SYNC_MAX_ATTEMPTS: int = int(os.getenv("LAB_SYNC_MAX_ATTEMPTS", "5"))
+
+    # Engineers available for auto-assignment (comma-separated user ids);
+    # engineers seen in assignments/schedules are added automatically
+    LAB_ENGINEER_IDS: tuple = tuple(
+        int(e) for e in os.getenv("LAB_ENGINEER_IDS", "").split(",") if e.strip()
+    )
+    ENGINEER_LOAD_REBUILD_SECONDS: int = int(os.getenv("ENGINEER_LOAD_REBUILD_SECONDS", "300"))
+
+    # Stage-duration ETA predictor (lab_request/eta.py)
+    ETA_REFRESH_SECONDS: int = int(os.getenv("ETA_REFRESH_SECONDS", "600"))
+    ETA_MAX_SAMPLES: int = int(os.getenv("ETA_MAX_SAMPLES", "5000"))
+
+    # SLA (hours) per lab detailed status; override with a JSON object
+    LAB_STATUS_SLA_HOURS: dict = json.loads(os.getenv(
+        "LAB_STATUS_SLA_HOURS",
+        '{"Submitted": 24, "Under Review": 48, "Quote Sent": 72, "Awaiting Sample": 168, "Report Review": 48}'
+    ))
+    SLA_CHECK_SECONDS: int = int(os.getenv("SLA_CHECK_SECONDS", "300"))
+
+    # Downsampling of old lab progress history (lab_request/progress_compaction.py)
+    PROGRESS_COMPACTION_SECONDS: int = int(os.getenv("PROGRESS_COMPACTION_SECONDS", "3600"))
+    PROGRESS_COMPACT_AFTER_DAYS: int = int(os.getenv("PROGRESS_COMPACT_AFTER_DAYS", "30"))
+    PROGRESS_COMPACT_MIN_STEP: int = int(os.getenv("PROGRESS_COMPACT_MIN_STEP", "10"))
+    PROGRESS_COMPACT_BATCH_SIZE: int = int(os.getenv("PROGRESS_COMPACT_BATCH_SIZE", "500"))
+
+    # Lab analytics rollups (modules/analytics): incremental refresh + nightly rebuild
+    ANALYTICS_REFRESH_SECONDS: int = int(os.getenv("ANALYTICS_REFRESH_SECONDS", "60"))
+    ANALYTICS_BATCH_SIZE: int = int(os.getenv("ANALYTICS_BATCH_SIZE", "1000"))
+    ANALYTICS_REBUILD_HOUR: int = int(os.getenv("ANALYTICS_REBUILD_HOUR", "2"))  # UTC
+
+    # Auth dependencies (modules/auth): decoded-token LRU + user row cache
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+    AUTH_USER_CACHE_SIZE: int = int(os.getenv("AUTH_USER_CACHE_SIZE", "10000"))
+    AUTH_USER_CACHE_TTL: int = int(os.getenv("AUTH_USER_CACHE_TTL", "300"))
+
+    # Password hashing (modules/auth/hashing): bcrypt cost + bounded process pool
+    AUTH_BCRYPT_ROUNDS: int = int(os.getenv("AUTH_BCRYPT_ROUNDS", "12"))
+    AUTH_HASH_WORKERS: int = int(os.getenv("AUTH_HASH_WORKERS", "2"))
+    AUTH_HASH_MAX_QUEUE: int = int(os.getenv("AUTH_HASH_MAX_QUEUE", "16"))
+
+    # Lab directory filters (states / cities) kept in memory between reloads
+    LABS_FILTERS_TTL: int = int(os.getenv("LABS_FILTERS_TTL", "300"))
+
+    # Response compression (core/compression): gzip, or brotli when installed
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    # Streaming exports (modules/export): rows fetched and encoded per page
+    EXPORT_PAGE_SIZE: int = int(os.getenv("EXPORT_PAGE_SIZE", "1000"))
+
+    # Rate limiting (core/rate_limit): memory | sqlite (shared by workers) | off
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_SQLITE_PATH: str = os.getenv("RATE_LIMIT_SQLITE_PATH", "database/rate_limits.db")
+    # Token bucket per (route class, user or IP); override with a JSON object
+    RATE_LIMITS: dict = json.loads(os.getenv(
+        "RATE_LIMITS",
+        '{"auth": {"capacity": 10, "per_second": 0.2},'
+        ' "uploads": {"capacity": 20, "per_second": 0.5},'
+        ' "reads": {"capacity": 200, "per_second": 50},'
+        ' "writes": {"capacity": 100, "per_second": 20}}'
+    ))
+
 @lru_cache()
 def get_settings():
     return Settings()
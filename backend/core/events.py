@@ -0,0 +1,126 @@
+"""
+In-process pub/sub for pushing lab updates to Server-Sent Events streams.
+
+Write paths call ``publish_on_commit(db, topic, event)``; the event is
+delivered to every subscriber of ``topic`` once the transaction commits.
+Each subscriber owns a bounded asyncio queue. When a slow client lets its
+queue fill up, the oldest event is dropped so publishers never block.
+
+Subscribers only see events published by the same process. Run a single
+worker (or put a shared broker in front) if SSE clients and lab writers can
+land on different workers.
+"""
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.config import get_settings
+
+_PENDING_KEY = "event_broker_pending"
+
+
+class Subscription:
+    def __init__(self, topic: str, maxsize: int):
+        self.topic = topic
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, payload: dict):
+        # Runs on the subscriber's event loop
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(payload)
+
+
+class EventBroker:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, topic: str) -> Subscription:
+        """Must be called from the event loop that will consume the queue."""
+        sub = Subscription(topic, self.queue_size)
+        with self._lock:
+            self._subscribers[topic].add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            subs = self._subscribers.get(sub.topic)
+            if subs:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.topic]
+
+    def publish(self, topic: str, payload: dict):
+        """Thread-safe; callable from sync route handlers in the threadpool."""
+        with self._lock:
+            subs = list(self._subscribers.get(topic, ()))
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, payload)
+            except RuntimeError:
+                # Subscriber's loop already closed
+                self.unsubscribe(sub)
+
+    def publish_on_commit(self, db: Session, topic: str, payload: dict):
+        db.info.setdefault(_PENDING_KEY, []).append((topic, payload))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "topics": len(self._subscribers),
+                "subscribers": sum(len(s) for s in self._subscribers.values())
+            }
+
+
+def format_sse(event_type: str, payload: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+async def sse_stream(request, sub: Subscription, initial: dict = None):
+    """
+    Yield SSE frames for ``sub`` until the client disconnects. ``initial`` is
+    sent first so a client that connects mid-way starts from current state.
+    """
+    keepalive = settings.SSE_KEEPALIVE_SECONDS
+    try:
+        if initial is not None:
+            yield format_sse("snapshot", initial)
+        while True:
+            try:
+                payload = await asyncio.wait_for(sub.queue.get(), timeout=keepalive)
+                yield format_sse(payload.get("type", "message"), payload)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+    finally:
+        event_broker.unsubscribe(sub)
+
+
+settings = get_settings()
+
+event_broker = EventBroker(queue_size=settings.SSE_QUEUE_SIZE)
+
+
+def publish_on_commit(db: Session, topic: str, payload: dict):
+    event_broker.publish_on_commit(db, topic, payload)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session):
+    for topic, payload in session.info.pop(_PENDING_KEY, ()):
+        event_broker.publish(topic, payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
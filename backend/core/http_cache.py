@@ -0,0 +1,57 @@
+"""
+Helpers for serving read-mostly JSON payloads with HTTP caching.
+
+A ``CachedPayload`` serializes its data once, compresses the bytes once per
+supported coding (gzip, brotli when installed) and derives a strong ETag
+from them - one per coding, as the representations differ.
+``cached_json_response`` serves the precompressed variant the client
+accepts, so repeat responses do no serialization or compression work, and
+answers ``If-None-Match`` with a 304 so clients that already hold the
+payload skip the body entirely.
+"""
+import hashlib
+import json
+
+from fastapi import Request, Response
+
+from core.compression import SUPPORTED_ENCODINGS, compress, negotiate_encoding
+
+
+class CachedPayload:
+    def __init__(self, data):
+        self.data = data
+        self.body = json.dumps(data, default=str, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        # coding -> (bytes, etag); None is the identity representation
+        self.variants = {None: (self.body, self.etag)}
+        for encoding in SUPPORTED_ENCODINGS:
+            self.variants[encoding] = (compress(self.body, encoding), f'{self.etag[:-1]}-{encoding}"')
+
+    def variant(self, encoding=None):
+        """(body, etag) for a content coding from ``negotiate_encoding``."""
+        return self.variants[encoding]
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def cached_json_response(request: Request, payload: CachedPayload, max_age: int = 300) -> Response:
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    body, etag = payload.variant(encoding)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}",
+        "Vary": "Accept-Encoding"
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
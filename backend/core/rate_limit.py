@@ -0,0 +1,230 @@
+"""
+Token-bucket rate limiting for the whole API.
+
+Every request is put in a route class ("auth", "uploads", "reads", "writes")
+and charged one token from the bucket ``(route class, client)``, where the
+client is the authenticated user when the app can identify one and the
+peer IP otherwise. A bucket holds at most ``capacity`` tokens and refills at
+``per_second``; an empty bucket answers 429 with ``Retry-After`` (seconds
+until the next token).
+
+Backends:
+  MemoryRateLimitBackend - per process, an LRU-bounded dict of buckets
+  SQLiteRateLimitBackend - one row per bucket in a small SQLite file shared
+                           by every worker on the host
+
+Both check a bucket with a constant amount of work: one dict access, or
+one primary-key read + write in a single IMMEDIATE transaction. Backends that
+do blocking I/O set ``blocking = True`` and are called from the threadpool,
+so a busy SQLite file never stalls the event loop.
+"""
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from starlette.concurrency import run_in_threadpool
+
+
+class MemoryRateLimitBackend:
+    blocking = False
+
+    def __init__(self, max_buckets: int = 100000):
+        self.max_buckets = max_buckets
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()   # key -> [tokens, updated_at]
+
+    def take(self, key: str, capacity: float, per_second: float, now: float = None):
+        """Charge one token. Returns (allowed, retry_after_seconds, tokens_left)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [capacity, now]
+                if len(self._buckets) > self.max_buckets:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * per_second)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, 0.0, bucket[0]
+            return False, (1 - bucket[0]) / per_second, bucket[0]
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteRateLimitBackend:
+    """
+    Buckets shared by all workers through one SQLite file (WAL mode).
+    Rows of idle clients are pruned from time to time. When the file stays
+    locked longer than ``BUSY_TIMEOUT`` the check fails open: the request is
+    let through rather than queued behind the limiter.
+    """
+
+    blocking = True
+    PRUNE_EVERY = 10000   # checks
+    BUSY_TIMEOUT = 0.25   # seconds
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._checks = 0
+        conn = self._connection()
+        # Workers starting together may race on the schema: wait longer here
+        conn.execute("PRAGMA busy_timeout = 5000")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_buckets ("
+            " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(self.BUSY_TIMEOUT * 1000)}")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=self.BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, capacity: float, per_second: float, now: float = None):
+        # Wall clock: monotonic clocks are not comparable across processes
+        now = time.time() if now is None else now
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            print(f"⚠️ Rate limit store busy, letting request through: {e}")
+            return True, 0.0, capacity
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM rate_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = capacity if row is None else min(
+                capacity, row[0] + max(now - row[1], 0) * per_second
+            )
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                "INSERT INTO rate_buckets (key, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (key, tokens, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._checks += 1
+        if self._checks % self.PRUNE_EVERY == 0:
+            try:
+                self.prune(now)
+            except sqlite3.OperationalError as e:
+                print(f"⚠️ Rate limit prune skipped: {e}")
+
+        if allowed:
+            return True, 0.0, tokens
+        return False, (1 - tokens) / per_second, tokens
+
+    def prune(self, now: float = None, idle_seconds: float = 3600):
+        """Drop buckets untouched for ``idle_seconds`` (they would be full anyway)."""
+        now = time.time() if now is None else now
+        self._connection().execute("DELETE FROM rate_buckets WHERE updated_at < ?", (now - idle_seconds,))
+
+    def clear(self):
+        self._connection().execute("DELETE FROM rate_buckets")
+
+
+def make_backend(kind: str, sqlite_path: str = None):
+    if kind == "memory":
+        return MemoryRateLimitBackend()
+    if kind == "sqlite":
+        return SQLiteRateLimitBackend(sqlite_path)
+    if kind == "off":
+        return None
+    raise ValueError(f"Unknown rate limit backend: {kind}")
+
+
+# ------------------------------------------------------------
+# ROUTE CLASSES
+# ------------------------------------------------------------
+EXEMPT_PREFIXES = ("/health", "/docs", "/redoc", "/openapi.json")
+
+
+def classify_request(method: str, path: str, headers: dict):
+    """Route class of a request, or None when it is not limited."""
+    if method == "OPTIONS" or path.startswith(EXEMPT_PREFIXES):
+        return None
+    if path.startswith("/auth/"):
+        return "auth"
+    if headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+        return "uploads"
+    if method in ("GET", "HEAD"):
+        return "reads"
+    return "writes"
+
+
+# ------------------------------------------------------------
+# ASGI MIDDLEWARE
+# ------------------------------------------------------------
+class RateLimitMiddleware:
+    """
+    limits:   {route class: {"capacity": n, "per_second": r}}
+    identify: optional callable(headers) -> client id (e.g. "user:7") or None;
+              requests it cannot identify are limited per IP.
+    """
+
+    def __init__(self, app, backend, limits: dict, identify=None, classify=classify_request):
+        self.app = app
+        self.backend = backend
+        self.limits = limits
+        self.identify = identify
+        self.classify = classify
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.backend is None:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or ())
+        route_class = self.classify(scope["method"], scope["path"], headers)
+        limit = self.limits.get(route_class) if route_class else None
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        client = self.identify(headers) if self.identify else None
+        if client is None:
+            peer = scope.get("client")
+            client = f"ip:{peer[0] if peer else 'unknown'}"
+
+        key = f"{route_class}:{client}"
+        if self.backend.blocking:
+            allowed, retry_after, _ = await run_in_threadpool(
+                self.backend.take, key, limit["capacity"], limit["per_second"]
+            )
+        else:
+            allowed, retry_after, _ = self.backend.take(key, limit["capacity"], limit["per_second"])
+        if allowed:
+            return await self.app(scope, receive, send)
+
+        body = json.dumps({"detail": "Rate limit exceeded", "route_class": route_class}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,23 @@
+"""
+One-pass JSON responses for read endpoints.
+
+Read views are pydantic models (``from_attributes``) built straight from ORM
+rows. Returning them - or plain dicts / lists holding them - through
+``FastJSONResponse`` encodes the whole payload with pydantic-core's native
+serializer in a single pass. FastAPI's default path (``jsonable_encoder``
+then ``json.dumps``) first rebuilds the payload as a tree of plain dicts and
+then walks it again.
+
+Declare the view as ``response_model`` for the OpenAPI schema and return the
+response object itself, so FastAPI does not validate the payload a second
+time.
+"""
+from fastapi.responses import Response
+from pydantic_core import to_json
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return to_json(content)
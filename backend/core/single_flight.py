@@ -0,0 +1,93 @@
+"""
+Single-flight coalescing of identical concurrent reads.
+
+When a read is already being computed for a key, later callers with the same
+key wait for that computation and receive its result instead of running the
+same queries again; a dashboard stampede becomes one query. Nothing is
+cached: once the leader finishes, the next caller computes afresh.
+
+Keys must include everything the result depends on - the route, its
+normalized parameters and the auth scope (e.g. owner id) - see
+``request_key``. Results are shared between callers and must not be
+mutated. Read routes here are sync (threadpool), so waiting is a plain
+threading.Event.
+"""
+import threading
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+def _normalize(value):
+    # Only changes that cannot change a result: surrounding whitespace, order
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(sorted(_normalize(v) for v in value))
+    return value
+
+
+def request_key(route: str, scope=None, **params):
+    """(route, auth scope, sorted non-None params with stripped strings)"""
+    return (
+        route,
+        scope,
+        tuple(sorted((name, _normalize(value)) for name, value in params.items() if value is not None))
+    )
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.computed = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """Return fn(), sharing one in-flight call among concurrent callers of ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.computed += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            total = self.computed + self.coalesced
+            return {
+                "in_flight": len(self._calls),
+                "computed": self.computed,
+                "coalesced": self.coalesced,
+                "coalesced_rate": round(self.coalesced / total, 4) if total else 0.0
+            }
+
+
+single_flight = SingleFlight()
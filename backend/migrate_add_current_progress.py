@@ -0,0 +1,52 @@
+"""
+Migration script to add current_progress to lab_requests, backfilled from
+each request's latest lab_request_progress row, plus the updated_at index
+used by progress compaction.
+Run this script once to update the existing database schema
+"""
+import sqlite3
+from pathlib import Path
+
+# Get database path
+db_path = Path(__file__).parent / "database" / "app.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    exit(1)
+
+print(f"Connecting to database: {db_path}")
+
+conn = sqlite3.connect(str(db_path))
+cursor = conn.cursor()
+
+try:
+    cursor.execute("PRAGMA table_info(lab_requests)")
+    columns = [column[1] for column in cursor.fetchall()]
+
+    if 'current_progress' in columns:
+        print("Column 'current_progress' already exists in lab_requests table. No migration needed.")
+    else:
+        print("Adding 'current_progress' column to lab_requests table...")
+        cursor.execute("ALTER TABLE lab_requests ADD COLUMN current_progress INTEGER")
+        cursor.execute("""
+            UPDATE lab_requests SET current_progress = (
+                SELECT p.progress_percent FROM lab_request_progress p
+                WHERE p.lab_request_id = lab_requests.id
+                ORDER BY p.updated_at DESC, p.id DESC
+                LIMIT 1
+            )
+        """)
+        backfilled = cursor.rowcount
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_lab_request_progress_updated_at "
+            "ON lab_request_progress (updated_at)"
+        )
+        conn.commit()
+        print(f"✓ Successfully added 'current_progress' ({backfilled} lab requests backfilled)")
+
+except sqlite3.Error as e:
+    print(f"Error: {e}")
+    conn.rollback()
+finally:
+    conn.close()
+    print("Migration completed.")
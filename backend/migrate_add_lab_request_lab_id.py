@@ -0,0 +1,44 @@
+"""
+Migration script to add lab_id / lab_name to lab_requests and the
+(lab_id, status, created_date) index behind the per-lab inbox.
+Existing lab requests stay unrouted (lab_id NULL).
+Run this script once to update the existing database schema
+"""
+import sqlite3
+from pathlib import Path
+
+# Get database path
+db_path = Path(__file__).parent / "database" / "app.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    exit(1)
+
+print(f"Connecting to database: {db_path}")
+
+conn = sqlite3.connect(str(db_path))
+cursor = conn.cursor()
+
+try:
+    cursor.execute("PRAGMA table_info(lab_requests)")
+    columns = [column[1] for column in cursor.fetchall()]
+
+    if 'lab_id' in columns:
+        print("Column 'lab_id' already exists in lab_requests table. No migration needed.")
+    else:
+        print("Adding 'lab_id' / 'lab_name' columns to lab_requests table...")
+        cursor.execute("ALTER TABLE lab_requests ADD COLUMN lab_id INTEGER")
+        cursor.execute("ALTER TABLE lab_requests ADD COLUMN lab_name VARCHAR")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_lab_requests_inbox "
+            "ON lab_requests (lab_id, status, created_date)"
+        )
+        conn.commit()
+        print("✓ Successfully added 'lab_id' / 'lab_name' and the inbox index")
+
+except sqlite3.Error as e:
+    print(f"Error: {e}")
+    conn.rollback()
+finally:
+    conn.close()
+    print("Migration completed.")
@@ -0,0 +1,58 @@
+"""
+Migration script to add source_service / source_request_id to lab_requests
+and backfill them from calibration_requests.lab_request_id.
+Run this script once to update the existing database schema
+(the lab_sync_outbox table itself is created on app startup).
+"""
+import sqlite3
+from pathlib import Path
+
+# Get database path
+db_path = Path(__file__).parent / "database" / "app.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    exit(1)
+
+print(f"Connecting to database: {db_path}")
+
+conn = sqlite3.connect(str(db_path))
+cursor = conn.cursor()
+
+try:
+    cursor.execute("PRAGMA table_info(lab_requests)")
+    columns = [column[1] for column in cursor.fetchall()]
+
+    if 'source_service' in columns:
+        print("Columns already exist in lab_requests table. No migration needed.")
+    else:
+        print("Adding source_service / source_request_id columns to lab_requests table...")
+        cursor.execute("ALTER TABLE lab_requests ADD COLUMN source_service VARCHAR")
+        cursor.execute("ALTER TABLE lab_requests ADD COLUMN source_request_id INTEGER")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_lab_requests_source "
+            "ON lab_requests (source_service, source_request_id)"
+        )
+
+        # Backfill links for lab requests created from calibration requests
+        cursor.execute("""
+            UPDATE lab_requests
+            SET source_service = 'calibration',
+                source_request_id = (
+                    SELECT id FROM calibration_requests
+                    WHERE calibration_requests.lab_request_id = lab_requests.id
+                )
+            WHERE id IN (
+                SELECT lab_request_id FROM calibration_requests
+                WHERE lab_request_id IS NOT NULL
+            )
+        """)
+        conn.commit()
+        print(f"✓ Successfully added columns; linked {cursor.rowcount} lab requests to calibration requests")
+
+except sqlite3.Error as e:
+    print(f"Error: {e}")
+    conn.rollback()
+finally:
+    conn.close()
+    print("Migration completed.")
@@ -0,0 +1,35 @@
+"""
+Migration script to add the (engineer_id, end_datetime, start_datetime)
+index used for schedule conflict detection and free-slot search.
+Run this script once to update the existing database schema
+"""
+import sqlite3
+from pathlib import Path
+
+# Get database path
+db_path = Path(__file__).parent / "database" / "app.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    exit(1)
+
+print(f"Connecting to database: {db_path}")
+
+conn = sqlite3.connect(str(db_path))
+cursor = conn.cursor()
+
+try:
+    print("Creating ix_lab_schedule_engineer_window on lab_schedule...")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_lab_schedule_engineer_window "
+        "ON lab_schedule (engineer_id, end_datetime, start_datetime)"
+    )
+    conn.commit()
+    print("✓ Index ready")
+
+except sqlite3.Error as e:
+    print(f"Error: {e}")
+    conn.rollback()
+finally:
+    conn.close()
+    print("Migration completed.")
@@ -0,0 +1,71 @@
+"""
+Migration script to add owner_id to every service request table, lab_requests
+and product_details_submissions, plus the (owner_id, created_at) indexes used
+by the per-customer lists. Existing rows stay anonymous (owner_id NULL).
+Run this script once to update the existing database schema
+"""
+import sqlite3
+from pathlib import Path
+
+# (table, creation timestamp column)
+TABLES = [
+    ("calibration_requests", "created_at"),
+    ("testing_requests", "created_at"),
+    ("design_requests", "created_at"),
+    ("simulation_requests", "created_at"),
+    ("certification_requests", "created_at"),
+    ("debugging_requests", "created_at"),
+    ("lab_requests", "created_date"),
+    ("product_details_submissions", "created_at"),
+]
+
+# Get database path
+db_path = Path(__file__).parent / "database" / "app.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    exit(1)
+
+print(f"Connecting to database: {db_path}")
+
+conn = sqlite3.connect(str(db_path))
+cursor = conn.cursor()
+
+try:
+    for table, created_column in TABLES:
+        cursor.execute(f"PRAGMA table_info({table})")
+        columns = [column[1] for column in cursor.fetchall()]
+
+        if not columns:
+            print(f"Table '{table}' not found, skipping")
+            continue
+
+        if 'owner_id' in columns:
+            print(f"Column 'owner_id' already exists in {table} table.")
+        else:
+            print(f"Adding 'owner_id' column to {table} table...")
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN owner_id INTEGER")
+
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_owner_created "
+            f"ON {table} (owner_id, {created_column})"
+        )
+
+    # Lab requests belong to the customer of their source calibration request
+    cursor.execute("""
+        UPDATE lab_requests SET owner_id = (
+            SELECT c.owner_id FROM calibration_requests c
+            WHERE c.id = lab_requests.source_request_id
+        )
+        WHERE owner_id IS NULL AND source_service = 'calibration'
+    """)
+
+    conn.commit()
+    print("✓ Successfully added 'owner_id' and owner indexes")
+
+except sqlite3.Error as e:
+    print(f"Error: {e}")
+    conn.rollback()
+finally:
+    conn.close()
+    print("Migration completed.")
@@ -0,0 +1,82 @@
+"""
+Migration script to create the global search_index table and backfill it
+from the product details of every service (plus certification product names).
+Safe to re-run: existing rows are refreshed.
+Run this script once to update the existing database schema
+"""
+import sqlite3
+from pathlib import Path
+
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateTable, CreateIndex
+
+from modules.search.models import SearchIndexEntry
+from modules.search.services import normalize_term
+
+# Get database path
+db_path = Path(__file__).parent / "database" / "app.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    exit(1)
+
+print(f"Connecting to database: {db_path}")
+
+# (kind, source table, request id column, product name column, has model/serial/manufacturer)
+SOURCES = [
+    ("calibration", "calibration_product_details", "calibration_request_id", "eut_name", True),
+    ("testing", "testing_product_details", "testing_request_id", "eut_name", True),
+    ("design", "design_product_details", "design_request_id", "eut_name", True),
+    ("simulation", "simulation_product_details", "simulation_request_id", "eut_name", True),
+    ("debugging", "debugging_product_details", "debugging_request_id", "name", True),
+    ("certification", "certification_requests", "id", "product_name", False),
+]
+
+conn = sqlite3.connect(str(db_path))
+conn.create_function("norm", 1, normalize_term)
+conn.create_function("rev", 1, lambda value: value[::-1] if value else None)
+cursor = conn.cursor()
+
+try:
+    dialect = sqlite.dialect()
+    table = SearchIndexEntry.__table__
+    cursor.execute(str(CreateTable(table, if_not_exists=True).compile(dialect=dialect)))
+    for index in table.indexes:
+        cursor.execute(str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect)))
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    existing = {row[0] for row in cursor.fetchall()}
+
+    for kind, source, id_column, name_column, has_details in SOURCES:
+        if source not in existing:
+            print(f"Table '{source}' not found, skipping {kind}")
+            continue
+
+        details = (
+            "manufacturer, model_no, serial_no" if has_details
+            else "NULL AS manufacturer, NULL AS model_no, NULL AS serial_no"
+        )
+        cursor.execute(f"""
+            INSERT OR REPLACE INTO search_index (
+                kind, record_id, product_name, manufacturer, model_no, serial_no,
+                product_name_norm, model_no_norm, serial_no_norm, serial_no_rev_norm
+            )
+            SELECT ?, record_id, product_name, manufacturer, model_no, serial_no,
+                   norm(product_name), norm(model_no), norm(serial_no), rev(norm(serial_no))
+            FROM (
+                SELECT {id_column} AS record_id, {name_column} AS product_name,
+                       {details}
+                FROM {source}
+                WHERE {id_column} IS NOT NULL
+            )
+        """, (kind,))
+        print(f"✓ Indexed {cursor.rowcount} {kind} request(s)")
+
+    conn.commit()
+
+except sqlite3.Error as e:
+    print(f"Error: {e}")
+    conn.rollback()
+finally:
+    conn.close()
+    print("Migration completed.")
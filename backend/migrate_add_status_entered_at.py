@@ -0,0 +1,60 @@
+"""
+Migration script to add status_entered_at to lab_requests (used by the SLA
+breach check) and backfill it from the latest status log, falling back to
+created_date. Run this script once to update the existing database schema
+(the lab_sla_alerts table itself is created on app startup). Re-running it
+backfills rows that were created with a NULL status_entered_at.
+"""
+import sqlite3
+from pathlib import Path
+
+# Get database path
+db_path = Path(__file__).parent / "database" / "app.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    exit(1)
+
+print(f"Connecting to database: {db_path}")
+
+conn = sqlite3.connect(str(db_path))
+cursor = conn.cursor()
+
+try:
+    cursor.execute("PRAGMA table_info(lab_requests)")
+    columns = [column[1] for column in cursor.fetchall()]
+
+    if 'status_entered_at' in columns:
+        print("Column 'status_entered_at' already exists in lab_requests table.")
+    else:
+        print("Adding 'status_entered_at' column to lab_requests table...")
+        cursor.execute("ALTER TABLE lab_requests ADD COLUMN status_entered_at DATETIME")
+
+    # Backfill: when the current detailed status was last entered
+    cursor.execute("""
+        UPDATE lab_requests
+        SET status_entered_at = COALESCE(
+            (
+                SELECT MAX(l.changed_at) FROM lab_request_status_logs l
+                WHERE l.lab_request_id = lab_requests.id
+                  AND l.current_detailed_status = lab_requests.detailed_status
+            ),
+            created_date,
+            CURRENT_TIMESTAMP
+        )
+        WHERE status_entered_at IS NULL
+    """)
+    backfilled = cursor.rowcount
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_lab_requests_status_entered "
+        "ON lab_requests (detailed_status, status_entered_at)"
+    )
+    conn.commit()
+    print(f"✓ 'status_entered_at' ready, backfilled {backfilled} rows")
+
+except sqlite3.Error as e:
+    print(f"Error: {e}")
+    conn.rollback()
+finally:
+    conn.close()
+    print("Migration completed.")
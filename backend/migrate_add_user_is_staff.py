@@ -0,0 +1,51 @@
+"""
+Migration script to add is_staff to the users table in auth.db.
+Existing users become customers (is_staff = 0); pass e-mail addresses to
+mark lab staff, e.g.
+
+    python migrate_add_user_is_staff.py engineer@lab.com manager@lab.com
+
+Run this script once to update the existing database schema
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+# Get database path
+db_path = Path(__file__).parent / "database" / "auth.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    exit(1)
+
+print(f"Connecting to database: {db_path}")
+
+conn = sqlite3.connect(str(db_path))
+cursor = conn.cursor()
+
+try:
+    cursor.execute("PRAGMA table_info(users)")
+    columns = [column[1] for column in cursor.fetchall()]
+
+    if 'is_staff' in columns:
+        print("Column 'is_staff' already exists in users table.")
+    else:
+        print("Adding 'is_staff' column to users table...")
+        cursor.execute("ALTER TABLE users ADD COLUMN is_staff BOOLEAN NOT NULL DEFAULT 0")
+
+    for email in sys.argv[1:]:
+        cursor.execute("UPDATE users SET is_staff = 1 WHERE email = ?", (email,))
+        if cursor.rowcount:
+            print(f"✓ Marked {email} as staff")
+        else:
+            print(f"User {email} not found, skipping")
+
+    conn.commit()
+    print("✓ Successfully added 'is_staff'")
+
+except sqlite3.Error as e:
+    print(f"Error: {e}")
+    conn.rollback()
+finally:
+    conn.close()
+    print("Migration completed.")
@@ -0,0 +1,49 @@
+"""
+Migration script to create the normalized standards / tests / regions tables
+(catalog_standards, catalog_tests, request_standards, request_tests,
+request_regions) and backfill them, in batches, from the existing JSON
+columns of calibration, testing, design and certification requests.
+Safe to re-run.
+Run this script once to update the existing database schema
+"""
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import Base
+from modules.catalog.models import CatalogStandard, CatalogTest, RequestStandard, RequestTest, RequestRegion
+from modules.catalog.services import backfill_request_catalog
+
+BATCH_SIZE = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+# Get database path
+db_path = Path(__file__).parent / "database" / "app.db"
+
+if not db_path.exists():
+    print(f"Database not found at {db_path}")
+    exit(1)
+
+print(f"Connecting to database: {db_path}")
+
+engine = create_engine(f"sqlite:///{db_path}")
+Session = sessionmaker(bind=engine)
+
+try:
+    Base.metadata.create_all(bind=engine, tables=[
+        model.__table__ for model in (CatalogStandard, CatalogTest, RequestStandard, RequestTest, RequestRegion)
+    ])
+
+    db = Session()
+    try:
+        totals = backfill_request_catalog(db, batch_size=BATCH_SIZE)
+    finally:
+        db.close()
+    print(f"✓ Backfilled {sum(totals.values())} source rows")
+
+except Exception as e:
+    print(f"Error: {e}")
+finally:
+    engine.dispose()
+    print("Migration completed.")
@@ -0,0 +1,21 @@
+# Lab Analytics Module
+from .routes import router
+from .models import LabWeeklyRollup, LabBacklogRollup, LabRollupRequestState, LabRollupCursor
+from .services import (
+    refresh_lab_rollups,
+    rebuild_lab_rollups,
+    get_lab_weekly_stats,
+    get_lab_backlog,
+)
+
+__all__ = [
+    "router",
+    "LabWeeklyRollup",
+    "LabBacklogRollup",
+    "LabRollupRequestState",
+    "LabRollupCursor",
+    "refresh_lab_rollups",
+    "rebuild_lab_rollups",
+    "get_lab_weekly_stats",
+    "get_lab_backlog",
+]
@@ -0,0 +1,69 @@
+# backend/modules/analytics/models.py
+
+from sqlalchemy import Column, Integer, String, Date, Float, Boolean, UniqueConstraint
+from core.database import Base
+
+
+class LabWeeklyRollup(Base):
+    """
+    Lab throughput / turnaround per (week, service_type, engineer).
+    Maintained incrementally from lab_requests, status logs and assignments;
+    engineer_id 0 = unassigned.
+    """
+    __tablename__ = "lab_weekly_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    week_start = Column(Date, nullable=False)     # Monday (UTC)
+    service_type = Column(String, nullable=False)
+    engineer_id = Column(Integer, nullable=False, default=0)
+
+    submitted = Column(Integer, nullable=False, default=0)
+    assigned = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+    reopened = Column(Integer, nullable=False, default=0)
+    turnaround_seconds = Column(Float, nullable=False, default=0)  # sum over completed
+
+    __table_args__ = (
+        UniqueConstraint("week_start", "service_type", "engineer_id", name="uq_lab_weekly_rollup"),
+    )
+
+
+class LabBacklogRollup(Base):
+    """
+    Open lab requests per (service_type, engineer), engineer_id 0 = unassigned
+    """
+    __tablename__ = "lab_backlog_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    service_type = Column(String, nullable=False)
+    engineer_id = Column(Integer, nullable=False, default=0)
+    open_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("service_type", "engineer_id", name="uq_lab_backlog_rollup"),
+    )
+
+
+class LabRollupRequestState(Base):
+    """
+    Where each lab request is currently counted in lab_backlog_rollups, so a
+    change only moves that request between two backlog rows
+    """
+    __tablename__ = "lab_rollup_request_state"
+
+    lab_request_id = Column(Integer, primary_key=True)
+    service_type = Column(String, nullable=False)
+    engineer_id = Column(Integer, nullable=False, default=0)
+    is_open = Column(Boolean, nullable=False, default=True)
+
+
+class LabRollupCursor(Base):
+    """
+    Last source row id folded into the rollups, per source table.
+    Updated in the same transaction as the rollups themselves.
+    """
+    __tablename__ = "lab_rollup_cursors"
+
+    name = Column(String, primary_key=True)       # lab_requests / status_logs / assignments
+    last_id = Column(Integer, nullable=False, default=0)
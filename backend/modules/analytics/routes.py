@@ -0,0 +1,48 @@
+# backend/modules/analytics/routes.py
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from core.database import get_db
+from modules.auth.dependencies import require_staff
+from . import services
+
+router = APIRouter(prefix="/analytics/labs", tags=["Analytics"])
+
+
+# ------------------------------------------------------------
+# WEEKLY THROUGHPUT / TURNAROUND (rollup tables only)
+# ------------------------------------------------------------
+@router.get("/weekly")
+def get_weekly_stats(
+    weeks: int = Query(12, ge=1, le=520),
+    group_by: str = Query("service_type", pattern="^(service_type|engineer|all)$"),
+    service_type: Optional[str] = None,
+    engineer_id: Optional[int] = Query(None, description="0 = unassigned"),
+    db: Session = Depends(get_db)
+):
+    return services.get_lab_weekly_stats(
+        db,
+        weeks=weeks,
+        group_by=group_by,
+        service_type=service_type,
+        engineer_id=engineer_id
+    )
+
+
+# ------------------------------------------------------------
+# CURRENT BACKLOG
+# ------------------------------------------------------------
+@router.get("/backlog")
+def get_backlog(db: Session = Depends(get_db)):
+    return services.get_lab_backlog(db)
+
+
+# ------------------------------------------------------------
+# FULL REBUILD (normally runs nightly)
+# ------------------------------------------------------------
+@router.post("/rebuild", status_code=202, dependencies=[Depends(require_staff)])
+def rebuild_rollups():
+    # ✅ Runs on the background job; repeated calls before it starts coalesce
+    services.rollup_rebuild_job.wake()
+    return {"status": "scheduled"}
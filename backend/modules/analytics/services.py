@@ -0,0 +1,353 @@
+# backend/modules/analytics/services.py
+"""
+Lab workload and turnaround rollups.
+
+The refresh job folds only source rows added since its cursors
+(lab_requests, lab_request_status_logs, lab_request_assignments) into
+lab_weekly_rollups / lab_backlog_rollups, in the same transaction that
+advances the cursors, so nothing is counted twice. A nightly rebuild
+replays all history through the same fold as a safety net.
+
+/analytics/labs endpoints read only the rollup tables.
+"""
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from core.background import register_job
+from core.config import get_settings
+from core.database import SessionLocal
+from modules.lab_request.engineer_load import is_open
+from modules.lab_request.models import LabRequest, LabRequestStatusLog, LabRequestAssignment
+
+from .models import LabWeeklyRollup, LabBacklogRollup, LabRollupRequestState, LabRollupCursor
+
+WEEKLY_METRICS = ("submitted", "assigned", "completed", "rejected", "reopened", "turnaround_seconds")
+
+UNASSIGNED = 0
+
+settings = get_settings()
+
+# Refresh and rebuild both rewrite the rollups; never interleave them
+_fold_lock = threading.Lock()
+
+
+def week_start(value: datetime):
+    return (value - timedelta(days=value.weekday())).date()
+
+
+# --------------------------------------------------------
+# FOLD NEW SOURCE ROWS INTO THE ROLLUPS
+# --------------------------------------------------------
+def _fold(db: Session, batch_size: int):
+    """
+    Fold up to ``batch_size`` new rows of each source. Does not commit.
+    Returns (rows folded, whether any source has more).
+    """
+    cursors = {c.name: c for c in db.query(LabRollupCursor).all()}
+
+    def _cursor(name):
+        if name not in cursors:
+            cursors[name] = LabRollupCursor(name=name, last_id=0)
+            db.add(cursors[name])
+        return cursors[name]
+
+    weekly = defaultdict(Counter)   # (week_start, service_type, engineer_id) -> metric deltas
+    touched = set()
+    folded = 0
+    has_more = False
+
+    # New lab requests -> submitted
+    cursor = _cursor("lab_requests")
+    rows = db.query(
+        LabRequest.id, LabRequest.service_type, LabRequest.created_date
+    ).filter(
+        LabRequest.id > cursor.last_id
+    ).order_by(LabRequest.id).limit(batch_size).all()
+    for lab_request_id, service_type, created_date in rows:
+        weekly[(week_start(created_date or datetime.utcnow()), service_type, UNASSIGNED)]["submitted"] += 1
+        touched.add(lab_request_id)
+    if rows:
+        cursor.last_id = rows[-1][0]
+    folded += len(rows)
+    has_more |= len(rows) == batch_size
+
+    # New status logs -> completed / rejected / reopened + turnaround
+    cursor = _cursor("status_logs")
+    rows = db.query(
+        LabRequestStatusLog.id,
+        LabRequestStatusLog.lab_request_id,
+        LabRequestStatusLog.previous_status,
+        LabRequestStatusLog.current_status,
+        LabRequestStatusLog.changed_at,
+        LabRequest.service_type,
+        LabRequest.created_date,
+        LabRequest.assigned_engineer_id
+    ).join(
+        LabRequest, LabRequest.id == LabRequestStatusLog.lab_request_id
+    ).filter(
+        LabRequestStatusLog.id > cursor.last_id
+    ).order_by(LabRequestStatusLog.id).limit(batch_size).all()
+    for log_id, lab_request_id, previous, current, changed_at, service_type, created_date, engineer_id in rows:
+        touched.add(lab_request_id)
+        if previous == current:
+            continue
+        changed_at = changed_at or datetime.utcnow()
+        deltas = weekly[(week_start(changed_at), service_type, engineer_id or UNASSIGNED)]
+        if current == "Completed":
+            deltas["completed"] += 1
+            if created_date:
+                deltas["turnaround_seconds"] += max((changed_at - created_date).total_seconds(), 0)
+        elif current == "Rejected":
+            deltas["rejected"] += 1
+        if previous and not is_open(previous) and is_open(current):
+            deltas["reopened"] += 1
+    if rows:
+        cursor.last_id = rows[-1][0]
+    folded += len(rows)
+    has_more |= len(rows) == batch_size
+
+    # New assignments -> assigned
+    cursor = _cursor("assignments")
+    rows = db.query(
+        LabRequestAssignment.id,
+        LabRequestAssignment.lab_request_id,
+        LabRequestAssignment.engineer_id,
+        LabRequestAssignment.assigned_at,
+        LabRequest.service_type
+    ).join(
+        LabRequest, LabRequest.id == LabRequestAssignment.lab_request_id
+    ).filter(
+        LabRequestAssignment.id > cursor.last_id
+    ).order_by(LabRequestAssignment.id).limit(batch_size).all()
+    for assignment_id, lab_request_id, engineer_id, assigned_at, service_type in rows:
+        weekly[(week_start(assigned_at or datetime.utcnow()), service_type, engineer_id)]["assigned"] += 1
+        touched.add(lab_request_id)
+    if rows:
+        cursor.last_id = rows[-1][0]
+    folded += len(rows)
+    has_more |= len(rows) == batch_size
+
+    _apply_weekly(db, weekly)
+    _apply_backlog(db, touched)
+
+    return folded, has_more
+
+
+def _apply_weekly(db: Session, weekly):
+    if not weekly:
+        return
+    stmt = sqlite_insert(LabWeeklyRollup).values([
+        {
+            "week_start": week,
+            "service_type": service_type,
+            "engineer_id": engineer_id,
+            **{metric: deltas.get(metric, 0) for metric in WEEKLY_METRICS}
+        }
+        for (week, service_type, engineer_id), deltas in weekly.items()
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["week_start", "service_type", "engineer_id"],
+        set_={
+            metric: getattr(LabWeeklyRollup, metric) + getattr(stmt.excluded, metric)
+            for metric in WEEKLY_METRICS
+        }
+    ))
+
+
+def _apply_backlog(db: Session, touched):
+    """Move each touched request from where it was counted to where it is now."""
+    if not touched:
+        return
+    ids = list(touched)
+    current = db.query(
+        LabRequest.id, LabRequest.service_type, LabRequest.assigned_engineer_id, LabRequest.status
+    ).filter(LabRequest.id.in_(ids)).all()
+    states = {
+        s.lab_request_id: s
+        for s in db.query(LabRollupRequestState).filter(LabRollupRequestState.lab_request_id.in_(ids))
+    }
+
+    backlog = Counter()
+    for lab_request_id, service_type, engineer_id, status in current:
+        engineer_id = engineer_id or UNASSIGNED
+        open_now = is_open(status)
+        state = states.get(lab_request_id)
+
+        if state:
+            if (state.service_type, state.engineer_id, state.is_open) == (service_type, engineer_id, open_now):
+                continue
+            if state.is_open:
+                backlog[(state.service_type, state.engineer_id)] -= 1
+            state.service_type, state.engineer_id, state.is_open = service_type, engineer_id, open_now
+        else:
+            db.add(LabRollupRequestState(
+                lab_request_id=lab_request_id,
+                service_type=service_type,
+                engineer_id=engineer_id,
+                is_open=open_now
+            ))
+
+        if open_now:
+            backlog[(service_type, engineer_id)] += 1
+
+    backlog = {key: delta for key, delta in backlog.items() if delta}
+    if not backlog:
+        return
+    stmt = sqlite_insert(LabBacklogRollup).values([
+        {"service_type": service_type, "engineer_id": engineer_id, "open_count": delta}
+        for (service_type, engineer_id), delta in backlog.items()
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["service_type", "engineer_id"],
+        set_={"open_count": LabBacklogRollup.open_count + stmt.excluded.open_count}
+    ))
+
+
+def refresh_lab_rollups(db: Session = None):
+    """Fold one batch of new source rows; wakes itself again while behind."""
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        with _fold_lock:
+            folded, has_more = _fold(db, settings.ANALYTICS_BATCH_SIZE)
+            db.commit()
+    finally:
+        if own_session:
+            db.close()
+
+    if has_more:
+        rollup_refresh_job.wake()
+    return folded
+
+
+def rebuild_lab_rollups(db: Session = None):
+    """Recompute every rollup from scratch in one transaction."""
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        with _fold_lock:
+            for model in (LabWeeklyRollup, LabBacklogRollup, LabRollupRequestState, LabRollupCursor):
+                db.query(model).delete()
+
+            folded = 0
+            while True:
+                count, has_more = _fold(db, settings.ANALYTICS_BATCH_SIZE)
+                folded += count
+                db.flush()
+                if not has_more:
+                    break
+            db.commit()
+    finally:
+        if own_session:
+            db.close()
+
+    print(f"📊 Lab analytics rollups rebuilt from {folded} source rows")
+    return folded
+
+
+def _seconds_until_hour(hour: int, now: datetime = None):
+    now = now or datetime.utcnow()
+    next_run = now.replace(hour=hour % 24, minute=0, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+rollup_refresh_job = register_job(
+    "lab_rollup_refresh",
+    settings.ANALYTICS_REFRESH_SECONDS,
+    refresh_lab_rollups
+)
+
+rollup_rebuild_job = register_job(
+    "lab_rollup_rebuild",
+    24 * 3600,
+    rebuild_lab_rollups,
+    initial_delay=_seconds_until_hour(settings.ANALYTICS_REBUILD_HOUR)
+)
+
+
+# --------------------------------------------------------
+# READS (rollup tables only)
+# --------------------------------------------------------
+def get_lab_weekly_stats(
+    db: Session,
+    weeks: int = 12,
+    group_by: str = "service_type",
+    service_type: str = None,
+    engineer_id: int = None
+):
+    """
+    Per-week submitted / assigned / completed / rejected / reopened counts and
+    average turnaround, grouped by "service_type", "engineer" or "all".
+    """
+    since = week_start(datetime.utcnow()) - timedelta(weeks=max(weeks, 1) - 1)
+
+    group_columns = {
+        "service_type": [LabWeeklyRollup.service_type],
+        "engineer": [LabWeeklyRollup.engineer_id],
+        "all": []
+    }[group_by]
+
+    query = db.query(
+        LabWeeklyRollup.week_start,
+        *group_columns,
+        *[func.sum(getattr(LabWeeklyRollup, metric)) for metric in WEEKLY_METRICS]
+    ).filter(LabWeeklyRollup.week_start >= since)
+    if service_type:
+        query = query.filter(LabWeeklyRollup.service_type == service_type)
+    if engineer_id is not None:
+        query = query.filter(LabWeeklyRollup.engineer_id == engineer_id)
+    rows = query.group_by(LabWeeklyRollup.week_start, *group_columns).order_by(
+        LabWeeklyRollup.week_start, *group_columns
+    ).all()
+
+    result = []
+    for row in rows:
+        week, group, values = row[0], row[1:1 + len(group_columns)], row[1 + len(group_columns):]
+        metrics = dict(zip(WEEKLY_METRICS, (v or 0 for v in values)))
+        turnaround = metrics.pop("turnaround_seconds")
+        item = {"week_start": week.isoformat()}
+        if group_by == "service_type":
+            item["service_type"] = group[0]
+        elif group_by == "engineer":
+            item["engineer_id"] = group[0] or None
+        item.update({metric: int(value) for metric, value in metrics.items()})
+        item["throughput"] = item["completed"]
+        item["avg_turnaround_hours"] = (
+            round(turnaround / item["completed"] / 3600, 2) if item["completed"] > 0 else None
+        )
+        result.append(item)
+    return result
+
+
+def get_lab_backlog(db: Session):
+    """Open lab requests by service type and by engineer."""
+    rows = db.query(LabBacklogRollup).filter(LabBacklogRollup.open_count != 0).all()
+
+    by_service = Counter()
+    by_engineer = Counter()
+    for row in rows:
+        by_service[row.service_type] += row.open_count
+        by_engineer[row.engineer_id] += row.open_count
+
+    return {
+        "total": sum(by_service.values()),
+        "by_service_type": [
+            {"service_type": service_type, "open": count}
+            for service_type, count in sorted(by_service.items())
+        ],
+        "by_engineer": [
+            {"engineer_id": engineer_id or None, "open": count}
+            for engineer_id, count in sorted(by_engineer.items(), key=lambda item: (-item[1], item[0]))
+        ],
+        "by_service_type_and_engineer": [
+            {"service_type": row.service_type, "engineer_id": row.engineer_id or None, "open": row.open_count}
+            for row in sorted(rows, key=lambda r: (r.service_type, r.engineer_id))
+        ]
+    }
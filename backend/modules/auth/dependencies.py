@@ -0,0 +1,155 @@
+# backend/modules/auth/dependencies.py
+"""
+Authentication dependencies for the service routes.
+
+``get_current_user`` requires a valid token for an active user. Decoded
+tokens and user rows come from the caches in token_cache, so a repeat
+caller costs a sha256 and two dict lookups - no HS256 verify, no auth.db
+round trip.
+
+Reads of customer data (lists, full views, batches, exports, search, event
+streams) always require a user: staff (``User.is_staff``) see every row,
+customers only the rows they own. ``get_owner_scope`` gives the owner_id to
+filter lists by, ``require_owner`` / ``owned_ids`` check single records and
+batches, ``require_staff`` guards lab-internal endpoints.
+
+``get_optional_user_id`` is only used to record the owner of new requests:
+anonymous creates are still accepted (the row stays without an owner, so
+only staff can read it back). A token that is sent but invalid or expired
+is rejected with 401.
+"""
+from typing import Optional
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from jose import jwt, JWTError
+from sqlalchemy.orm import Session
+
+from core.database import AuthSessionLocal
+from .models import User
+from .services import SECRET_KEY, ALGORITHM
+from .token_cache import CurrentUser, token_cache, user_cache
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def _unauthorized(detail: str = "Invalid or expired token"):
+    return HTTPException(
+        status_code=401,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+def decode_token(token: str) -> dict:
+    """Verified claims of ``token`` (cached until its exp); raises 401."""
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        int(claims["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        raise _unauthorized()
+    token_cache.put(token, claims)
+    return claims
+
+
+def load_user(user_id: int) -> Optional[CurrentUser]:
+    """User snapshot by id from the user cache, falling back to auth.db."""
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    generation = user_cache.generation()
+    db = AuthSessionLocal()
+    try:
+        row = db.get(User, user_id)
+        if row is None:
+            return None
+        user = CurrentUser.from_row(row)
+    finally:
+        db.close()
+    user_cache.put(user, generation)
+    return user
+
+
+def rate_limit_identity(headers: dict) -> Optional[str]:
+    """
+    Client id for core.rate_limit ("user:<id>") from raw ASGI headers;
+    None (limit by IP) when there is no valid token. Never raises.
+    """
+    authorization = headers.get(b"authorization")
+    if not authorization or authorization[:7].lower() != b"bearer ":
+        return None
+    try:
+        return f"user:{decode_token(authorization[7:].decode('latin-1').strip())['sub']}"
+    except HTTPException:
+        return None
+
+
+def get_optional_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> Optional[int]:
+    """Id of the authenticated user, or None for anonymous requests."""
+    if credentials is None:
+        return None
+    return int(decode_token(credentials.credentials)["sub"])
+
+
+def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme)
+) -> CurrentUser:
+    """The authenticated, active user; 401 otherwise."""
+    if credentials is None:
+        raise _unauthorized("Not authenticated")
+    user = load_user(int(decode_token(credentials.credentials)["sub"]))
+    if user is None or not user.is_active:
+        raise _unauthorized("User not found or inactive")
+    return user
+
+
+def require_staff(user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+    """The authenticated user if they are lab staff; 403 otherwise."""
+    if not user.is_staff:
+        raise HTTPException(status_code=403, detail="Staff access required")
+    return user
+
+
+def owner_scope(user: CurrentUser) -> Optional[int]:
+    """owner_id to filter customer data by; None (every row) for staff."""
+    return None if user.is_staff else user.id
+
+
+def get_owner_scope(user: CurrentUser = Depends(get_current_user)) -> Optional[int]:
+    return owner_scope(user)
+
+
+def can_read(user: CurrentUser, owner_id: Optional[int]) -> bool:
+    return user.is_staff or (owner_id is not None and owner_id == user.id)
+
+
+def require_owner(db: Session, model, record_id: int, user: CurrentUser):
+    """
+    403 unless ``user`` may read ``model`` row ``record_id``. A missing row
+    passes, so the route still answers with its own 404.
+    """
+    if user.is_staff:
+        return
+    row = db.query(model.owner_id).filter(model.id == record_id).first()
+    if row is not None and not can_read(user, row.owner_id):
+        raise HTTPException(status_code=403, detail="Not allowed to access this request")
+
+
+def owned_ids(db: Session, model, ids: list, user: CurrentUser) -> list:
+    """
+    The ids from ``ids`` that ``user`` may read, in order, with one query.
+    Batch routes report the others as not found.
+    """
+    scope = owner_scope(user)
+    if scope is None or not ids:
+        return list(ids)
+    owned = {
+        row.id for row in db.query(model.id).filter(model.id.in_(ids), model.owner_id == scope)
+    }
+    return [i for i in ids if i in owned]
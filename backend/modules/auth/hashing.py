@@ -0,0 +1,136 @@
+# backend/modules/auth/hashing.py
+"""
+bcrypt hashing / verification off the request threadpool.
+
+Every hash and verify runs in a small dedicated ProcessPoolExecutor, so a
+login burst keeps at most AUTH_HASH_WORKERS cores busy with bcrypt and never
+ties up the threads that serve the rest of the API. Work is admitted only
+while fewer than workers + AUTH_HASH_MAX_QUEUE jobs are in flight; beyond
+that ``PasswordHasherBusy`` is raised at once (routes answer 503 with
+Retry-After) instead of queueing the caller behind seconds of hashing.
+
+The cost factor is AUTH_BCRYPT_ROUNDS. Hashes made with any other cost are
+flagged on a successful verify and re-hashed in the same worker call, so a
+changed setting rolls out transparently as users log in.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from passlib.context import CryptContext
+
+from core.config import get_settings
+
+settings = get_settings()
+
+
+def make_context(rounds: int) -> CryptContext:
+    # min = max = default pins the cost: a hash with any other cost needs update
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds
+    )
+
+
+# ------------------------------------------------------------
+# WORKER SIDE (runs in the pool processes)
+# ------------------------------------------------------------
+_contexts = {}
+
+
+def _context(rounds: int) -> CryptContext:
+    if rounds not in _contexts:
+        _contexts[rounds] = make_context(rounds)
+    return _contexts[rounds]
+
+
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify(password: str, hashed: str, rounds: int):
+    """(matches, replacement hash when the stored cost is outdated, else None)"""
+    try:
+        return _context(rounds).verify_and_update(password, hashed)
+    except ValueError:
+        # Malformed / unknown stored hash never matches
+        return False, None
+
+
+# ------------------------------------------------------------
+# API SIDE
+# ------------------------------------------------------------
+class PasswordHasherBusy(Exception):
+    """Too many hash jobs in flight; retry shortly."""
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_queue: int, rounds: int):
+        self.workers = workers
+        self.max_in_flight = workers + max_queue
+        self.rounds = rounds
+        self._lock = threading.Lock()
+        self._executor = None
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            if self._executor is None:
+                # spawn: never fork a process that is running server threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            future = self._executor.submit(fn, *args)
+            self._in_flight += 1
+        future.add_done_callback(self._done)
+        return asyncio.wrap_future(future)
+
+    def _done(self, future):
+        with self._lock:
+            self._in_flight -= 1
+            self.completed += 1
+            # A worker died: start a fresh pool on the next submit
+            if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                self._executor = None
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str):
+        """(matches, new hash to store or None)"""
+        return await self._submit(_verify, password, hashed, self.rounds)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "rounds": self.rounds,
+                "in_flight": self._in_flight,
+                "max_in_flight": self.max_in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.AUTH_HASH_WORKERS,
+    max_queue=settings.AUTH_HASH_MAX_QUEUE,
+    rounds=settings.AUTH_BCRYPT_ROUNDS
+)
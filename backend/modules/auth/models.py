@@ -12,4 +12,6 @@ class User(AuthBase):
     email = Column(String, unique=True, index=True, nullable=False)
     password_hash = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
+    # ✅ Lab staff read every customer's requests; customers only their own
+    is_staff = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
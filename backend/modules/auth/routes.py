@@ -1,50 +1,102 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from core.database import get_auth_db, auth_engine, AuthBase
 from .models import User
-from .schemas import SignupSchema, LoginSchema, TokenResponse
-from .services import hash_password, verify_password, create_access_token
+from .schemas import SignupSchema, LoginSchema, TokenResponse, UserResponse
+from .services import create_access_token
+from .hashing import password_hasher, PasswordHasherBusy
+from .dependencies import get_current_user
+from .token_cache import CurrentUser
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 # Create users table (auth.db only)
 AuthBase.metadata.create_all(bind=auth_engine)
 
-@router.post("/signup")
-def signup(payload: SignupSchema, db: Session = Depends(get_auth_db)):
-    if db.query(User).filter(User.email == payload.email).first():
-        raise HTTPException(status_code=400, detail="Email already registered")
 
+def _busy():
+    # Hash pool saturated: fail fast instead of queueing behind bcrypt
+    return HTTPException(
+        status_code=503,
+        detail="Authentication is busy, please retry shortly",
+        headers={"Retry-After": "1"}
+    )
+
+
+def _find_user(db: Session, email: str):
+    return db.query(User).filter(User.email == email).first()
+
+
+def _create_user(db: Session, payload: SignupSchema, password_hash: str):
     user = User(
         first_name=payload.first_name,
         last_name=payload.last_name,
         company_name=payload.company_name,
         email=payload.email,
-        password_hash=hash_password(payload.password)
+        password_hash=password_hash
     )
 
     db.add(user)
     db.commit()
     db.refresh(user)
+    return user
+
+
+def _store_rehash(db: Session, user: User, new_hash: str):
+    user.password_hash = new_hash
+    db.commit()
+
+
+@router.post("/signup")
+async def signup(payload: SignupSchema, db: Session = Depends(get_auth_db)):
+    if await run_in_threadpool(_find_user, db, payload.email):
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    try:
+        password_hash = await password_hasher.hash(payload.password)
+    except PasswordHasherBusy:
+        raise _busy()
+
+    await run_in_threadpool(_create_user, db, payload, password_hash)
 
     return {"message": "User registered successfully"}
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginSchema, db: Session = Depends(get_auth_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
+async def login(payload: LoginSchema, db: Session = Depends(get_auth_db)):
+    user = await run_in_threadpool(_find_user, db, payload.email)
 
-    if not user or not verify_password(payload.password, user.password_hash):
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    token = create_access_token({"sub": str(user.id)})
+    try:
+        valid, new_hash = await password_hasher.verify(payload.password, user.password_hash)
+    except PasswordHasherBusy:
+        raise _busy()
+
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+
+    user_data = {
+        "id": user.id,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email,
+        "is_staff": bool(user.is_staff)
+    }
+
+    # ✅ Stored hash used an older bcrypt cost: upgrade it transparently
+    if new_hash:
+        await run_in_threadpool(_store_rehash, db, user, new_hash)
+
+    token = create_access_token({"sub": str(user_data["id"])})
 
     return {
         "access_token": token,
-        "user": {
-            "id": user.id,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "email": user.email
-        }
+        "user": user_data
     }
+
+@router.get("/me", response_model=UserResponse)
+def me(user: CurrentUser = Depends(get_current_user)):
+    return user._asdict()
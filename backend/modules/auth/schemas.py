@@ -16,6 +16,7 @@ class UserResponse(BaseModel):
     first_name: str
     last_name: str
     email: EmailStr
+    is_staff: bool = False
 
 class TokenResponse(BaseModel):
     access_token: str
@@ -1,12 +1,15 @@
-from passlib.context import CryptContext
 from jose import jwt
 from datetime import datetime, timedelta
 
+from core.config import get_settings
+from .hashing import make_context
+
 SECRET_KEY = "CHANGE_ME_TO_ENV_LATER"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Synchronous helpers (scripts, tests); the routes use hashing.password_hasher
+pwd_context = make_context(get_settings().AUTH_BCRYPT_ROUNDS)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -0,0 +1,173 @@
+# backend/modules/auth/token_cache.py
+"""
+In-process caches behind the auth dependencies.
+
+TokenCache   - decoded JWT claims keyed by sha256(token), bounded LRU; an
+               entry is only served until the token's own ``exp``, so a
+               cache hit never extends a token's life. Repeat requests skip
+               the HS256 verify entirely.
+UserCache    - auth.db user rows (as immutable CurrentUser snapshots) keyed
+               by id, bounded LRU with a TTL. Commits that update or delete
+               a User drop its entry, so changes (e.g. deactivation) apply on
+               the next request in this process; the TTL bounds staleness in
+               other workers. Bulk ``query(User).update()`` bypasses the
+               session tracking - call ``user_cache.invalidate()`` there.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.config import get_settings
+from .models import User
+
+_PENDING_KEY = "user_cache_pending"
+
+
+class CurrentUser(NamedTuple):
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+    company_name: Optional[str]
+    is_active: bool
+    is_staff: bool = False
+
+    @classmethod
+    def from_row(cls, user: User):
+        return cls(
+            id=user.id,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            email=user.email,
+            company_name=user.company_name,
+            is_active=bool(user.is_active),
+            is_staff=bool(user.is_staff)
+        )
+
+
+class _LRU:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key, now: float):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def _put(self, key, expires_at: float, value):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+
+class TokenCache(_LRU):
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str):
+        """Cached claims of ``token`` while it has not expired, else None."""
+        return self._get(self._key(token), time.time())
+
+    def put(self, token: str, claims: dict):
+        exp = claims.get("exp")
+        if exp is None:
+            return
+        self._put(self._key(token), float(exp), claims)
+
+
+class UserCache(_LRU):
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self._generation = 0
+
+    def get(self, user_id: int):
+        return self._get(user_id, time.monotonic())
+
+    def generation(self):
+        """Capture before loading a user; pass to put()."""
+        return self._generation
+
+    def put(self, user: CurrentUser, generation: int):
+        # An invalidation committed while the row was loading: the row may
+        # be stale, so serve it this once without caching it
+        with self._lock:
+            if generation != self._generation:
+                return
+        self._put(user.id, time.monotonic() + self.ttl, user)
+
+    def invalidate(self, user_ids):
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def stats(self):
+        return {**super().stats(), "ttl_seconds": self.ttl}
+
+
+settings = get_settings()
+
+token_cache = TokenCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE)
+
+user_cache = UserCache(
+    maxsize=settings.AUTH_USER_CACHE_SIZE,
+    ttl=settings.AUTH_USER_CACHE_TTL
+)
+
+
+# ------------------------------------------------------------
+# INVALIDATION: drop users changed by a committed transaction
+# ------------------------------------------------------------
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    # dirty / deleted still hold the pre-flush state here
+    changed = [obj.id for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)]
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_user_invalidations(session):
+    user_ids = session.info.pop(_PENDING_KEY, None)
+    if user_ids:
+        user_cache.invalidate(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_invalidations(session):
+    session.info.pop(_PENDING_KEY, None)
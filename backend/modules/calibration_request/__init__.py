@@ -16,7 +16,8 @@ from .services import (
     save_calibration_standards,
     save_calibration_lab_selection_draft,
     submit_calibration_request,
-    get_full_calibration_request
+    get_full_calibration_request,
+    get_full_calibration_requests
 )
 
 __all__ = [
@@ -35,4 +36,5 @@ __all__ = [
     "save_calibration_lab_selection_draft",
     "submit_calibration_request",
     "get_full_calibration_request",
+    "get_full_calibration_requests",
 ]
@@ -1,7 +1,7 @@
 # backend/modules/calibration_request/models.py
 # ✅ ENHANCED: Added lab_request_id to track linked lab request
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from core.database import Base
 
@@ -20,6 +20,13 @@ class CalibrationRequest(Base):
     # ✅ NEW: Link to lab request (optional - for tracking)
     lab_request_id = Column(Integer, nullable=True, index=True)
 
+    # ✅ NEW: Authenticated user who created the request (None = anonymous)
+    owner_id = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_calibration_requests_owner_created", "owner_id", "created_at"),
+    )
+
 
 class CalibrationProductDetails(Base):
     """
@@ -1,38 +1,67 @@
 # routes.py
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from pathlib import Path
 import os
 import shutil
-from core.database import get_db
+from core.database import get_db, SessionLocal
+from core.batching import batch_response
+from core.events import event_broker, sse_stream
+from core.serialization import FastJSONResponse
+from core.single_flight import single_flight, request_key
+from modules.auth.dependencies import (
+    can_read,
+    get_current_user,
+    get_optional_user_id,
+    get_owner_scope,
+    owned_ids,
+    require_owner
+)
+from modules.auth.token_cache import CurrentUser
+from modules.lab_request import services as lab_services
+from modules.changes.services import record_change
 from . import services, schemas
 from modules.calibration_request.models import CalibrationRequest, CalibrationTechnicalDocument
+from modules.lab_request.models import LabRequest
 
 
 router = APIRouter(prefix="/calibration-request", tags=["Calibration Request"])
 
 # NEW: Get all calibration requests
-@router.get("/")
-def get_all_requests(db: Session = Depends(get_db)):
-    """Get all calibration requests with their details"""
-    requests = services.get_all_calibration_requests(db)
-    return {"requests": requests}
+@router.get("/", response_model=schemas.CalibrationRequestListView, response_class=FastJSONResponse)
+def get_all_requests(
+    db: Session = Depends(get_db),
+    owner_id: Optional[int] = Depends(get_owner_scope)
+):
+    """Get all calibration requests with their details (only the caller's unless staff)"""
+    # ✅ Identical concurrent calls (same owner scope) share one computation
+    requests = single_flight.do(
+        request_key("calibration:list", scope=owner_id),
+        lambda: services.get_all_calibration_requests(db, owner_id=owner_id)
+    )
+    return FastJSONResponse({"requests": requests})
 
 # NEW: Get single calibration request with all details
-@router.get("/by-id/{calibration_id}")
-def get_request_by_cal_id(calibration_id: str, db: Session = Depends(get_db)):
+@router.get("/by-id/{calibration_id}", response_model=schemas.CalibrationFullView, response_class=FastJSONResponse)
+def get_request_by_cal_id(
+    calibration_id: str,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
+):
     """Get calibration request by CAL-{id} format"""
     try:
         # Extract numeric ID from "CAL-1" format
         request_id = int(calibration_id.replace("CAL-", ""))
+        require_owner(db, CalibrationRequest, request_id, user)
         data = services.get_full_calibration_request(db, request_id)
         
         if not data:
             raise HTTPException(status_code=404, detail="Calibration request not found")
         
-        return data
+        return FastJSONResponse(data)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid calibration ID format")
 
@@ -48,8 +77,11 @@ def get_request(calibration_request_id: int, db: Session = Depends(get_db)):
     return {"id": req.id, "status": req.status}
 
 @router.post("/")
-def start_calibration_request(db: Session = Depends(get_db)):
-    return services.create_calibration_request(db)
+def start_calibration_request(
+    db: Session = Depends(get_db),
+    owner_id: Optional[int] = Depends(get_optional_user_id)
+):
+    return services.create_calibration_request(db, owner_id=owner_id)
 
 
 @router.post("/{calibration_request_id}/product")
@@ -112,7 +144,10 @@ def save_standards(
     payload: schemas.CalibrationStandardsSchema,
     db: Session = Depends(get_db)
 ):
-    services.save_calibration_standards(db, calibration_request_id, payload)
+    try:
+        services.save_calibration_standards(db, calibration_request_id, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {"status": "saved"}
 
 
@@ -159,17 +194,92 @@ def submit(
     return {"status": "submitted"}
 
 
-@router.get("/{calibration_request_id}/full")
+@router.get("/{calibration_request_id}/full", response_model=schemas.CalibrationFullView, response_class=FastJSONResponse)
 def get_full_request(
     calibration_request_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
+    require_owner(db, CalibrationRequest, calibration_request_id, user)
     data = services.get_full_calibration_request(db, calibration_request_id)
 
     if not data:
         raise HTTPException(status_code=404, detail="Calibration request not found")
 
-    return data
+    return FastJSONResponse(data)
+
+
+def _load_stream_request(calibration_request_id: int):
+    # Short-lived session: a Depends(get_db) session would keep its pooled
+    # connection checked out until the event stream ends
+    db = SessionLocal()
+    try:
+        return db.query(
+            CalibrationRequest.id,
+            CalibrationRequest.owner_id,
+            CalibrationRequest.lab_request_id,
+            LabRequest.source_service
+        ).outerjoin(
+            LabRequest, LabRequest.id == CalibrationRequest.lab_request_id
+        ).filter(
+            CalibrationRequest.id == calibration_request_id
+        ).first()
+    finally:
+        db.close()
+
+
+# ✅ NEW: Live lab status/progress for the customer (Server-Sent Events)
+@router.get("/{calibration_request_id}/events")
+async def stream_request_events(
+    calibration_request_id: int,
+    request: Request,
+    user: CurrentUser = Depends(get_current_user)
+):
+    """
+    Pushes lab status, progress and assignment changes of every lab the
+    request was sent to as they happen, replacing polling of /full. The first
+    frame is a snapshot.
+    """
+    req = await run_in_threadpool(_load_stream_request, calibration_request_id)
+
+    if not req:
+        raise HTTPException(status_code=404, detail="Calibration request not found")
+
+    if not can_read(user, req.owner_id):
+        raise HTTPException(status_code=403, detail="Not allowed to access this request")
+
+    if not req.lab_request_id:
+        raise HTTPException(status_code=409, detail="Calibration request has not been submitted to a lab yet")
+
+    if req.source_service:
+        topic = lab_services.service_request_topic("calibration", req.id)
+    else:
+        # Legacy request: linked to its single lab request by id only
+        topic = lab_services.lab_request_topic(req.lab_request_id)
+
+    # Subscribe before reading the snapshot so no update falls in between
+    subscription = event_broker.subscribe(topic)
+    snapshot = await run_in_threadpool(
+        lab_services.load_service_request_snapshot, "calibration", req.id, req.lab_request_id
+    )
+
+    return StreamingResponse(
+        sse_stream(request, subscription, initial=snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ✅ NEW: Full details for many request cards in one call
+@router.post("/full:batch", response_class=FastJSONResponse)
+def get_full_requests_batch(
+    payload: schemas.CalibrationFullBatchSchema,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """Same payload as /{id}/full for every id, loaded with one query per table"""
+    data = services.get_full_calibration_requests(db, owned_ids(db, CalibrationRequest, payload.ids, user))
+    return FastJSONResponse(batch_response(payload.ids, data))
 
 
 # ✅ NEW: Update/Edit calibration request
@@ -260,6 +370,7 @@ def delete_document(
 
         # Delete database record
         db.delete(document)
+        record_change(db, "calibration", document.calibration_request_id)
         db.commit()
 
         return {
@@ -1,6 +1,9 @@
 # schemas.py
-from pydantic import BaseModel
-from typing import List, Optional, Dict
+import json
+from datetime import datetime
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, SkipValidation, field_validator
+from pydantic.alias_generators import to_camel
+from typing import Annotated, Any, List, Optional, Dict, Tuple, Union
 
 class DimensionsSchema(BaseModel):
     length: str
@@ -68,3 +71,147 @@ class CalibrationApprovalSchema(BaseModel):
     confirm_approve: bool
     confirm_understand: bool
 
+
+class CalibrationFullBatchSchema(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=200)
+
+
+# -----------------------------
+# Read views (built from ORM rows, see core.serialization)
+# -----------------------------
+class _ReadView(BaseModel):
+    # Cached and shared between requests: never mutate
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+# JSON columns may hold NULL; views always expose a list
+JsonList = Annotated[list, BeforeValidator(lambda value: value or [])]
+
+# Integer columns filled from free-text form fields (SQLite keeps e.g. "10cm" as is)
+FormInt = Optional[Union[int, str]]
+
+
+class CalibrationRequestHeaderView(_ReadView):
+    id: int
+    status: Optional[str]
+    created_at: Optional[datetime]
+    lab_request_id: Optional[int]
+    detailed_status: Optional[str] = None
+    customer_message: Optional[str] = None
+
+
+class CalibrationProductView(_ReadView):
+    id: int
+    eut_name: Optional[str]
+    eut_quantity: FormInt
+    manufacturer: Optional[str]
+    model_no: Optional[str]
+    serial_no: Optional[str]
+    supply_voltage: Optional[str]
+    operating_frequency: Optional[str]
+    current: Optional[str]
+    weight: Optional[str]
+    length_mm: FormInt
+    width_mm: FormInt
+    height_mm: FormInt
+    power_ports: Optional[str]
+    signal_lines: Optional[str]
+    software_name: Optional[str]
+    software_version: Optional[str]
+    industry: Any   # list (stored as a JSON array) or legacy plain string
+    industry_other: Optional[str]
+    preferred_date: Optional[str]
+    notes: Optional[str]
+
+    @field_validator("industry", mode="before")
+    @classmethod
+    def parse_industry(cls, value):
+        if isinstance(value, str) and value.startswith("["):
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                pass
+        return value
+
+
+class CalibrationRequirementsView(_ReadView):
+    id: int
+    test_type: Optional[str]
+    selected_tests: JsonList
+
+
+class CalibrationStandardsView(_ReadView):
+    id: int
+    regions: JsonList
+    standards: JsonList
+
+
+class CalibrationLabView(_ReadView):
+    id: int
+    selected_labs: JsonList
+    region: Optional[str]
+    remarks: Optional[str]
+
+
+class CalibrationDocumentView(_ReadView):
+    id: int
+    doc_type: str
+    file_name: str
+    file_path: str
+    file_size: Optional[int]
+    uploaded_at: Optional[datetime] = Field(None, validation_alias="created_at")
+
+
+class CalibrationLabProgressView(_ReadView):
+    progress_percent: int
+    notes: Optional[str]
+    updated_by: Optional[str]
+    updated_at: Optional[datetime]
+
+
+class CalibrationLinkedLabView(_ReadView):
+    id: int
+    lab_id: Optional[int]
+    lab_name: Optional[str]
+    status: Optional[str]
+    detailed_status: Optional[str]
+    customer_message: Optional[str]
+    current_progress: Optional[int]
+    estimated_completion: Optional[datetime]
+
+
+class CalibrationFullView(_ReadView):
+    calibration_request: CalibrationRequestHeaderView
+    product: Optional[CalibrationProductView]
+    requirements: Optional[CalibrationRequirementsView]
+    standards: Optional[CalibrationStandardsView]
+    lab: Optional[CalibrationLabView]
+    documents: List[CalibrationDocumentView]
+    lab_progress: List[CalibrationLabProgressView]
+    # Every lab the request was sent to; status mirrors their aggregate
+    lab_requests: List[CalibrationLinkedLabView] = []
+
+
+class CalibrationRequestSummaryView(_ReadView):
+    """One card of GET /calibration-request/ (camelCase keys for the dashboard)"""
+    model_config = ConfigDict(alias_generator=to_camel, validate_by_name=True, serialize_by_alias=True)
+
+    id: str                     # "CAL-{id}"
+    name: str
+    service: str
+    status: str
+    detailed_status: str
+    customer_message: str
+    action_required: bool
+    progress: int
+    created_at: Optional[datetime]
+    test_type: Optional[str]
+    manufacturer: Optional[str]
+    model_no: Optional[str]
+    lab_request_id: Optional[int]
+    # Precomputed, shared milestone tuples from status_config
+    timeline: SkipValidation[Tuple[Dict[str, Any], ...]]
+
+
+class CalibrationRequestListView(BaseModel):
+    requests: List[CalibrationRequestSummaryView]
@@ -4,6 +4,12 @@ import os
 import json
 from pathlib import Path
 from sqlalchemy.orm import Session
+from core.batching import unique_ids, index_by, group_by
+from core.cache import full_view_cache
+from modules.changes.services import record_change
+from modules.search.services import index_product, remove_from_index
+from modules.catalog.reference import validate_selection
+from modules.catalog.services import sync_request_standards, sync_request_tests, remove_request_catalog
 from .models import (
     CalibrationRequest,
     CalibrationProductDetails,
@@ -21,27 +27,75 @@ from .schemas import (
     CalibrationStandardsSchema,
     CalibrationLabSelectionSchema,
     CalibrationConfirmationSchema,
-    CalibrationApprovalSchema
+    CalibrationApprovalSchema,
+    CalibrationFullView,
+    CalibrationRequestHeaderView,
+    CalibrationRequestSummaryView
 )
 
 # ✅ Import lab_request services
-from modules.lab_request.services import create_lab_request as create_lab_request_entry
+from modules.lab_request.services import create_lab_requests_for_labs
+from modules.labs.services import resolve_labs
+from modules.lab_request.status_config import ACTION_REQUIRED_STATUSES, get_customer_timeline
 
-def create_calibration_request(db: Session):
-    req = CalibrationRequest(status="draft")
+def create_calibration_request(db: Session, owner_id: int = None):
+    req = CalibrationRequest(status="draft", owner_id=owner_id)
     db.add(req)
+    db.flush()
+    record_change(db, "calibration", req.id)
     db.commit()
     db.refresh(req)
     return req
 
-def get_all_calibration_requests(db: Session):
-    """Get all SUBMITTED calibration requests with live lab progress and detailed status"""
-    from modules.lab_request.models import LabRequest, LabRequestProgress
+# ✅ Customer-facing label per lab detailed status (built once, not per row)
+STATUS_DISPLAY_MAP = {
+    # Pre-testing
+    "Submitted": "Submitted",
+    "Under Review": "Under Review",
+    "Quote Preparation": "Quote Pending",
+    "Quote Sent": "Quote Sent",
+    "Quote Approved": "Approved",
+    "Quote Rejected": "Quote Declined",
+
+    # Preparation
+    "Scheduled": "Scheduled",
+    "Awaiting Sample": "Awaiting Sample",
+    "Sample Received": "Sample Received",
+
+    # Testing
+    "Testing Started": "Testing",
+    "In Progress": "Testing",
+
+    # Post-testing
+    "Tests Complete": "Tests Complete",
+    "Report Review": "Report Review",
+    "Report Ready": "Report Ready",
+
+    # Final
+    "Completed": "Complete",
+    "Certificate Issued": "Complete",
+
+    # Stopped
+    "Rejected by Lab": "Rejected",
+    "Cancelled": "Cancelled",
+    "On Hold": "On Hold"
+}
+
+
+def get_all_calibration_requests(db: Session, owner_id: int = None):
+    """
+    Get all SUBMITTED calibration requests with live lab progress and detailed status.
+    With owner_id, only that customer's requests (ix_calibration_requests_owner_created).
+    """
+    from modules.lab_request.models import LabRequest
     
     # ✅ Get submitted calibration requests
-    requests = db.query(CalibrationRequest).filter(
+    query = db.query(CalibrationRequest).filter(
         CalibrationRequest.status.in_(["submitted", "in_progress", "completed"])
-    ).all()
+    )
+    if owner_id is not None:
+        query = query.filter(CalibrationRequest.owner_id == owner_id)
+    requests = query.all()
     
     result = []
     for req in requests:
@@ -82,17 +136,12 @@ def get_all_calibration_requests(db: Session):
                     detailed_status = lab_req.detailed_status or "Submitted"
                     customer_message = lab_req.customer_message or "Processing your request..."
                     
-                    # Get latest progress
-                    latest_progress = db.query(LabRequestProgress).filter_by(
-                        lab_request_id=req.lab_request_id
-                    ).order_by(LabRequestProgress.updated_at.desc()).first()
-                    
-                    if latest_progress:
-                        lab_progress = latest_progress.progress_percent
+                    # Latest progress is kept on the lab request itself
+                    if lab_req.current_progress is not None:
+                        lab_progress = lab_req.current_progress
                     
                     # Check if action required based on detailed status
-                    action_statuses = ["Quote Sent", "Awaiting Sample", "Report Ready"]
-                    action_required = detailed_status in action_statuses
+                    action_required = detailed_status in ACTION_REQUIRED_STATUSES
                     
             except Exception as e:
                 print(f"Warning: Could not fetch lab progress: {e}")
@@ -115,57 +164,24 @@ def get_all_calibration_requests(db: Session):
         # Cap at 100%
         progress = min(progress, 100)
         
-        # ✅ Better status mapping with detailed status
-        status_display_map = {
-            # Pre-testing
-            "Submitted": "Submitted",
-            "Under Review": "Under Review",
-            "Quote Preparation": "Quote Pending",
-            "Quote Sent": "Quote Sent",
-            "Quote Approved": "Approved",
-            "Quote Rejected": "Quote Declined",
-            
-            # Preparation
-            "Scheduled": "Scheduled",
-            "Awaiting Sample": "Awaiting Sample",
-            "Sample Received": "Sample Received",
-            
-            # Testing
-            "Testing Started": "Testing",
-            "In Progress": "Testing",
-            
-            # Post-testing
-            "Tests Complete": "Tests Complete",
-            "Report Review": "Report Review",
-            "Report Ready": "Report Ready",
-            
-            # Final
-            "Completed": "Complete",
-            "Certificate Issued": "Complete",
-            
-            # Stopped
-            "Rejected by Lab": "Rejected",
-            "Cancelled": "Cancelled",
-            "On Hold": "On Hold"
-        }
-        
-        display_status = status_display_map.get(detailed_status, "Testing")
+        display_status = STATUS_DISPLAY_MAP.get(detailed_status, "Testing")
         
-        result.append({
-            "id": f"CAL-{req.id}",
-            "name": product.eut_name if product else f"Calibration Request #{req.id}",
-            "service": "Calibration",
-            "status": display_status,
-            "detailedStatus": detailed_status,
-            "customerMessage": customer_message,
-            "actionRequired": action_required,
-            "progress": progress,
-            "createdAt": req.created_at.isoformat() if req.created_at else None,
-            "testType": requirements.test_type if requirements else None,
-            "manufacturer": product.manufacturer if product else None,
-            "modelNo": product.model_no if product else None,
-            "labRequestId": req.lab_request_id,
-        })
+        result.append(CalibrationRequestSummaryView(
+            id=f"CAL-{req.id}",
+            name=product.eut_name if product else f"Calibration Request #{req.id}",
+            service="Calibration",
+            status=display_status,
+            detailed_status=detailed_status,
+            customer_message=customer_message,
+            action_required=action_required,
+            progress=progress,
+            created_at=req.created_at,
+            test_type=requirements.test_type if requirements else None,
+            manufacturer=product.manufacturer if product else None,
+            model_no=product.model_no if product else None,
+            lab_request_id=req.lab_request_id,
+            timeline=get_customer_timeline(detailed_status),
+        ))
     
     return result
 
@@ -206,6 +222,14 @@ def save_calibration_product_details(db: Session, calibration_request_id: int, p
     pd.preferred_date = payload.preferred_date
     pd.notes = payload.notes
 
+    index_product(
+        db, "calibration", calibration_request_id,
+        product_name=pd.eut_name,
+        model_no=pd.model_no,
+        serial_no=pd.serial_no,
+        manufacturer=pd.manufacturer
+    )
+    record_change(db, "calibration", calibration_request_id)
     db.commit()
 
 
@@ -224,6 +248,7 @@ def save_calibration_technical_documents(
         )
         db.add(td)
 
+    record_change(db, "calibration", calibration_request_id)
     db.commit()
 
 def save_calibration_uploaded_files(
@@ -273,6 +298,7 @@ def save_calibration_uploaded_files(
             "file_size": len(content)
         })
     
+    record_change(db, "calibration", calibration_request_id)
     db.commit()
     return saved_files
 
@@ -288,9 +314,15 @@ def save_calibration_requirements(db: Session, calibration_request_id: int, payl
     req.test_type = payload.test_type
     req.selected_tests = payload.selected_tests
 
+    sync_request_tests(db, "calibration", calibration_request_id, payload.selected_tests)
+    record_change(db, "calibration", calibration_request_id)
     db.commit()
 
 def save_calibration_standards(db: Session, calibration_request_id: int, payload: CalibrationStandardsSchema):
+    # Selections must come from the reference catalog (ids, codes or labels)
+    validate_selection("standard", payload.standards)
+    validate_selection("region", payload.regions)
+
     std = db.query(CalibrationStandards).filter(
         CalibrationStandards.calibration_request_id == calibration_request_id
     ).first()
@@ -302,6 +334,8 @@ def save_calibration_standards(db: Session, calibration_request_id: int, payload
     std.regions = payload.regions
     std.standards = payload.standards
 
+    sync_request_standards(db, "calibration", calibration_request_id, payload.standards, payload.regions)
+    record_change(db, "calibration", calibration_request_id)
     db.commit()
 
 def save_calibration_confirmation(db: Session, calibration_request_id: int, payload: CalibrationConfirmationSchema):
@@ -317,6 +351,7 @@ def save_calibration_confirmation(db: Session, calibration_request_id: int, payl
     conf.approve_plan = str(payload.approve_plan).lower()
     conf.understand_tests = str(payload.understand_tests).lower()
 
+    record_change(db, "calibration", calibration_request_id)
     db.commit()
     db.refresh(conf)
     return conf
@@ -349,6 +384,7 @@ def save_calibration_lab_selection_draft(db: Session, calibration_request_id: in
         )
         db.add(lab)
 
+    record_change(db, "calibration", calibration_request_id)
     db.commit()
     db.refresh(lab)
     return lab
@@ -390,29 +426,28 @@ def submit_calibration_request(db: Session, calibration_request_id: int, payload
 
     # Update calibration request status
     req.status = "submitted"
-    db.commit()
 
-    # ✅ Create lab request automatically
-    try:
+    # ✅ Fan out to one lab request per selected lab, in the same transaction
+    if not req.lab_request_id:
         product_name = product.eut_name if product else f"Calibration Request #{calibration_request_id}"
-        
-        lab_request = create_lab_request_entry(
-            db=db,
+
+        lab_requests = create_lab_requests_for_labs(
+            db,
             product_name=product_name,
-            service_type="Calibration"
+            service_type="Calibration",
+            labs=resolve_labs(payload.selected_labs),
+            source_service="calibration",
+            source_request_id=calibration_request_id,
+            owner_id=req.owner_id
         )
-        
-        print(f"✅ Created lab request {lab_request.id} for calibration request {calibration_request_id}")
-        
-        req.lab_request_id = lab_request.id
-        db.commit()
-        
-        print(f"✅ Linked calibration request {calibration_request_id} to lab request {lab_request.id}")
-        
-    except Exception as e:
-        print(f"⚠️ Warning: Failed to create lab request: {str(e)}")
-        import traceback
-        traceback.print_exc()
+
+        # First lab request stays the primary link for the customer views
+        req.lab_request_id = lab_requests[0].id
+
+    record_change(db, "calibration", calibration_request_id)
+    db.commit()
+
+    print(f"✅ Linked calibration request {calibration_request_id} to lab request {req.lab_request_id}")
 
     return req
 
@@ -430,6 +465,7 @@ def save_calibration_approval(db: Session, calibration_request_id: int, payload:
     approval.confirm_approve = str(payload.confirm_approve).lower()
     approval.confirm_understand = str(payload.confirm_understand).lower()
 
+    record_change(db, "calibration", calibration_request_id)
     db.commit()
     db.refresh(approval)
     return approval
@@ -438,157 +474,123 @@ def get_full_calibration_request(db: Session, calibration_request_id: int):
     """
     Get complete calibration request details including documents and lab progress
     """
-    req = db.query(CalibrationRequest).filter(
-        CalibrationRequest.id == calibration_request_id
-    ).first()
+    return get_full_calibration_requests(db, [calibration_request_id]).get(calibration_request_id)
 
-    if not req:
-        return None
 
-    # Get product details
-    product = db.query(CalibrationProductDetails).filter_by(
-        calibration_request_id=calibration_request_id
-    ).first()
+def get_full_calibration_requests(db: Session, calibration_request_ids: list):
+    """
+    Batch version of get_full_calibration_request.
 
-    # Get requirements
-    requirements = db.query(CalibrationRequirements).filter_by(
-        calibration_request_id=calibration_request_id
-    ).first()
+    Loads every child table with one IN (...) query and groups the rows in
+    Python, so N requests cost a fixed number of queries instead of N * 8.
+    Returns {calibration_request_id: CalibrationFullView} for the ids that exist.
+    Results are served from full_view_cache when possible; a cached view is
+    also dropped when any of its linked lab requests changes.
+    """
+    ids = unique_ids(calibration_request_ids)
+    if not ids:
+        return {}
 
-    # Get standards
-    standards = db.query(CalibrationStandards).filter_by(
-        calibration_request_id=calibration_request_id
-    ).first()
+    return full_view_cache.get_many(
+        "calibration",
+        ids,
+        lambda missing: _load_full_calibration_requests(db, missing),
+        depends_on=_lab_request_dependency
+    )
 
-    # Get lab selection
-    lab = db.query(CalibrationLabSelection).filter_by(
-        calibration_request_id=calibration_request_id
-    ).first()
 
-    # Get uploaded documents
-    documents = db.query(CalibrationTechnicalDocument).filter_by(
-        calibration_request_id=calibration_request_id
+def _lab_request_dependency(full_view):
+    lab_request_ids = [lab.id for lab in full_view.lab_requests]
+    if full_view.calibration_request.lab_request_id:
+        lab_request_ids.append(full_view.calibration_request.lab_request_id)
+    return [("lab_request", lab_request_id) for lab_request_id in unique_ids(lab_request_ids)]
+
+
+def _load_full_calibration_requests(db: Session, ids: list):
+    from modules.lab_request.models import LabRequestProgress
+    from modules.lab_request.services import get_linked_lab_requests
+
+    requests = db.query(CalibrationRequest).filter(
+        CalibrationRequest.id.in_(ids)
     ).all()
-    
-    # ✅ Get lab progress if available
-    lab_progress_data = []
-    detailed_status = None
-    customer_message = None
-    
-    if req.lab_request_id:
+
+    if not requests:
+        return {}
+
+    found_ids = [r.id for r in requests]
+
+    def _children(model):
+        return db.query(model).filter(
+            model.calibration_request_id.in_(found_ids)
+        ).order_by(model.id).all()
+
+    products = index_by(_children(CalibrationProductDetails), "calibration_request_id")
+    requirements = index_by(_children(CalibrationRequirements), "calibration_request_id")
+    standards = index_by(_children(CalibrationStandards), "calibration_request_id")
+    labs = index_by(_children(CalibrationLabSelection), "calibration_request_id")
+    documents = group_by(_children(CalibrationTechnicalDocument), "calibration_request_id")
+
+    # ✅ Lab status + progress for every linked lab request (one per selected lab)
+    lab_request_ids = [r.lab_request_id for r in requests if r.lab_request_id]
+    linked_labs = {}
+    lab_requests = {}
+    lab_progress = {}
+    if lab_request_ids:
         try:
-            from modules.lab_request.models import LabRequestProgress, LabRequest
-            
-            lab_req = db.query(LabRequest).filter_by(id=req.lab_request_id).first()
-            if lab_req:
-                detailed_status = lab_req.detailed_status
-                customer_message = lab_req.customer_message
-            
-            lab_progress = db.query(LabRequestProgress).filter_by(
-                lab_request_id=req.lab_request_id
-            ).order_by(LabRequestProgress.updated_at.desc()).all()
-            
-            lab_progress_data = [
-                {
-                    "progress_percent": p.progress_percent,
-                    "notes": p.notes,
-                    "updated_by": p.updated_by,
-                    "updated_at": p.updated_at.isoformat() if p.updated_at else None
-                }
-                for p in lab_progress
-            ]
+            linked_labs = get_linked_lab_requests(
+                db, "calibration", found_ids,
+                {r.id: r.lab_request_id for r in requests if r.lab_request_id}
+            )
+            lab_requests = index_by(
+                [lab for labs in linked_labs.values() for lab in labs],
+                "id"
+            )
+            lab_progress = group_by(
+                db.query(LabRequestProgress).filter(
+                    LabRequestProgress.lab_request_id.in_(lab_request_ids)
+                ).order_by(LabRequestProgress.updated_at.desc()).all(),
+                "lab_request_id"
+            )
         except Exception as e:
             print(f"Warning: Could not fetch lab progress: {e}")
 
-    # Convert SQLAlchemy objects to dictionaries
-    product_dict = None
-    if product:
-        industry_value = product.industry
-        if industry_value and isinstance(industry_value, str) and industry_value.startswith('['):
-            try:
-                industry_value = json.loads(industry_value)
-            except json.JSONDecodeError:
-                pass
-        
-        product_dict = {
-            "id": product.id,
-            "eut_name": product.eut_name,
-            "eut_quantity": product.eut_quantity,
-            "manufacturer": product.manufacturer,
-            "model_no": product.model_no,
-            "serial_no": product.serial_no,
-            "supply_voltage": product.supply_voltage,
-            "operating_frequency": product.operating_frequency,
-            "current": product.current,
-            "weight": product.weight,
-            "length_mm": product.length_mm,
-            "width_mm": product.width_mm,
-            "height_mm": product.height_mm,
-            "power_ports": product.power_ports,
-            "signal_lines": product.signal_lines,
-            "software_name": product.software_name,
-            "software_version": product.software_version,
-            "industry": industry_value,
-            "industry_other": product.industry_other,
-            "preferred_date": product.preferred_date,
-            "notes": product.notes
-        }
-
-    requirements_dict = None
-    if requirements:
-        requirements_dict = {
-            "id": requirements.id,
-            "test_type": requirements.test_type,
-            "selected_tests": requirements.selected_tests or []
-        }
-
-    standards_dict = None
-    if standards:
-        standards_dict = {
-            "id": standards.id,
-            "regions": standards.regions or [],
-            "standards": standards.standards or []
-        }
-
-    lab_dict = None
-    if lab:
-        lab_dict = {
-            "id": lab.id,
-            "selected_labs": lab.selected_labs or [],
-            "region": lab.region,
-            "remarks": lab.remarks
-        }
-
-    documents_list = []
-    if documents:
-        for doc in documents:
-            documents_list.append({
-                "id": doc.id,
-                "doc_type": doc.doc_type,
-                "file_name": doc.file_name,
-                "file_path": doc.file_path,
-                "file_size": doc.file_size,
-                "uploaded_at": doc.created_at.isoformat() if hasattr(doc, 'created_at') and doc.created_at else None
-            })
-
     return {
-        "calibration_request": {
-            "id": req.id,
-            "status": req.status,
-            "created_at": req.created_at.isoformat() if req.created_at else None,
-            "lab_request_id": req.lab_request_id,
-            "detailed_status": detailed_status,
-            "customer_message": customer_message
-        },
-        "product": product_dict,
-        "requirements": requirements_dict,
-        "standards": standards_dict,
-        "lab": lab_dict,
-        "documents": documents_list,
-        "lab_progress": lab_progress_data
+        req.id: _build_full_calibration_view(
+            req,
+            product=products.get(req.id),
+            requirements=requirements.get(req.id),
+            standards=standards.get(req.id),
+            lab=labs.get(req.id),
+            documents=documents.get(req.id, []),
+            lab_req=lab_requests.get(req.lab_request_id),
+            lab_progress=lab_progress.get(req.lab_request_id, []),
+            linked_labs=linked_labs.get(req.id, [])
+        )
+        for req in requests
     }
 
 
+def _build_full_calibration_view(req, product, requirements, standards, lab, documents, lab_req, lab_progress, linked_labs):
+    # Child views validate straight from the ORM rows (from_attributes)
+    return CalibrationFullView(
+        calibration_request=CalibrationRequestHeaderView(
+            id=req.id,
+            status=req.status,
+            created_at=req.created_at,
+            lab_request_id=req.lab_request_id,
+            detailed_status=lab_req.detailed_status if lab_req else None,
+            customer_message=lab_req.customer_message if lab_req else None
+        ),
+        product=product,
+        requirements=requirements,
+        standards=standards,
+        lab=lab,
+        documents=documents,
+        lab_progress=lab_progress,
+        lab_requests=linked_labs
+    )
+
+
 def delete_calibration_request(db: Session, calibration_request_id: int):
     """
     Delete calibration request and all associated records
@@ -627,4 +629,7 @@ def delete_calibration_request(db: Session, calibration_request_id: int):
         CalibrationRequest.id == calibration_request_id
     ).delete()
     
+    remove_from_index(db, "calibration", [calibration_request_id])
+    remove_request_catalog(db, "calibration", [calibration_request_id])
+    record_change(db, "calibration", calibration_request_id)
     db.commit()
\ No newline at end of file
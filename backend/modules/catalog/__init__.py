@@ -0,0 +1,32 @@
+# Standards / Test Catalog Module
+from .routes import router
+from .models import CatalogStandard, CatalogTest, RequestStandard, RequestTest, RequestRegion
+from .reference import CATALOG, catalog_key, canonical_name, validate_selection, autocomplete
+from .services import (
+    sync_request_standards,
+    sync_request_tests,
+    remove_request_catalog,
+    backfill_request_catalog,
+    find_open_requests,
+    get_standard_demand,
+)
+
+__all__ = [
+    "router",
+    "CatalogStandard",
+    "CatalogTest",
+    "RequestStandard",
+    "RequestTest",
+    "RequestRegion",
+    "CATALOG",
+    "catalog_key",
+    "canonical_name",
+    "validate_selection",
+    "autocomplete",
+    "sync_request_standards",
+    "sync_request_tests",
+    "remove_request_catalog",
+    "backfill_request_catalog",
+    "find_open_requests",
+    "get_standard_demand",
+]
@@ -0,0 +1,80 @@
+# backend/modules/catalog/models.py
+
+from sqlalchemy import Column, Integer, String, Index, UniqueConstraint
+from core.database import Base
+
+
+class CatalogStandard(Base):
+    """
+    Every standard ever selected on a request (e.g. "IEC 61000-4-2").
+    key = case/whitespace-insensitive form used for lookups.
+    """
+    __tablename__ = "catalog_standards"
+
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String, nullable=False, unique=True)
+    name = Column(String, nullable=False)
+
+
+class CatalogTest(Base):
+    """
+    Every test ever selected on a request (e.g. "ESD Immunity")
+    """
+    __tablename__ = "catalog_tests"
+
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String, nullable=False, unique=True)
+    name = Column(String, nullable=False)
+
+
+class RequestStandard(Base):
+    """
+    Standards selected on a service request (mirrors the *_standards /
+    certification JSON columns, which stay the source for the forms)
+    """
+    __tablename__ = "request_standards"
+
+    id = Column(Integer, primary_key=True)
+    request_service = Column(String, nullable=False)   # calibration, testing, design, certification
+    request_id = Column(Integer, nullable=False)
+    standard_id = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("request_service", "request_id", "standard_id", name="uq_request_standard"),
+        Index("ix_request_standards_standard", "standard_id", "request_service", "request_id"),
+    )
+
+
+class RequestTest(Base):
+    """
+    Tests selected on a service request (mirrors *_requirements.selected_tests)
+    """
+    __tablename__ = "request_tests"
+
+    id = Column(Integer, primary_key=True)
+    request_service = Column(String, nullable=False)
+    request_id = Column(Integer, nullable=False)
+    test_id = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("request_service", "request_id", "test_id", name="uq_request_test"),
+        Index("ix_request_tests_test", "test_id", "request_service", "request_id"),
+    )
+
+
+class RequestRegion(Base):
+    """
+    Target regions of a service request; region is the reference region id
+    ("europe"), or the catalog key form for regions outside the catalog
+    """
+    __tablename__ = "request_regions"
+
+    id = Column(Integer, primary_key=True)
+    request_service = Column(String, nullable=False)
+    request_id = Column(Integer, nullable=False)
+    region = Column(String, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("request_service", "request_id", "region", name="uq_request_region"),
+        Index("ix_request_regions_region", "region", "request_service", "request_id"),
+    )
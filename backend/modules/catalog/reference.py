@@ -0,0 +1,307 @@
+# backend/modules/catalog/reference.py
+"""
+Reference catalog of the standards, tests, regions and industries offered by
+the request forms.
+
+Compiled once at import into:
+  * CATALOG       - the full catalog as a CachedPayload (served by ETag)
+  * lookup tables - catalog key of every id / code / label / alias -> entry,
+                    so validating a selection is a set-membership check
+  * a PrefixTrie  - for /catalog/autocomplete
+
+Standards are identified by their code ("IEC 61000-4-2"); the ids the
+Testing / Design forms send ("esd-immunity") are aliases of the same entry.
+A standard without regions applies everywhere.
+"""
+from types import MappingProxyType
+
+from core.http_cache import CachedPayload
+
+from .trie import PrefixTrie
+
+KINDS = ("standard", "test", "region", "industry")
+
+
+def catalog_key(value):
+    """Case- and whitespace-insensitive form of a standard / test / region name."""
+    if value is None:
+        return None
+    return " ".join(str(value).split()).casefold() or None
+
+
+# --------------------------------------------------------
+# REGIONS: (id, label, countries, aliases)
+# --------------------------------------------------------
+REGIONS = [
+    ("india", "India", ["India"], ["India (BIS)"]),
+    ("europe", "Europe", ["Germany", "France", "UK", "Italy"], ["European Union (CE)", "EU", "CE"]),
+    ("asia", "Asia", ["China", "Japan", "Korea", "Singapore"], []),
+    ("usa", "United States", ["United States"], ["United States (FCC)", "US", "USA", "FCC"]),
+    ("canada", "Canada", ["Canada"], ["Canada (IC)", "IC"]),
+    ("taiwan", "Taiwan", ["Taiwan"], ["Taiwan (BSMI)", "BSMI"]),
+    ("south-korea", "South Korea", ["South Korea"], ["South Korea (KC)", "KC"]),
+    ("brazil", "Brazil", ["Brazil"], ["Brazil (ANATEL)", "ANATEL"]),
+    ("australia", "Australia", ["Australia"], ["Australia (RCM)", "RCM"]),
+]
+
+INDUSTRIES = [
+    "Telecommunication",
+    "Medical",
+    "Automotive",
+    "Industrial",
+    "Consumer Electronics",
+    "IoT",
+    "Aerospace & Defense",
+    "Energy & Power",
+    "Others",
+]
+
+# --------------------------------------------------------
+# STANDARDS: (code, title, regions, industries, aliases)
+# --------------------------------------------------------
+_TELECOM = ["Telecommunication", "IoT"]
+_MULTIMEDIA = ["Consumer Electronics", "Telecommunication", "IoT"]
+_VEHICLE = ["Automotive"]
+_EV = ["Automotive", "Energy & Power"]
+
+STANDARDS = [
+    # EMC - basic immunity
+    ("IEC 61000-4-2", "ESD immunity", [], [], ["esd-immunity"]),
+    ("IEC 61000-4-3", "Radiated RF immunity", [], [], []),
+    ("IEC 61000-4-4", "EFT/Burst immunity", [], [], []),
+    ("IEC 61000-4-5", "Surge immunity", [], [], []),
+    ("IEC 61000-4-6", "Conducted RF immunity", [], [], ["conducted-rf"]),
+    ("IEC 61000-4-8", "Power-frequency magnetic field immunity", [], [], []),
+    ("IEC 61000-4-11", "Voltage dips and interruptions immunity", [], [], []),
+    # EMC - generic / product family
+    ("IEC 61000-6-1", "Generic immunity - residential, commercial", [], [], []),
+    ("IEC 61000-6-2", "Generic immunity - industrial", [], ["Industrial", "Energy & Power"], []),
+    ("IEC 61000-6-3", "Generic emission - residential, commercial", [], [], []),
+    ("IEC 61000-6-4", "Generic emission - industrial", [], ["Industrial", "Energy & Power"], []),
+    ("IEC 61326-1", "EMC of measurement, control and laboratory equipment", [], ["Industrial"], []),
+    ("IEC 60601-1-2", "EMC of medical electrical equipment", [], ["Medical"], []),
+    ("IEC 61851-1", "EV conductive charging - general requirements", [], _EV, []),
+    ("IEC 61851-21-2", "EV conductive charging - EMC of off-board systems", [], _EV, []),
+    ("IEC 62040-2", "UPS - EMC requirements", [], ["Energy & Power"], []),
+    # Safety / exposure
+    ("IEC 62368-1", "Audio/video, information and communication technology equipment safety", [], _MULTIMEDIA, []),
+    ("IEC 60950-1", "Information technology equipment safety", [], _MULTIMEDIA, []),
+    ("IEC 62479", "Low-power equipment EMF exposure", [], _TELECOM, []),
+    # Emission (CISPR and EU harmonised versions)
+    ("CISPR 11", "ISM equipment emission", [], ["Industrial", "Medical"], []),
+    ("CISPR 14-1", "Household appliances emission", [], ["Consumer Electronics"], []),
+    ("CISPR 14-2", "Household appliances immunity", [], ["Consumer Electronics"], []),
+    ("CISPR 15", "Lighting equipment emission", [], [], []),
+    ("CISPR 16", "Radio disturbance measuring apparatus and methods", [], [], []),
+    ("CISPR 22", "Information technology equipment emission", [], _MULTIMEDIA, []),
+    ("CISPR 24", "Information technology equipment immunity", [], _MULTIMEDIA, []),
+    ("CISPR 25", "Vehicle components - radio disturbance", [], _VEHICLE, []),
+    ("CISPR 32", "Multimedia equipment emission", [], _MULTIMEDIA, []),
+    ("CISPR 35", "Multimedia equipment immunity", [], _MULTIMEDIA, []),
+    ("EN 55011", "ISM equipment emission", ["europe"], ["Industrial", "Medical"], []),
+    ("EN 55014-1", "Household appliances emission", ["europe"], ["Consumer Electronics"], []),
+    ("EN 55014-2", "Household appliances immunity", ["europe"], ["Consumer Electronics"], []),
+    ("EN 55032", "Multimedia equipment emission", ["europe"], _MULTIMEDIA, []),
+    ("EN 55035", "Multimedia equipment immunity", ["europe"], _MULTIMEDIA, []),
+    # Radio
+    ("EN 300 328", "2.4 GHz wideband transmission systems", ["europe"], _TELECOM, []),
+    ("EN 301 489-1", "Radio equipment EMC - common requirements", ["europe"], _TELECOM, []),
+    ("EN 301 489-3", "Radio equipment EMC - short range devices", ["europe"], _TELECOM, []),
+    ("EN 301 489-17", "Radio equipment EMC - broadband data transmission", ["europe"], _TELECOM, []),
+    ("ETSI EN 301 511", "GSM mobile stations", ["europe"], _TELECOM, []),
+    ("ETSI EN 303 413", "GNSS receivers", ["europe"], _TELECOM + _VEHICLE, []),
+    ("FCC Part 15", "Radio frequency devices", ["usa"], [], []),
+    ("FCC Part 18", "ISM equipment", ["usa"], ["Industrial", "Medical"], []),
+    ("FCC Part 68", "Terminal equipment connected to the telephone network", ["usa"], ["Telecommunication"], []),
+    ("ANSI C63.4", "Emission measurement of unintentional radiators", ["usa"], [], []),
+    ("ANSI C63.10", "Compliance testing of unlicensed wireless devices", ["usa"], _TELECOM, []),
+    # Automotive
+    ("ISO 7637-2", "Road vehicles - electrical transient conduction", [], _VEHICLE, []),
+    ("ISO 11452-2", "Road vehicles - absorber-lined shielded enclosure immunity", [], _VEHICLE, []),
+    ("ISO 11452-4", "Road vehicles - bulk current injection immunity", [], _VEHICLE, []),
+    # Environmental
+    ("IEC 60068-2-1", "Cold test", [], [], ["cold-test"]),
+    ("IEC 60068-2-2", "Dry heat test", [], [], ["dry-heat"]),
+    ("IEC 60068-2-6", "Vibration (sinusoidal)", [], [], []),
+    ("IEC 60068-2-14", "Thermal cycling", [], [], ["thermal"]),
+    ("IEC 60068-2-30", "Damp heat (cyclic)", [], [], ["damp-cyclic"]),
+    ("IEC 60068-2-78", "Damp heat (steady state)", [], [], ["damp-steady"]),
+    # Calibration
+    ("ISO/IEC 17025", "Competence of testing and calibration laboratories", [], [], []),
+]
+
+# --------------------------------------------------------
+# TESTS: category -> [(id, label, aliases)]
+# --------------------------------------------------------
+TEST_TYPES = [
+    ("pre-compliance", "Pre-Compliance Test"),
+    ("final", "Final Testing / Compliance Testing"),
+    ("ilc", "ILC (Inter Laboratory Comparison)"),
+]
+
+TESTS = {
+    "EMC Test": [
+        ("esd-immunity", "ESD immunity", []),
+        ("radiated-rf", "Radiated RF immunity", []),
+        ("eft-burst", "EFT/Burst immunity", []),
+        ("surge", "Surge immunity", []),
+        ("conducted-rf", "Conducted RF immunity", []),
+        ("power-freq", "Power-frequency magnetic field immunity", []),
+    ],
+    "Environmental Test": [
+        ("cold-test", "Cold test", []),
+        ("dry-heat", "Dry heat test", []),
+        ("damp-heat-steady", "Damp heat (steady state)", []),
+        ("damp-heat-cyclic", "Damp heat (cyclic)", []),
+        ("thermal-cycling", "Thermal cycling", []),
+        ("temp-shock", "Temperature shock", []),
+        ("vibration", "Vibration (sinusoidal)", []),
+    ],
+    "Safety Test (Electrical & Mechanical)": [
+        ("insulation", "Insulation resistance test", []),
+        ("dielectric", "Dielectric withstand / Hi-pot test", []),
+        ("clearance", "Clearance & creepage distance check", []),
+        ("leakage", "Leakage current test", []),
+        ("overcurrent", "Overcurrent protection verification", []),
+        ("overvoltage", "Overvoltage protection verification", []),
+    ],
+    "Functional Safety Test": [
+        ("safety-function", "Safety function verification", []),
+        ("fault-injection", "Fault injection test (hardware)", []),
+        ("diagnostic", "Diagnostic coverage validation", []),
+        ("redundancy", "Redundancy/safe state behavior test", []),
+        ("software-self", "Software self-test verification", []),
+        ("lifecycle", "Safety lifecycle documentation review", []),
+    ],
+    "Calibration": [
+        # The calibration form defaults to ["full"]
+        ("full-calibration", "Full Calibration", ["full"]),
+        ("functional-verification", "Functional Verification", []),
+        ("adjustment-required", "Adjustment Required", []),
+    ],
+}
+
+
+# --------------------------------------------------------
+# COMPILE (once, at import)
+# --------------------------------------------------------
+def _slug(value):
+    return "-".join(catalog_key(value).replace("/", " ").replace(".", " ").split())
+
+
+def _compile_entries():
+    entries = []
+
+    for region_id, label, countries, aliases in REGIONS:
+        entries.append(({
+            "kind": "region", "id": region_id, "label": label, "countries": countries
+        }, [region_id, label, *aliases]))
+
+    for label in INDUSTRIES:
+        entries.append(({"kind": "industry", "id": _slug(label), "label": label}, [label]))
+
+    for code, title, regions, industries, aliases in STANDARDS:
+        entries.append(({
+            "kind": "standard",
+            "id": _slug(code),
+            "code": code,
+            "label": f"{title}: {code}",
+            "regions": regions,
+            "industries": industries
+        }, [code, *aliases]))
+
+    for category, tests in TESTS.items():
+        for test_id, label, aliases in tests:
+            entries.append(({
+                "kind": "test", "id": test_id, "label": label, "category": category
+            }, [test_id, label, *aliases]))
+
+    return entries
+
+
+_ENTRIES = _compile_entries()
+
+# kind -> catalog key of every id / code / label / alias -> entry
+_BY_KEY = {kind: {} for kind in KINDS}
+for _entry, _names in _ENTRIES:
+    for _name in [_entry["id"], _entry["label"], *_names]:
+        _BY_KEY[_entry["kind"]].setdefault(catalog_key(_name), _entry)
+_BY_KEY = MappingProxyType({kind: MappingProxyType(keys) for kind, keys in _BY_KEY.items()})
+
+# Trie values are positions in _ENTRIES
+_TRIE = PrefixTrie()
+for _position, (_entry, _names) in enumerate(_ENTRIES):
+    for _name in dict.fromkeys([_entry["label"], *_names]):
+        _TRIE.insert(_name, _position)
+_TRIE.freeze()
+
+
+def _public_catalog():
+    by_kind = {kind: [] for kind in KINDS}
+    for entry, _ in _ENTRIES:
+        by_kind[entry["kind"]].append(entry)
+    return {
+        "regions": by_kind["region"],
+        "industries": by_kind["industry"],
+        "standards": by_kind["standard"],
+        "tests": by_kind["test"],
+        "test_types": [{"id": test_id, "label": label} for test_id, label in TEST_TYPES],
+    }
+
+
+CATALOG = CachedPayload(_public_catalog())
+
+
+# --------------------------------------------------------
+# LOOKUPS
+# --------------------------------------------------------
+def resolve(kind: str, value):
+    """Catalog entry for an id / code / label / alias of ``kind``, or None."""
+    return _BY_KEY[kind].get(catalog_key(value))
+
+
+def canonical_name(kind: str, value):
+    """
+    Name stored in the junction tables: standard code, test label, region id.
+    Values outside the catalog (e.g. custom certification standards) pass through.
+    """
+    entry = resolve(kind, value)
+    if entry is None:
+        return value
+    if kind == "standard":
+        return entry["code"]
+    if kind == "region":
+        return entry["id"]
+    return entry["label"]
+
+
+def validate_selection(kind: str, values):
+    """Raise ValueError naming every value that is not in the catalog."""
+    keys = _BY_KEY[kind]
+    unknown = [value for value in values or [] if catalog_key(value) not in keys]
+    if unknown:
+        raise ValueError(f"Unknown {kind}(s): {', '.join(str(v) for v in unknown)}")
+
+
+def autocomplete(q: str, kind: str = None, region: str = None, industry: str = None, limit: int = 10):
+    """
+    Ranked catalog entries with a word starting with ``q``. Standards are
+    narrowed to ``region`` / ``industry`` (those without any apply everywhere).
+    """
+    region_id = (resolve("region", region) or {}).get("id", catalog_key(region)) if region else None
+    industry_label = (resolve("industry", industry) or {}).get("label", industry) if industry else None
+
+    result = []
+    for position in _TRIE.lookup(q or ""):
+        entry = _ENTRIES[position][0]
+        if kind and entry["kind"] != kind:
+            continue
+        if entry["kind"] == "standard":
+            if region_id and entry["regions"] and region_id not in entry["regions"]:
+                continue
+            if industry_label and entry["industries"] and industry_label not in entry["industries"]:
+                continue
+        result.append(entry)
+        if len(result) >= limit:
+            break
+    return result
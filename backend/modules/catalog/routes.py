@@ -0,0 +1,67 @@
+# backend/modules/catalog/routes.py
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from core.database import get_db
+from core.http_cache import cached_json_response
+from modules.auth.dependencies import require_staff
+from . import services, reference
+
+router = APIRouter(prefix="/catalog", tags=["Catalog"])
+
+
+# ------------------------------------------------------------
+# REFERENCE CATALOG (compiled once; cacheable by ETag)
+# ------------------------------------------------------------
+@router.get("")
+def get_catalog(request: Request):
+    """Regions, industries, standards, tests and test types offered by the forms"""
+    return cached_json_response(request, reference.CATALOG, max_age=3600)
+
+
+@router.get("/autocomplete")
+def autocomplete(
+    q: str = "",
+    kind: Optional[str] = Query(None, pattern="^(standard|test|region|industry)$"),
+    region: Optional[str] = None,
+    industry: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100)
+):
+    """e.g. /catalog/autocomplete?q=61000-4&kind=standard&region=europe (in-memory, no DB)"""
+    return reference.autocomplete(q, kind=kind, region=region, industry=industry, limit=limit)
+
+
+# ------------------------------------------------------------
+# OPEN REQUESTS BY STANDARD / TEST / REGION
+# ------------------------------------------------------------
+@router.get("/requests", dependencies=[Depends(require_staff)])
+def find_open_requests(
+    standard: Optional[str] = None,
+    test: Optional[str] = None,
+    region: Optional[str] = None,
+    service: Optional[List[str]] = Query(None, description="calibration / testing / design / certification"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """e.g. /catalog/requests?standard=IEC 61000-4-2&region=Europe"""
+    return services.find_open_requests(
+        db,
+        standard=standard,
+        test=test,
+        region=region,
+        services=service,
+        limit=limit
+    )
+
+
+# ------------------------------------------------------------
+# LAB CAPACITY PLANNING: OPEN REQUESTS PER STANDARD
+# ------------------------------------------------------------
+@router.get("/standards/demand")
+def get_standard_demand(
+    region: Optional[str] = None,
+    service: Optional[List[str]] = Query(None),
+    db: Session = Depends(get_db)
+):
+    return services.get_standard_demand(db, region=region, services=service)
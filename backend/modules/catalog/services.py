@@ -0,0 +1,333 @@
+# backend/modules/catalog/services.py
+"""
+Normalized standards / tests / regions of service requests.
+
+The forms keep their JSON columns (*_standards.standards / regions,
+*_requirements.selected_tests, certification_requests.standards); the save
+services mirror them into request_standards / request_tests /
+request_regions in the same transaction. Questions like "open requests
+needing IEC 61000-4-2 in Europe" become indexed lookups:
+
+    request_standards (standard_id, request_service, request_id)
+      -> service request by primary key, status filter
+
+Names go through the reference catalog first, so "esd-immunity" and
+"IEC 61000-4-2" are one standard and "European Union (CE)" / "europe"
+one region; values outside the catalog are kept as entered.
+"""
+import json
+from collections import defaultdict
+
+from sqlalchemy import select, literal, union_all, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .models import CatalogStandard, CatalogTest, RequestStandard, RequestTest, RequestRegion
+from .reference import catalog_key, canonical_name
+
+# Service request statuses that still need lab capacity
+OPEN_STATUSES = ("submitted", "in_progress")
+
+
+def _as_list(value):
+    # JSON columns normally hold lists; tolerate JSON-encoded strings / scalars
+    if value is None:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return [value]
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def _request_models():
+    # Import here to avoid circular imports (service modules import this one)
+    from modules.calibration_request.models import CalibrationRequest
+    from modules.testing_request.models import TestingRequest
+    from modules.design_request.models import DesignRequest
+    from modules.certification_request.models import CertificationRequest
+
+    return {
+        "calibration": CalibrationRequest,
+        "testing": TestingRequest,
+        "design": DesignRequest,
+        "certification": CertificationRequest,
+    }
+
+
+# --------------------------------------------------------
+# CATALOG IDS
+# --------------------------------------------------------
+def _catalog_ids(db: Session, model, names):
+    """key -> id for ``names``, adding names seen for the first time."""
+    display = {}
+    for name in names:
+        key = catalog_key(name)
+        if key:
+            display.setdefault(key, " ".join(str(name).split()))
+    if not display:
+        return {}
+
+    db.execute(sqlite_insert(model).values([
+        {"key": key, "name": name} for key, name in display.items()
+    ]).on_conflict_do_nothing(index_elements=["key"]))
+
+    return dict(db.query(model.key, model.id).filter(model.key.in_(list(display))).all())
+
+
+# --------------------------------------------------------
+# SYNC (called from the save_* services, before commit)
+# --------------------------------------------------------
+def _replace_rows(db: Session, model, service: str, rows_by_request: dict, value_column: str):
+    request_ids = list(rows_by_request)
+    if not request_ids:
+        return
+    db.query(model).filter(
+        model.request_service == service,
+        model.request_id.in_(request_ids)
+    ).delete(synchronize_session=False)
+
+    rows = [
+        {"request_service": service, "request_id": request_id, value_column: value}
+        for request_id, values in rows_by_request.items()
+        for value in sorted(set(values))
+    ]
+    if rows:
+        db.execute(sqlite_insert(model).values(rows).on_conflict_do_nothing())
+
+
+def sync_request_standards_many(db: Session, service: str, selections: dict):
+    """selections: {request_id: (standards, regions)}"""
+    selections = {
+        request_id: (
+            [canonical_name("standard", s) for s in _as_list(standards)],
+            [canonical_name("region", r) for r in _as_list(regions)]
+        )
+        for request_id, (standards, regions) in selections.items()
+    }
+    ids = _catalog_ids(db, CatalogStandard, [s for standards, _ in selections.values() for s in standards])
+
+    _replace_rows(db, RequestStandard, service, {
+        request_id: [ids[catalog_key(s)] for s in standards if catalog_key(s)]
+        for request_id, (standards, _) in selections.items()
+    }, "standard_id")
+    _replace_rows(db, RequestRegion, service, {
+        request_id: [catalog_key(r) for r in regions if catalog_key(r)]
+        for request_id, (_, regions) in selections.items()
+    }, "region")
+
+
+def sync_request_tests_many(db: Session, service: str, selections: dict):
+    """selections: {request_id: selected_tests}"""
+    selections = {
+        request_id: [canonical_name("test", t) for t in _as_list(tests)]
+        for request_id, tests in selections.items()
+    }
+    ids = _catalog_ids(db, CatalogTest, [t for tests in selections.values() for t in tests])
+
+    _replace_rows(db, RequestTest, service, {
+        request_id: [ids[catalog_key(t)] for t in tests if catalog_key(t)]
+        for request_id, tests in selections.items()
+    }, "test_id")
+
+
+def sync_request_standards(db: Session, service: str, request_id: int, standards, regions):
+    sync_request_standards_many(db, service, {request_id: (standards, regions)})
+
+
+def sync_request_tests(db: Session, service: str, request_id: int, tests):
+    sync_request_tests_many(db, service, {request_id: tests})
+
+
+def remove_request_catalog(db: Session, service: str, request_ids):
+    """Drop junction rows of deleted requests. Call before commit."""
+    request_ids = list(request_ids)
+    if not request_ids:
+        return
+    for model in (RequestStandard, RequestTest, RequestRegion):
+        db.query(model).filter(
+            model.request_service == service,
+            model.request_id.in_(request_ids)
+        ).delete(synchronize_session=False)
+
+
+# --------------------------------------------------------
+# BACKFILL FROM THE JSON COLUMNS (batched)
+# --------------------------------------------------------
+def _backfill_sources():
+    from modules.calibration_request.models import CalibrationStandards, CalibrationRequirements
+    from modules.testing_request.models import TestingStandards, TestingRequirements
+    from modules.design_request.models import DesignStandards, DesignRequirements
+    from modules.certification_request.models import CertificationRequest
+
+    # (service, model, request id column, row -> selection, sync function)
+    return [
+        ("calibration", CalibrationStandards, CalibrationStandards.calibration_request_id,
+         lambda row: (row.standards, row.regions), sync_request_standards_many),
+        ("calibration", CalibrationRequirements, CalibrationRequirements.calibration_request_id,
+         lambda row: row.selected_tests, sync_request_tests_many),
+        ("testing", TestingStandards, TestingStandards.testing_request_id,
+         lambda row: (row.standards, row.regions), sync_request_standards_many),
+        ("testing", TestingRequirements, TestingRequirements.testing_request_id,
+         lambda row: row.selected_tests, sync_request_tests_many),
+        ("design", DesignStandards, DesignStandards.design_request_id,
+         lambda row: (row.standards, row.regions), sync_request_standards_many),
+        ("design", DesignRequirements, DesignRequirements.design_request_id,
+         lambda row: row.selected_tests, sync_request_tests_many),
+        ("certification", CertificationRequest, CertificationRequest.id,
+         lambda row: (row.standards, [row.target_region] if row.target_region else []), sync_request_standards_many),
+    ]
+
+
+def backfill_request_catalog(db: Session, batch_size: int = 500):
+    """
+    Populate the junction tables from the existing JSON columns, one
+    batch (and one commit) at a time. Safe to re-run.
+    """
+    totals = {}
+    for service, model, request_id_column, selection, sync in _backfill_sources():
+        last_id = 0
+        count = 0
+        while True:
+            rows = db.query(model).filter(
+                model.id > last_id,
+                request_id_column.isnot(None)
+            ).order_by(model.id).limit(batch_size).all()
+            if not rows:
+                break
+
+            # One row per request is expected; the newest wins like in the forms
+            sync(db, service, {getattr(row, request_id_column.key): selection(row) for row in rows})
+            db.commit()
+
+            last_id = rows[-1].id
+            count += len(rows)
+
+        key = f"{service}:{model.__tablename__}"
+        totals[key] = count
+        print(f"✅ Catalog backfill {key}: {count} row(s)")
+
+    return totals
+
+
+# --------------------------------------------------------
+# QUERIES
+# --------------------------------------------------------
+def _lookup_id(db: Session, model, name):
+    key = catalog_key(name)
+    if not key:
+        return None
+    row = db.query(model.id).filter(model.key == key).first()
+    return row[0] if row else None
+
+
+def find_open_requests(
+    db: Session,
+    standard: str = None,
+    test: str = None,
+    region: str = None,
+    services: list = None,
+    limit: int = 500
+):
+    """
+    Open service requests that need ``standard`` and/or ``test`` and/or
+    target ``region``, newest first. A standard / test nobody has selected
+    yet matches nothing.
+    """
+    filters = []
+    if standard:
+        standard_id = _lookup_id(db, CatalogStandard, canonical_name("standard", standard))
+        if standard_id is None:
+            return []
+        filters.append((RequestStandard, RequestStandard.standard_id, standard_id))
+    if test:
+        test_id = _lookup_id(db, CatalogTest, canonical_name("test", test))
+        if test_id is None:
+            return []
+        filters.append((RequestTest, RequestTest.test_id, test_id))
+    if region:
+        filters.append((RequestRegion, RequestRegion.region, catalog_key(canonical_name("region", region))))
+
+    branches = []
+    for service, request_model in _request_models().items():
+        if services and service not in services:
+            continue
+        branch = select(
+            literal(service).label("service"),
+            request_model.id.label("id"),
+            request_model.status.label("status"),
+            request_model.created_at.label("created_at")
+        ).where(request_model.status.in_(OPEN_STATUSES))
+        for junction, column, value in filters:
+            branch = branch.where(request_model.id.in_(
+                select(junction.request_id).where(junction.request_service == service, column == value)
+            ))
+        branches.append(branch)
+
+    if not branches:
+        return []
+
+    combined = union_all(*branches).subquery()
+    rows = db.execute(
+        select(combined).order_by(combined.c.created_at.desc(), combined.c.id.desc()).limit(limit)
+    ).all()
+
+    return [
+        {"service": row.service, "id": row.id, "status": row.status, "created_at": row.created_at}
+        for row in rows
+    ]
+
+
+def get_standard_demand(db: Session, region: str = None, services: list = None):
+    """
+    Open requests per standard (and per service) for lab capacity planning:
+    one indexed join per service, grouped by standard_id.
+    """
+    branches = []
+    for service, request_model in _request_models().items():
+        if services and service not in services:
+            continue
+        branch = select(
+            RequestStandard.standard_id,
+            literal(service).label("service"),
+            func.count().label("open_requests")
+        ).join(
+            request_model, request_model.id == RequestStandard.request_id
+        ).where(
+            RequestStandard.request_service == service,
+            request_model.status.in_(OPEN_STATUSES)
+        )
+        if region:
+            branch = branch.where(RequestStandard.request_id.in_(
+                select(RequestRegion.request_id).where(
+                    RequestRegion.request_service == service,
+                    RequestRegion.region == catalog_key(canonical_name("region", region))
+                )
+            ))
+        branches.append(branch.group_by(RequestStandard.standard_id))
+
+    if not branches:
+        return []
+
+    by_standard = defaultdict(dict)
+    for standard_id, service, count in db.execute(union_all(*branches)).all():
+        by_standard[standard_id][service] = count
+
+    names = dict(db.query(CatalogStandard.id, CatalogStandard.name).filter(
+        CatalogStandard.id.in_(list(by_standard))
+    ).all()) if by_standard else {}
+
+    result = [
+        {
+            "standard_id": standard_id,
+            "standard": names.get(standard_id),
+            "open_requests": sum(counts.values()),
+            "by_service": counts
+        }
+        for standard_id, counts in by_standard.items()
+    ]
+    result.sort(key=lambda item: (-item["open_requests"], item["standard"] or ""))
+    return result
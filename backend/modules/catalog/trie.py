@@ -0,0 +1,76 @@
+# backend/modules/catalog/trie.py
+"""
+Read-only prefix trie for autocomplete.
+
+Terms are folded to lowercase alphanumerics ("IEC 61000-4-2" -> "iec6100042")
+so punctuation and spacing never matter. Every term is inserted from each of
+its word starts, so "61000", "immunity" or "iec 61000" all reach the same
+entry; a match at the start of a term ranks before one inside it.
+
+``freeze()`` stores on every node the tuple of values below it, already
+ranked, so a lookup is one walk of len(prefix) dict hops plus a slice.
+"""
+import re
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def fold(value) -> str:
+    return "".join(_WORD.findall(str(value).casefold()))
+
+
+class _Node:
+    __slots__ = ("children", "ranks", "matches")
+
+    def __init__(self):
+        self.children = {}
+        self.ranks = {}      # value -> best rank (build time only)
+        self.matches = ()
+
+
+class PrefixTrie:
+    def __init__(self):
+        self._root = _Node()
+        self._order = {}     # value -> insertion order, the tie-breaker
+        self._frozen = False
+
+    def insert(self, term, value):
+        if self._frozen:
+            raise RuntimeError("PrefixTrie is frozen")
+        self._order.setdefault(value, len(self._order))
+
+        words = _WORD.findall(str(term).casefold())
+        for start in range(len(words)):
+            rank = 0 if start == 0 else 1
+            node = self._root
+            self._mark(node, value, rank)
+            for char in "".join(words[start:]):
+                node = node.children.setdefault(char, _Node())
+                self._mark(node, value, rank)
+
+    @staticmethod
+    def _mark(node, value, rank):
+        if rank < node.ranks.get(value, 2):
+            node.ranks[value] = rank
+
+    def freeze(self):
+        """Rank every node's values once and drop the build-time state."""
+        order = self._order
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            node.matches = tuple(sorted(node.ranks, key=lambda v: (node.ranks[v], order[v])))
+            node.ranks = None
+            stack.extend(node.children.values())
+        self._order = None
+        self._frozen = True
+        return self
+
+    def lookup(self, prefix):
+        """Ranked values with a term starting with ``prefix`` (all values for "")."""
+        node = self._root
+        for char in fold(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return ()
+        return node.matches
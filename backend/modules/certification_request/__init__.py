@@ -12,6 +12,7 @@ from .services import (
     save_certification_lab_selection_draft,
     submit_certification_request,
     get_full_certification_request,
+    get_full_certification_requests,
     cleanup_old_drafts
 )
 
@@ -26,5 +27,6 @@ __all__ = [
     "save_certification_lab_selection_draft",
     "submit_certification_request",
     "get_full_certification_request",
+    "get_full_certification_requests",
     "cleanup_old_drafts",
 ]
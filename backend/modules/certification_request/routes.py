@@ -1,19 +1,32 @@
 # routes.py
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from core.database import get_db
+from core.batching import batch_response
+from modules.auth.dependencies import (
+    get_current_user,
+    get_optional_user_id,
+    owned_ids,
+    require_owner
+)
+from modules.auth.token_cache import CurrentUser
 from . import services, schemas
 from .models import CertificationRequest
 
 router = APIRouter(prefix="/certification-request", tags=["Certification Request"])
 
 @router.get("/draft")
-def get_existing_draft(db: Session = Depends(get_db)):
-    """Find the most recent draft certification request"""
-    draft = db.query(CertificationRequest).filter(
-        CertificationRequest.status == "draft"
-    ).order_by(CertificationRequest.created_at.desc()).first()
+def get_existing_draft(
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """Find the caller's most recent draft certification request"""
+    query = db.query(CertificationRequest).filter(
+        CertificationRequest.status == "draft",
+        CertificationRequest.owner_id == user.id
+    )
+    draft = query.order_by(CertificationRequest.created_at.desc()).first()
     
     if draft:
         return {
@@ -41,8 +54,11 @@ def get_request(certification_request_id: int, db: Session = Depends(get_db)):
     return {"id": req.id, "status": req.status}
 
 @router.post("/")
-def start_certification_request(db: Session = Depends(get_db)):
-    return services.create_certification_request(db)
+def start_certification_request(
+    db: Session = Depends(get_db),
+    owner_id: Optional[int] = Depends(get_optional_user_id)
+):
+    return services.create_certification_request(db, owner_id=owner_id)
 
 @router.post("/{certification_request_id}/details")
 def save_details(
@@ -89,11 +105,24 @@ def submit(
     return {"status": "submitted"}
 
 
+@router.post("/full:batch")
+def get_full_requests_batch(
+    payload: schemas.CertificationFullBatchSchema,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """Same payload as /{id}/full for every id, loaded with one query per table"""
+    data = services.get_full_certification_requests(db, owned_ids(db, CertificationRequest, payload.ids, user))
+    return batch_response(payload.ids, data)
+
+
 @router.get("/{certification_request_id}/full")
 def get_full_request(
     certification_request_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
+    require_owner(db, CertificationRequest, certification_request_id, user)
     data = services.get_full_certification_request(db, certification_request_id)
 
     if not data:
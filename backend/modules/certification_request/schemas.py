@@ -1,5 +1,5 @@
 # schemas.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 
 
@@ -16,3 +16,7 @@ class CertificationLabSelectionSchema(BaseModel):
     selected_labs: List[str]
     region: Optional[Dict[str, Optional[str]]] = None  # {country, state, city}
     remarks: Optional[str] = None
+
+
+class CertificationFullBatchSchema(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=200)
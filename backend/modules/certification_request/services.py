@@ -1,5 +1,10 @@
 # services.py
 from sqlalchemy.orm import Session
+from core.batching import unique_ids, index_by, group_by
+from core.cache import full_view_cache
+from modules.changes.services import record_change
+from modules.search.services import index_product, remove_from_index
+from modules.catalog.services import sync_request_standards, remove_request_catalog
 from pathlib import Path
 import shutil
 from .models import (
@@ -12,9 +17,11 @@ from .schemas import (
     CertificationLabSelectionSchema
 )
 
-def create_certification_request(db: Session):
-    req = CertificationRequest(status="draft")
+def create_certification_request(db: Session, owner_id: int = None):
+    req = CertificationRequest(status="draft", owner_id=owner_id)
     db.add(req)
+    db.flush()
+    record_change(db, "certification", req.id)
     db.commit()
     db.refresh(req)
     return req
@@ -34,6 +41,9 @@ def save_certification_details(db: Session, certification_request_id: int, paylo
     req.estimated_fee_range = payload.estimated_fee_range
     req.additional_notes = payload.additional_notes
 
+    index_product(db, "certification", certification_request_id, product_name=req.product_name)
+    sync_request_standards(db, "certification", certification_request_id, req.standards, [req.target_region])
+    record_change(db, "certification", certification_request_id)
     db.commit()
     db.refresh(req)
     return req
@@ -81,6 +91,7 @@ def save_certification_uploaded_files(db: Session, certification_request_id: int
             "display_order": index
         })
 
+    record_change(db, "certification", certification_request_id)
     db.commit()
     return saved_files
 
@@ -111,6 +122,7 @@ def save_certification_lab_selection_draft(db: Session, certification_request_id
         )
         db.add(lab)
 
+    record_change(db, "certification", certification_request_id)
     db.commit()
     db.refresh(lab)
     return lab
@@ -142,24 +154,57 @@ def submit_certification_request(db: Session, certification_request_id: int, pay
         db.add(lab)
 
     req.status = "submitted"
+    record_change(db, "certification", certification_request_id)
     db.commit()
 
 def get_full_certification_request(db: Session, certification_request_id: int):
-    req = db.query(CertificationRequest).filter_by(
-        id=certification_request_id
-    ).first()
-
-    if not req:
-        return None
+    return get_full_certification_requests(db, [certification_request_id]).get(certification_request_id)
+
+
+def get_full_certification_requests(db: Session, certification_request_ids: list):
+    """
+    Batch version of get_full_certification_request: one IN (...) query per
+    table, rows grouped in Python. Returns {certification_request_id: full_dict}.
+    """
+    ids = unique_ids(certification_request_ids)
+    if not ids:
+        return {}
+
+    return full_view_cache.get_many(
+        "certification", ids, lambda missing: _load_full_certification_requests(db, missing)
+    )
+
+
+def _load_full_certification_requests(db: Session, ids: list):
+    reqs = db.query(CertificationRequest).filter(
+        CertificationRequest.id.in_(ids)
+    ).all()
+    if not reqs:
+        return {}
+
+    found_ids = [r.id for r in reqs]
+
+    docs = group_by(
+        db.query(CertificationTechnicalDocument).filter(
+            CertificationTechnicalDocument.certification_request_id.in_(found_ids)
+        ).order_by(CertificationTechnicalDocument.display_order).all(),
+        "certification_request_id"
+    )
+
+    labs = index_by(
+        db.query(CertificationLabSelection).filter(
+            CertificationLabSelection.certification_request_id.in_(found_ids)
+        ).order_by(CertificationLabSelection.id).all(),
+        "certification_request_id"
+    )
 
-    docs = db.query(CertificationTechnicalDocument).filter_by(
-        certification_request_id=certification_request_id
-    ).order_by(CertificationTechnicalDocument.display_order).all()
+    return {
+        req.id: _build_full_certification_dict(req, docs.get(req.id, []), labs.get(req.id))
+        for req in reqs
+    }
 
-    lab = db.query(CertificationLabSelection).filter_by(
-        certification_request_id=certification_request_id
-    ).first()
 
+def _build_full_certification_dict(req, docs, lab):
     documents_list = []
     for doc in docs:
         documents_list.append({
@@ -219,8 +264,11 @@ def cleanup_old_drafts(db: Session, keep_latest: int = 1):
                     print(f"Failed to delete file {doc.file_path}: {e}")
             
             db.delete(draft)
+            record_change(db, "certification", draft.id)
             deleted_count += 1
         
+        remove_from_index(db, "certification", [draft.id for draft in to_delete])
+        remove_request_catalog(db, "certification", [draft.id for draft in to_delete])
         db.commit()
     
     return deleted_count
\ No newline at end of file
@@ -0,0 +1,12 @@
+# Change Feed Module
+from .routes import router
+from .models import ChangeLogEntry
+from .services import record_change, record_changes, get_changes_since
+
+__all__ = [
+    "router",
+    "ChangeLogEntry",
+    "record_change",
+    "record_changes",
+    "get_changes_since",
+]
@@ -0,0 +1,20 @@
+# backend/modules/changes/models.py
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class ChangeLogEntry(Base):
+    """
+    Append-only change feed. Every write in the service modules adds one row
+    in the same transaction; seq is a monotonically increasing cursor that
+    polling clients pass back as ?since=<seq>.
+    """
+    __tablename__ = "change_log"
+    __table_args__ = {"sqlite_autoincrement": True}  # never reuse a seq
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String, nullable=False)       # calibration, testing, lab_request, ...
+    record_id = Column(Integer, nullable=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
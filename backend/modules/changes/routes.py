@@ -0,0 +1,22 @@
+# backend/modules/changes/routes.py
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from core.database import get_db
+from . import services, schemas
+
+router = APIRouter(prefix="/changes", tags=["Changes"])
+
+
+# "" so pollers hit /changes directly instead of a redirect to /changes/
+@router.get("", response_model=schemas.ChangesResponse)
+def get_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db)
+):
+    """
+    IDs and kinds of records changed after `since`.
+    Poll with the returned `latest`; repeat immediately while `has_more`.
+    """
+    return services.get_changes_since(db, since, limit)
@@ -0,0 +1,18 @@
+# backend/modules/changes/schemas.py
+
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+
+class ChangeItem(BaseModel):
+    seq: int
+    kind: str
+    id: int
+    changed_at: Optional[datetime] = None
+
+
+class ChangesResponse(BaseModel):
+    latest: int          # pass this back as ?since= on the next poll
+    has_more: bool       # true when the page was cut at `limit`
+    changes: List[ChangeItem]
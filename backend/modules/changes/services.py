@@ -0,0 +1,65 @@
+# backend/modules/changes/services.py
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from core.cache import full_view_cache
+from .models import ChangeLogEntry
+
+
+def record_change(db: Session, kind: str, record_id: int):
+    """
+    Append a change-feed row for (kind, record_id) to the current transaction
+    and invalidate the cached full view once it commits. Call before commit.
+    """
+    db.add(ChangeLogEntry(kind=kind, record_id=record_id))
+    full_view_cache.invalidate_on_commit(db, kind, record_id)
+
+
+def record_changes(db: Session, kind: str, record_ids):
+    """Like record_change() for many records, with one multi-row INSERT."""
+    record_ids = list(record_ids)
+    if not record_ids:
+        return
+    db.execute(insert(ChangeLogEntry).values([
+        {"kind": kind, "record_id": record_id} for record_id in record_ids
+    ]))
+    for record_id in record_ids:
+        full_view_cache.invalidate_on_commit(db, kind, record_id)
+
+
+def get_changes_since(db: Session, since: int, limit: int = 500):
+    """
+    Records changed after `since`, oldest first, one entry per (kind, id)
+    carrying its newest seq. A poll with nothing new is a single primary-key
+    range lookup that returns no rows.
+
+    SQLite serialises writers, so seqs become visible in commit order and a
+    client never skips a change by advancing its cursor to `latest`.
+    """
+    rows = db.query(ChangeLogEntry).filter(
+        ChangeLogEntry.seq > since
+    ).order_by(ChangeLogEntry.seq).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    latest_by_record = {}
+    for row in rows:
+        latest_by_record[(row.kind, row.record_id)] = row
+
+    changes = sorted(latest_by_record.values(), key=lambda r: r.seq)
+
+    return {
+        "latest": rows[-1].seq if rows else since,
+        "has_more": has_more,
+        "changes": [
+            {
+                "seq": r.seq,
+                "kind": r.kind,
+                "id": r.record_id,
+                "changed_at": r.changed_at
+            }
+            for r in changes
+        ]
+    }
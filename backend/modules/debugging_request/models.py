@@ -8,6 +8,7 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     Text,
+    Index,
 )
 from sqlalchemy.sql import func
 from core.database import Base
@@ -30,6 +31,13 @@ class DebuggingRequest(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # ✅ NEW: Authenticated user who created the request (None = anonymous)
+    owner_id = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_debugging_requests_owner_created", "owner_id", "created_at"),
+    )
+
 
 # -----------------------------
 # STEP 1 — Structured Product Details
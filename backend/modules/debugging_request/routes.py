@@ -9,12 +9,20 @@ from fastapi import (
     HTTPException,
 )
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import os
 import json
 from uuid import uuid4
 
 from core.database import get_db
+from core.batching import batch_response
+from modules.auth.dependencies import (
+    get_current_user,
+    get_optional_user_id,
+    owned_ids,
+    require_owner
+)
+from modules.auth.token_cache import CurrentUser
 
 from . import services, schemas
 from .models import DebuggingRequest
@@ -37,13 +45,21 @@ def save_file(file: UploadFile, folder: str):
 
 # -------- Create Request --------
 @router.post("/", response_model=schemas.DebuggingRequestResponse)
-def start_request(db: Session = Depends(get_db)):
-    return services.start_debugging_request(db)
+def start_request(
+    db: Session = Depends(get_db),
+    owner_id: Optional[int] = Depends(get_optional_user_id)
+):
+    return services.start_debugging_request(db, owner_id=owner_id)
 
 
 # -------- READ (basic) --------
 @router.get("/{request_id}")
-def get_request(request_id: int, db: Session = Depends(get_db)):
+def get_request(
+    request_id: int,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    require_owner(db, DebuggingRequest, request_id, user)
     req = services.get_request(db, request_id)
     if not req:
         raise HTTPException(404, "Request not found")
@@ -52,13 +68,29 @@ def get_request(request_id: int, db: Session = Depends(get_db)):
 
 # -------- READ (full composite view) --------
 @router.get("/{request_id}/full")
-def get_full_request(request_id: int, db: Session = Depends(get_db)):
+def get_full_request(
+    request_id: int,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    require_owner(db, DebuggingRequest, request_id, user)
     result = services.get_full_request(db, request_id)
     if not result:
         raise HTTPException(404, "Request not found")
     return result
 
 
+# -------- READ (full composite view, many ids) --------
+@router.post("/full:batch")
+def get_full_requests_batch(
+    payload: schemas.DebuggingFullBatchSchema,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    result = services.get_full_requests(db, owned_ids(db, DebuggingRequest, payload.ids, user))
+    return batch_response(payload.ids, result)
+
+
 # -------- STEP 1 — Product --------
 @router.post("/{request_id}/product")
 def save_product(
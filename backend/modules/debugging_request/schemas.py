@@ -1,6 +1,6 @@
 # backend/modules/debugging_request/schemas.py
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 
 
@@ -14,6 +14,12 @@ class DebuggingRequestResponse(BaseModel):
         orm_mode = True
 
 
+# -------- Batch full view --------
+
+class DebuggingFullBatchSchema(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=200)
+
+
 # -------- STEP 1 — Product Details --------
     
 class DebuggingProductSchema(BaseModel):
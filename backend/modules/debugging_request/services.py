@@ -2,6 +2,11 @@
 
 from sqlalchemy.orm import Session
 
+from core.batching import unique_ids, index_by
+from core.cache import full_view_cache
+from modules.changes.services import record_change
+from modules.search.services import index_product
+
 from .models import (
     DebuggingRequest,
     DebuggingProduct,
@@ -12,9 +17,11 @@ from .models import (
 
 
 # -------- Create Request --------
-def start_debugging_request(db: Session):
-    req = DebuggingRequest()
+def start_debugging_request(db: Session, owner_id: int = None):
+    req = DebuggingRequest(owner_id=owner_id)
     db.add(req)
+    db.flush()
+    record_change(db, "debugging", req.id)
     db.commit()
     db.refresh(req)
     return req
@@ -27,38 +34,62 @@ def get_request(db: Session, request_id: int):
 
 # -------- READ (full composite view) --------
 def get_full_request(db: Session, request_id: int):
-    req = db.get(DebuggingRequest, request_id)
-    if not req:
-        return None
+    return get_full_requests(db, [request_id]).get(request_id)
 
-    product = (
-        db.query(DebuggingProduct)
-        .filter(DebuggingProduct.debugging_request_id == request_id)
-        .first()
-    )
 
-    docs = (
-        db.query(DebuggingDocument)
-        .filter(DebuggingDocument.debugging_request_id == request_id)
-        .first()
-    )
+# -------- READ (full composite view, many ids) --------
+def get_full_requests(db: Session, request_ids: list):
+    ids = unique_ids(request_ids)
+    if not ids:
+        return {}
 
-    issue = (
-        db.query(IssueReview)
-        .filter(IssueReview.debugging_request_id == request_id)
-        .first()
+    return full_view_cache.get_many(
+        "debugging", ids, lambda missing: _load_full_requests(db, missing)
     )
 
-    engineer = (
-        db.query(EngineerEvaluation)
-        .filter(EngineerEvaluation.debugging_request_id == request_id)
-        .first()
+
+def _load_full_requests(db: Session, ids: list):
+    reqs = (
+        db.query(DebuggingRequest)
+        .filter(DebuggingRequest.id.in_(ids))
+        .all()
     )
+    if not reqs:
+        return {}
+
+    found_ids = [r.id for r in reqs]
+
+    def _children(model):
+        return (
+            db.query(model)
+            .filter(model.debugging_request_id.in_(found_ids))
+            .order_by(model.id)
+            .all()
+        )
+
+    products = index_by(_children(DebuggingProduct), "debugging_request_id")
+    docs = index_by(_children(DebuggingDocument), "debugging_request_id")
+    issues = index_by(_children(IssueReview), "debugging_request_id")
+    engineers = index_by(_children(EngineerEvaluation), "debugging_request_id")
 
+    return {
+        req.id: _build_full_request(
+            req,
+            product=products.get(req.id),
+            docs=docs.get(req.id),
+            issue=issues.get(req.id),
+            engineer=engineers.get(req.id),
+        )
+        for req in reqs
+    }
+
+
+def _build_full_request(req, product, docs, issue, engineer):
     return {
         "id": req.id,
         "status": req.status,
-        "product": product,
+        # plain dict so cached views never hold ORM instances
+        "product": _columns_dict(product) if product else None,
         "documents": docs.documents if docs else [],
         "issue_review": {
             "data": issue.data if issue else {},
@@ -69,6 +100,10 @@ def get_full_request(db: Session, request_id: int):
     }
 
 
+def _columns_dict(row):
+    return {c.key: getattr(row, c.key) for c in row.__table__.columns}
+
+
 # -------- STEP 1 — Product --------
 def save_product_details(db: Session, request_id: int, payload):
     row = (
@@ -87,6 +122,14 @@ def save_product_details(db: Session, request_id: int, payload):
     for k, v in data.items():
         setattr(row, k, v)
 
+    index_product(
+        db, "debugging", request_id,
+        product_name=row.name,
+        model_no=row.model_no,
+        serial_no=row.serial_no,
+        manufacturer=row.manufacturer
+    )
+    record_change(db, "debugging", request_id)
     db.commit()
     return row
 
@@ -108,6 +151,7 @@ def save_documents(db: Session, request_id: int, docs):
     else:
         record.documents = (record.documents or []) + docs
 
+    record_change(db, "debugging", request_id)
     db.commit()
     return record
 
@@ -130,6 +174,7 @@ def save_issue_review(db: Session, request_id: int, payload):
     if payload.reports:
         record.reports = (record.reports or []) + payload.reports
 
+    record_change(db, "debugging", request_id)
     db.commit()
     return record
 
@@ -141,6 +186,7 @@ def submit_request(db: Session, request_id: int):
         return None
 
     req.status = "under_review"
+    record_change(db, "debugging", request_id)
     db.commit()
     return req
 
@@ -161,5 +207,6 @@ def save_engineer_evaluation(db: Session, request_id: int, payload):
     record.path_selected = payload.path_selected
     record.comments = payload.comments
 
+    record_change(db, "debugging", request_id)
     db.commit()
     return record
@@ -16,7 +16,8 @@ from .services import (
     save_design_standards,
     save_design_lab_selection_draft,
     submit_design_request,
-    get_full_design_request
+    get_full_design_request,
+    get_full_design_requests
 )
 
 __all__ = [
@@ -35,4 +36,5 @@ __all__ = [
     "save_design_lab_selection_draft",
     "submit_design_request",
     "get_full_design_request",
+    "get_full_design_requests",
 ]
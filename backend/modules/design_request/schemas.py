@@ -1,5 +1,5 @@
 # schemas.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 
 class DimensionsSchema(BaseModel):
@@ -57,3 +57,6 @@ class DesignLabSelectionSchema(BaseModel):
     region: Optional[Dict[str, Optional[str]]] = None  # {country, state, city}
     remarks: Optional[str] = None
 
+
+class DesignFullBatchSchema(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=200)
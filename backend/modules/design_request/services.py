@@ -2,6 +2,12 @@
 import os
 from pathlib import Path
 from sqlalchemy.orm import Session
+from core.batching import unique_ids, index_by
+from core.cache import full_view_cache
+from modules.changes.services import record_change
+from modules.search.services import index_product
+from modules.catalog.reference import validate_selection
+from modules.catalog.services import sync_request_standards, sync_request_tests
 from .models import (
     DesignRequest,
     DesignProductDetails,
@@ -18,9 +24,11 @@ from .schemas import (
     DesignLabSelectionSchema
 )
 
-def create_design_request(db: Session):
-    dr = DesignRequest(status="submitted")
+def create_design_request(db: Session, owner_id: int = None):
+    dr = DesignRequest(status="submitted", owner_id=owner_id)
     db.add(dr)
+    db.flush()
+    record_change(db, "design", dr.id)
     db.commit()
     db.refresh(dr)
     return dr
@@ -34,6 +42,7 @@ def save_draft(db, design_request_id: int):
         raise ValueError("DesignRequest not found")
 
     dr.status = "draft"
+    record_change(db, "design", design_request_id)
     db.commit()
 
 
@@ -70,6 +79,14 @@ def save_design_product_details(db: Session, design_request_id: int, payload: De
     # pd.preferred_date = payload.preferred_date
     # pd.notes = payload.notes
 
+    index_product(
+        db, "design", design_request_id,
+        product_name=pd.eut_name,
+        model_no=pd.model_no,
+        serial_no=pd.serial_no,
+        manufacturer=pd.manufacturer
+    )
+    record_change(db, "design", design_request_id)
     db.commit()
 
 
@@ -88,6 +105,7 @@ def save_design_technical_documents(
         )
         db.add(td)
 
+    record_change(db, "design", design_request_id)
     db.commit()
 
 def save_design_uploaded_files(
@@ -144,6 +162,7 @@ def save_design_uploaded_files(
             "file_size": len(content)
         })
     
+    record_change(db, "design", design_request_id)
     db.commit()
     return saved_files
 
@@ -159,9 +178,15 @@ def save_design_requirements(db: Session, design_request_id: int, payload: Desig
     dr.test_type = payload.test_type
     dr.selected_tests = payload.selected_tests
 
+    sync_request_tests(db, "design", design_request_id, payload.selected_tests)
+    record_change(db, "design", design_request_id)
     db.commit()
 
 def save_design_standards(db: Session, design_request_id: int, payload: DesignStandardsSchema):
+    # Selections must come from the reference catalog (ids, codes or labels)
+    validate_selection("standard", payload.standards)
+    validate_selection("region", payload.regions)
+
     ds = db.query(DesignStandards).filter(
         DesignStandards.design_request_id == design_request_id
     ).first()
@@ -173,6 +198,8 @@ def save_design_standards(db: Session, design_request_id: int, payload: DesignSt
     ds.regions = payload.regions
     ds.standards = payload.standards
 
+    sync_request_standards(db, "design", design_request_id, payload.standards, payload.regions)
+    record_change(db, "design", design_request_id)
     db.commit()
 
 def save_design_lab_selection_draft(db: Session, design_request_id: int, payload: DesignLabSelectionSchema):
@@ -203,6 +230,7 @@ def save_design_lab_selection_draft(db: Session, design_request_id: int, payload
         )
         db.add(lab)
 
+    record_change(db, "design", design_request_id)
     db.commit()
     db.refresh(lab)
     return lab
@@ -235,32 +263,57 @@ def submit_design_request(db: Session, design_request_id: int, payload: DesignLa
         db.add(lab)
 
     dr.status = "submitted"
+    record_change(db, "design", design_request_id)
     db.commit()
 
 def get_full_design_request(db: Session, design_request_id: int):
-    dr = db.query(DesignRequest).filter(
-        DesignRequest.id == design_request_id
-    ).first()
+    return get_full_design_requests(db, [design_request_id]).get(design_request_id)
 
-    if not dr:
-        return None
 
-    product = db.query(DesignProductDetails).filter_by(
-        design_request_id=design_request_id
-    ).first()
+def get_full_design_requests(db: Session, design_request_ids: list):
+    """
+    Batch version of get_full_design_request: one IN (...) query per table,
+    rows grouped in Python. Returns {design_request_id: full_dict}.
+    """
+    ids = unique_ids(design_request_ids)
+    if not ids:
+        return {}
 
-    requirements = db.query(DesignRequirements).filter_by(
-        design_request_id=design_request_id
-    ).first()
+    return full_view_cache.get_many(
+        "design", ids, lambda missing: _load_full_design_requests(db, missing)
+    )
 
-    standards = db.query(DesignStandards).filter_by(
-        design_request_id=design_request_id
-    ).first()
 
-    lab = db.query(DesignLabSelection).filter_by(
-        design_request_id=design_request_id
-    ).first()
+def _load_full_design_requests(db: Session, ids: list):
+    drs = db.query(DesignRequest).filter(DesignRequest.id.in_(ids)).all()
+    if not drs:
+        return {}
+
+    found_ids = [r.id for r in drs]
+
+    def _children(model):
+        return db.query(model).filter(
+            model.design_request_id.in_(found_ids)
+        ).order_by(model.id).all()
+
+    products = index_by(_children(DesignProductDetails), "design_request_id")
+    requirements = index_by(_children(DesignRequirements), "design_request_id")
+    standards = index_by(_children(DesignStandards), "design_request_id")
+    labs = index_by(_children(DesignLabSelection), "design_request_id")
+
+    return {
+        dr.id: _build_full_design_dict(
+            dr,
+            product=products.get(dr.id),
+            requirements=requirements.get(dr.id),
+            standards=standards.get(dr.id),
+            lab=labs.get(dr.id)
+        )
+        for dr in drs
+    }
+
 
+def _build_full_design_dict(dr, product, requirements, standards, lab):
     # Convert SQLAlchemy objects to dictionaries for proper JSON serialization
     product_dict = None
     if product:
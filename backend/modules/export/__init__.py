@@ -0,0 +1,10 @@
+# Streaming CSV / NDJSON Export Module
+from .routes import router
+from .services import EXPORTS, stream_csv, stream_ndjson
+
+__all__ = [
+    "router",
+    "EXPORTS",
+    "stream_csv",
+    "stream_ndjson",
+]
@@ -0,0 +1,38 @@
+# backend/modules/export/routes.py
+
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from modules.auth.dependencies import get_owner_scope
+from . import services
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@router.get("/{entity}.{fmt}")
+def export_table(
+    entity: str,
+    fmt: Literal["csv", "ndjson"],
+    owner_id: Optional[int] = Depends(get_owner_scope)
+):
+    """
+    Stream every row of `entity` (lab-requests, product-submissions) as CSV
+    or NDJSON. Requires a token: staff get every row, customers only their own.
+    """
+    table = services.EXPORTS.get(entity)
+    if table is None:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {entity}")
+
+    filename = f"{entity}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
+    return StreamingResponse(
+        services.STREAMERS[fmt](table, owner_id=owner_id),
+        media_type=services.MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -0,0 +1,99 @@
+# backend/modules/export/services.py
+"""
+Streaming table exports (CSV / NDJSON) for operations spreadsheets.
+
+Rows are read as plain column tuples - no ORM objects, no identity map - one
+page of EXPORT_PAGE_SIZE rows at a time and encoded page by page, so memory
+stays flat however many rows are exported. The CSV header is sent before the
+first query runs, so the download starts at once.
+
+Pages are fetched by primary key (``id > last id``), each on its own short
+connection. app.db runs with SQLite's rollback journal: one cursor held open
+for the whole download would keep a read lock and block every writer for as
+long as the slowest client takes to read the file.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from pydantic_core import to_json
+from sqlalchemy import select
+
+from core.config import get_settings
+from core.database import engine
+from modules.lab_request.models import LabRequest
+from modules.product_details.models import ProductDetailsSubmission
+
+settings = get_settings()
+
+# URL entity -> table (every exported table has an integer ``id`` and ``owner_id``)
+EXPORTS = {
+    "lab-requests": LabRequest.__table__,
+    "product-submissions": ProductDetailsSubmission.__table__,
+}
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Cells starting with these are run as formulas by spreadsheet apps
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _pages(table, owner_id=None, page_size=None):
+    page_size = page_size or settings.EXPORT_PAGE_SIZE
+    query = select(table).order_by(table.c.id).limit(page_size)
+    if owner_id is not None:
+        query = query.where(table.c.owner_id == owner_id)
+
+    last_id = None
+    while True:
+        page_query = query if last_id is None else query.where(table.c.id > last_id)
+        with engine.connect() as conn:
+            rows = conn.execute(page_query).all()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1].id
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(table, owner_id=None):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(table.c.keys())
+    yield buffer.getvalue()
+
+    for rows in _pages(table, owner_id):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_cell(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+
+
+def stream_ndjson(table, owner_id=None):
+    columns = table.c.keys()
+    for rows in _pages(table, owner_id):
+        yield b"".join(to_json(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+STREAMERS = {
+    "csv": stream_csv,
+    "ndjson": stream_ndjson,
+}
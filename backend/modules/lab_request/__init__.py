@@ -1,6 +1,6 @@
 # backend/modules/lab_request/__init__.py
 
-from .routes import router
+from .routes import router, status_config_router
 
 from .models import (
     LabRequest,
@@ -8,36 +8,60 @@ from .models import (
     LabSchedule,
     LabRequestStatusLog,
     LabRequestAssignment,
-    LabDocument
+    LabDocument,
+    LabSyncOutbox,
+    LabSlaAlert
 )
 
 from .services import (
     create_lab_request,
+    create_lab_requests_for_labs,
     get_all_lab_requests,
+    get_lab_inbox,
     get_full_lab_request,
+    get_full_lab_requests,
     update_lab_request_status,
     add_lab_progress,
     assign_lab_engineer,
     create_lab_schedule,
     upload_lab_documents,
     delete_lab_document,
+    enqueue_lab_sync,
+    bulk_update_lab_requests,
+    auto_assign_lab_engineer,
+    auto_assign_lab_requests,
+    dispatch_lab_sync_outbox,
 )
 
+from .progress_compaction import progress_compactor
+
 __all__ = [
     "router",
+    "status_config_router",
     "LabRequest",
     "LabRequestProgress",
     "LabSchedule",
     "LabRequestStatusLog",
     "LabRequestAssignment",
     "LabDocument",
+    "LabSyncOutbox",
+    "LabSlaAlert",
     "create_lab_request",
+    "create_lab_requests_for_labs",
     "get_all_lab_requests",
+    "get_lab_inbox",
     "get_full_lab_request",
+    "get_full_lab_requests",
     "update_lab_request_status",
     "add_lab_progress",
     "assign_lab_engineer",
     "create_lab_schedule",
     "upload_lab_documents",
-    "delete_lab_document"
+    "delete_lab_document",
+    "enqueue_lab_sync",
+    "bulk_update_lab_requests",
+    "auto_assign_lab_engineer",
+    "auto_assign_lab_requests",
+    "dispatch_lab_sync_outbox",
+    "progress_compactor"
 ]
\ No newline at end of file
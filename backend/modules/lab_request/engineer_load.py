@@ -0,0 +1,171 @@
+# backend/modules/lab_request/engineer_load.py
+"""
+In-memory engineer workload used for least-loaded auto-assignment.
+
+Load = open lab requests assigned to the engineer + schedule entries that
+have not ended yet. Counts are loaded once from the database, then kept up
+to date by the write paths (assignment, completion, scheduling) and
+periodically rebuilt so finished schedule entries drop out.
+
+Adjustments are applied immediately, so several picks inside one
+transaction (bulk auto-assign) see each other, and are reverted if that
+transaction rolls back.
+"""
+import heapq
+import threading
+from datetime import datetime
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from core.background import register_job
+from core.config import get_settings
+from core.database import SessionLocal
+
+from .models import LabRequest, LabSchedule
+
+CLOSED_STATUSES = ("Completed", "Rejected")
+
+_PENDING_KEY = "engineer_load_pending"
+
+
+def is_open(status: str) -> bool:
+    return status not in CLOSED_STATUSES
+
+
+class EngineerLoadTracker:
+    def __init__(self, engineer_ids=()):
+        self._lock = threading.Lock()
+        self._roster = set(engineer_ids)
+        self._loads = {}
+        self._heap = []       # (load, engineer_id); stale entries skipped lazily
+        self._loaded = False
+
+    # ------------------------------------------------------------
+    # LOAD / REBUILD
+    # ------------------------------------------------------------
+    def rebuild(self, db: Session = None):
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            loads = dict.fromkeys(self._roster, 0)
+
+            for engineer_id, count in db.query(
+                LabRequest.assigned_engineer_id, func.count(LabRequest.id)
+            ).filter(
+                LabRequest.assigned_engineer_id.isnot(None),
+                LabRequest.status.notin_(CLOSED_STATUSES)
+            ).group_by(LabRequest.assigned_engineer_id):
+                loads[engineer_id] = loads.get(engineer_id, 0) + count
+
+            for engineer_id, count in db.query(
+                LabSchedule.engineer_id, func.count(LabSchedule.id)
+            ).filter(
+                LabSchedule.end_datetime > datetime.utcnow(),
+                LabSchedule.schedule_status != "Cancelled"
+            ).group_by(LabSchedule.engineer_id):
+                loads[engineer_id] = loads.get(engineer_id, 0) + count
+        finally:
+            if own_session:
+                db.close()
+
+        with self._lock:
+            self._loads = loads
+            self._heap = [(load, engineer_id) for engineer_id, load in loads.items()]
+            heapq.heapify(self._heap)
+            self._loaded = True
+        return len(loads)
+
+    def _ensure_loaded(self, db: Session = None):
+        if not self._loaded:
+            self.rebuild(db)
+
+    # ------------------------------------------------------------
+    # UPDATES
+    # ------------------------------------------------------------
+    def _apply(self, engineer_id: int, delta: int):
+        # Caller holds the lock
+        load = max(self._loads.get(engineer_id, 0) + delta, 0)
+        self._loads[engineer_id] = load
+        heapq.heappush(self._heap, (load, engineer_id))
+
+    def adjust(self, db: Session, engineer_id: int, delta: int):
+        """Change an engineer's load now; reverted if ``db`` rolls back."""
+        if engineer_id is None or not delta or not self._loaded:
+            return
+        with self._lock:
+            self._apply(engineer_id, delta)
+        db.info.setdefault(_PENDING_KEY, []).append((engineer_id, delta))
+
+    def revert(self, adjustments):
+        with self._lock:
+            for engineer_id, delta in adjustments:
+                self._apply(engineer_id, -delta)
+
+    # ------------------------------------------------------------
+    # PICK
+    # ------------------------------------------------------------
+    def pick(self, db: Session, candidates=None):
+        """
+        Least-loaded engineer (ties -> lowest id), optionally restricted to
+        ``candidates``. Returns None when there is nobody to pick.
+        """
+        self._ensure_loaded(db)
+        candidates = set(candidates) if candidates else None
+
+        with self._lock:
+            if candidates:
+                for engineer_id in candidates - self._loads.keys():
+                    self._apply(engineer_id, 0)
+
+            skipped = []
+            picked = None
+            while self._heap:
+                load, engineer_id = heapq.heappop(self._heap)
+                if self._loads.get(engineer_id) != load:
+                    continue    # stale entry
+                skipped.append((load, engineer_id))
+                if candidates is None or engineer_id in candidates:
+                    picked = engineer_id
+                    break
+
+            for entry in skipped:
+                heapq.heappush(self._heap, entry)
+
+            # Drop stale entries once they outnumber live ones
+            if len(self._heap) > 2 * len(self._loads) + 64:
+                self._heap = [(load, engineer_id) for engineer_id, load in self._loads.items()]
+                heapq.heapify(self._heap)
+
+            return picked
+
+    def snapshot(self, db: Session = None):
+        self._ensure_loaded(db)
+        with self._lock:
+            return [
+                {"engineer_id": engineer_id, "load": load}
+                for engineer_id, load in sorted(self._loads.items(), key=lambda item: (item[1], item[0]))
+            ]
+
+
+settings = get_settings()
+
+engineer_load = EngineerLoadTracker(settings.LAB_ENGINEER_IDS)
+
+engineer_load_job = register_job(
+    "engineer_load_rebuild",
+    settings.ENGINEER_LOAD_REBUILD_SECONDS,
+    engineer_load.rebuild
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _keep_adjustments(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _revert_adjustments(session):
+    adjustments = session.info.pop(_PENDING_KEY, None)
+    if adjustments:
+        engineer_load.revert(adjustments)
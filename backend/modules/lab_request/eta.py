@@ -0,0 +1,226 @@
+# backend/modules/lab_request/eta.py
+"""
+Data-driven ETA for lab requests.
+
+Stage durations (time spent in each detailed status) are derived from
+LabRequestStatusLog and kept per (service_type, detailed_status), plus an
+all-services fallback. ``refresh()`` only reads logs newer than the last
+one it saw, so the periodic job stays cheap as history grows.
+
+ETA = time left in the current stage + the typical duration of every
+later stage on the normal workflow path. The median sum is stored in
+LabRequest.estimated_completion; the p90 sum is a pessimistic bound.
+"""
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from core.background import register_job
+from core.config import get_settings
+from core.database import SessionLocal
+
+from .models import LabRequest, LabRequestStatusLog
+from .status_config import WORKFLOW_PATH
+
+ALL_SERVICES = "*"
+
+STAGE_PATH = WORKFLOW_PATH
+_STAGE_INDEX = {status: i for i, status in enumerate(STAGE_PATH)}
+
+# Status new lab requests start in (create_lab_request)
+INITIAL_STATUS = "Submitted"
+
+
+class EtaPredictor:
+    def __init__(self, max_samples: int):
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples = {}      # (service_type, stage) -> np.ndarray of seconds
+        self._stats = {}        # (service_type, stage) -> (median, p90) seconds
+        self._open = {}         # lab_request_id -> (stage, entered_at epoch seconds)
+        self._last_log_id = 0
+
+    # ------------------------------------------------------------
+    # LEARN FROM STATUS LOGS (incremental)
+    # ------------------------------------------------------------
+    def refresh(self, db=None):
+        """Fold status logs added since the last call into the stats."""
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            rows = db.query(
+                LabRequestStatusLog.id,
+                LabRequestStatusLog.lab_request_id,
+                LabRequestStatusLog.changed_at,
+                LabRequestStatusLog.previous_detailed_status,
+                LabRequestStatusLog.current_detailed_status,
+                LabRequest.service_type,
+                LabRequest.created_date
+            ).join(
+                LabRequest, LabRequest.id == LabRequestStatusLog.lab_request_id
+            ).filter(
+                LabRequestStatusLog.id > self._last_log_id
+            ).order_by(LabRequestStatusLog.id).all()
+        finally:
+            if own_session:
+                db.close()
+
+        if not rows:
+            return 0
+
+        with self._lock:
+            self._ingest(rows)
+            self._last_log_id = rows[-1][0]
+        return len(rows)
+
+    def _ingest(self, rows):
+        log_ids, request_ids, changed_at, previous, current, services, created = zip(*rows)
+
+        request_ids = np.asarray(request_ids, dtype=np.int64)
+        times = _epoch_seconds(changed_at)
+        previous = np.asarray([p or "" for p in previous], dtype=object)
+        current = np.asarray([c or "" for c in current], dtype=object)
+        services = np.asarray(services, dtype=object)
+
+        # Logs that keep the same detailed status do not end a stage
+        moved = previous != current
+        if not moved.any():
+            return
+        request_ids, times = request_ids[moved], times[moved]
+        previous, current, services = previous[moved], current[moved], services[moved]
+        created = _epoch_seconds([c for c, m in zip(created, moved) if m])
+
+        # Group each request's logs together, in log order (rows arrive by id)
+        order = np.argsort(request_ids, kind="stable")
+        request_ids, times = request_ids[order], times[order]
+        previous, current, services, created = previous[order], current[order], services[order], created[order]
+
+        first = np.ones(len(request_ids), dtype=bool)
+        first[1:] = request_ids[1:] != request_ids[:-1]
+
+        # Stage each log closes and when that stage began: the previous log of
+        # the same request, or (first log) the remembered open stage / creation
+        stage = np.empty(len(request_ids), dtype=object)
+        started = np.empty(len(request_ids), dtype=np.float64)
+        stage[~first] = current[np.flatnonzero(~first) - 1]
+        started[~first] = times[np.flatnonzero(~first) - 1]
+        for i in np.flatnonzero(first):
+            open_stage = self._open.get(int(request_ids[i]))
+            if open_stage:
+                stage[i], started[i] = open_stage
+            elif previous[i] == INITIAL_STATUS:
+                stage[i], started[i] = previous[i], created[i]
+            else:
+                # Left a stopped/final status; its duration is not a stage time
+                stage[i], started[i] = previous[i], np.nan
+
+        durations = times - started
+        valid = (durations >= 0) & np.isin(stage, list(STAGE_PATH))
+
+        # Remember the stage each request is in now
+        last = np.ones(len(request_ids), dtype=bool)
+        last[:-1] = request_ids[:-1] != request_ids[1:]
+        for i in np.flatnonzero(last):
+            if current[i] in _STAGE_INDEX:
+                self._open[int(request_ids[i])] = (current[i], times[i])
+            else:
+                # Stopped / final: the request accrues no more stage time
+                self._open.pop(int(request_ids[i]), None)
+
+        durations = durations[valid]
+        if not len(durations):
+            return
+
+        by_stage = np.char.add("\x1f", stage[valid].astype(str))
+        self._add_samples(np.char.add(services[valid].astype(str), by_stage), durations)
+        self._add_samples(np.char.add(ALL_SERVICES, by_stage), durations)
+
+    def _add_samples(self, keys, durations):
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        splits = np.split(durations[order], np.cumsum(np.bincount(inverse))[:-1])
+
+        stats = dict(self._stats)
+        for key, values in zip(unique_keys, splits):
+            service_type, stage = str(key).split("\x1f", 1)
+            group = (service_type, stage)
+            samples = np.concatenate([self._samples.get(group, np.empty(0)), values])[-self.max_samples:]
+            self._samples[group] = samples
+            median, p90 = np.percentile(samples, [50, 90])
+            stats[group] = (float(median), float(p90))
+        self._stats = stats
+
+    # ------------------------------------------------------------
+    # PREDICT
+    # ------------------------------------------------------------
+    def _stage_stats(self, stats, service_type, stage):
+        return stats.get((service_type, stage)) or stats.get((ALL_SERVICES, stage))
+
+    def estimate(self, service_type: str, detailed_status: str, entered_at: datetime = None, now: datetime = None):
+        """
+        {"median": datetime, "p90": datetime} for a request currently in
+        ``detailed_status``, or None when it is off the normal path or
+        there is no history yet.
+        """
+        if detailed_status not in _STAGE_INDEX:
+            return None
+
+        stats = self._stats
+        now = now or datetime.utcnow()
+        elapsed = (now - entered_at).total_seconds() if entered_at else 0.0
+
+        remaining_median = remaining_p90 = 0.0
+        known = False
+        for i, stage in enumerate(STAGE_PATH[_STAGE_INDEX[detailed_status]:]):
+            stage_stats = self._stage_stats(stats, service_type, stage)
+            if not stage_stats:
+                continue
+            known = True
+            median, p90 = stage_stats
+            if i == 0:
+                median, p90 = max(median - elapsed, 0.0), max(p90 - elapsed, 0.0)
+            remaining_median += median
+            remaining_p90 += p90
+
+        if not known:
+            return None
+
+        return {
+            "median": now + timedelta(seconds=remaining_median),
+            "p90": now + timedelta(seconds=remaining_p90)
+        }
+
+    def stats(self):
+        stats = self._stats
+        return [
+            {
+                "service_type": service_type,
+                "detailed_status": stage,
+                "samples": int(len(self._samples.get((service_type, stage), ()))),
+                "median_hours": round(median / 3600, 2),
+                "p90_hours": round(p90 / 3600, 2)
+            }
+            for (service_type, stage), (median, p90) in sorted(
+                stats.items(),
+                key=lambda item: (item[0][0], _STAGE_INDEX.get(item[0][1], len(STAGE_PATH)))
+            )
+        ]
+
+
+def _epoch_seconds(values):
+    """datetimes -> float seconds; missing values become NaN."""
+    stamps = np.asarray(
+        [np.datetime64(v.replace(tzinfo=None), "us") if v else np.datetime64("NaT") for v in values],
+        dtype="datetime64[us]"
+    )
+    seconds = stamps.astype(np.int64) / 1e6
+    seconds[np.isnat(stamps)] = np.nan
+    return seconds
+
+
+settings = get_settings()
+
+eta_predictor = EtaPredictor(max_samples=settings.ETA_MAX_SAMPLES)
+
+eta_job = register_job("eta_refresh", settings.ETA_REFRESH_SECONDS, eta_predictor.refresh)
@@ -1,6 +1,6 @@
 # backend/modules/lab_request/models.py
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric
+from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from core.database import Base
 
@@ -30,6 +30,32 @@ class LabRequest(Base):
     # Store engineer_id as integer without FK constraint
     assigned_engineer_id = Column(Integer, nullable=True)
 
+    # ✅ NEW: Service request this lab request was created for
+    # (calibration / testing / design / certification / debugging / simulation)
+    source_service = Column(String, nullable=True)
+    source_request_id = Column(Integer, nullable=True)
+
+    # ✅ NEW: Lab (labs directory id) this request is routed to
+    lab_id = Column(Integer, nullable=True)
+    lab_name = Column(String, nullable=True)
+
+    # ✅ NEW: When the request entered its current detailed_status (SLA checks)
+    status_entered_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # ✅ NEW: Latest progress percent, written with every progress row so hot
+    # reads never scan lab_request_progress (None = no progress reported yet)
+    current_progress = Column(Integer, nullable=True)
+
+    # ✅ NEW: Customer who owns the source request (None = anonymous)
+    owner_id = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_lab_requests_source", "source_service", "source_request_id"),
+        Index("ix_lab_requests_status_entered", "detailed_status", "status_entered_at"),
+        Index("ix_lab_requests_inbox", "lab_id", "status", "created_date"),
+        Index("ix_lab_requests_owner_created", "owner_id", "created_date"),
+    )
+
 
 class LabRequestProgress(Base):
     """
@@ -46,6 +72,11 @@ class LabRequestProgress(Base):
     updated_by = Column(String, nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # ✅ NEW: Compaction finds requests with old history by time range
+    __table_args__ = (
+        Index("ix_lab_request_progress_updated_at", "updated_at"),
+    )
+
 
 class LabSchedule(Base):
     """
@@ -61,6 +92,12 @@ class LabSchedule(Base):
     end_datetime = Column(DateTime(timezone=True), nullable=False)
     schedule_status = Column(String, default="Scheduled")
 
+    # ✅ NEW: Overlap lookups scan only entries ending after the new start,
+    # so years of finished history are never touched
+    __table_args__ = (
+        Index("ix_lab_schedule_engineer_window", "engineer_id", "end_datetime", "start_datetime"),
+    )
+
 
 class LabRequestStatusLog(Base):
     """
@@ -155,4 +192,53 @@ class LabQuote(Base):
     sent_at = Column(DateTime(timezone=True), nullable=True)
     responded_at = Column(DateTime(timezone=True), nullable=True)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+# ✅ NEW: Transactional outbox for syncing lab changes back to service requests
+class LabSyncOutbox(Base):
+    """
+    One row per lab change that must be mirrored onto the linked service
+    request. Written in the same transaction as the change and drained by
+    the background dispatcher, so no sync is lost if the process dies.
+    Rows are deleted once dispatched; those left with attempts at
+    LAB_SYNC_MAX_ATTEMPTS are the failed syncs.
+    """
+    __tablename__ = "lab_sync_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    lab_request_id = Column(Integer, nullable=False)
+    event_type = Column(String, nullable=False)  # status, progress, assignment
+
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    processed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_lab_sync_outbox_pending", "processed_at", "id"),
+    )
+
+
+# ✅ NEW: Requests that stayed in a detailed status longer than its SLA
+class LabSlaAlert(Base):
+    """
+    One row per breach: (lab request, status, time it entered the status).
+    Resolved once the request moves on.
+    """
+    __tablename__ = "lab_sla_alerts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    lab_request_id = Column(Integer, nullable=False, index=True)
+
+    detailed_status = Column(String, nullable=False)
+    status_entered_at = Column(DateTime(timezone=True), nullable=False)
+    sla_hours = Column(Numeric(10, 2), nullable=False)
+
+    detected_at = Column(DateTime(timezone=True), server_default=func.now())
+    resolved_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("lab_request_id", "detailed_status", "status_entered_at", name="uq_lab_sla_alert"),
+        Index("ix_lab_sla_alerts_open", "resolved_at", "detected_at"),
+    )
@@ -0,0 +1,141 @@
+# backend/modules/lab_request/progress_compaction.py
+"""
+Downsampling of old lab progress history.
+
+Every progress tick appends a LabRequestProgress row, while the latest value
+lives on LabRequest.current_progress. Rows older than
+PROGRESS_COMPACT_AFTER_DAYS are thinned per request, keeping:
+
+    - the first and the last old row
+    - every row whose percent moved by at least PROGRESS_COMPACT_MIN_STEP
+      since the previous kept row
+
+Running the same pass again deletes nothing, so after the first run only
+requests with rows that aged past the cutoff since the last run are read
+(range scan on ix_lab_request_progress_updated_at).
+"""
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from core.background import register_job
+from core.config import get_settings
+from core.database import SessionLocal
+from modules.changes.services import record_changes
+
+from .models import LabRequestProgress
+
+# Keep IN (...) lists well under SQLite's bound-parameter limit
+_DELETE_CHUNK = 500
+
+
+def rows_to_drop(rows, min_step: int):
+    """
+    ids to delete from ``rows`` = [(id, lab_request_id, percent), ...]
+    ordered by request, then time.
+    """
+    drop = []
+    start = 0
+    while start < len(rows):
+        end = start
+        while end + 1 < len(rows) and rows[end + 1][1] == rows[start][1]:
+            end += 1
+
+        anchor = rows[start][2]
+        for row_id, _, percent in rows[start + 1:end]:
+            if abs(percent - anchor) >= min_step:
+                anchor = percent
+            else:
+                drop.append(row_id)
+
+        start = end + 1
+    return drop
+
+
+class ProgressCompactor:
+    def __init__(self, after_days: int, min_step: int, batch_size: int):
+        self.after_days = after_days
+        self.min_step = min_step
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._compacted_until = None    # cutoff of the last completed pass
+
+    def compact(self, db: Session = None, now: datetime = None):
+        """Thin progress history older than the cutoff. Returns counts."""
+        own_session = db is None
+        db = db or SessionLocal()
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(days=self.after_days)
+
+        with self._lock:
+            since = self._compacted_until
+            try:
+                requests = deleted = 0
+                after_id = 0
+                while True:
+                    query = db.query(LabRequestProgress.lab_request_id).filter(
+                        LabRequestProgress.updated_at < cutoff,
+                        LabRequestProgress.lab_request_id > after_id
+                    )
+                    if since is not None:
+                        query = query.filter(LabRequestProgress.updated_at >= since)
+                    page = [
+                        row[0] for row in query.distinct().order_by(
+                            LabRequestProgress.lab_request_id
+                        ).limit(self.batch_size)
+                    ]
+                    if not page:
+                        break
+
+                    drop = rows_to_drop(db.query(
+                        LabRequestProgress.id,
+                        LabRequestProgress.lab_request_id,
+                        LabRequestProgress.progress_percent
+                    ).filter(
+                        LabRequestProgress.lab_request_id.in_(page),
+                        LabRequestProgress.updated_at < cutoff
+                    ).order_by(
+                        LabRequestProgress.lab_request_id,
+                        LabRequestProgress.updated_at,
+                        LabRequestProgress.id
+                    ).all(), self.min_step)
+
+                    for i in range(0, len(drop), _DELETE_CHUNK):
+                        deleted += db.query(LabRequestProgress).filter(
+                            LabRequestProgress.id.in_(drop[i:i + _DELETE_CHUNK])
+                        ).delete(synchronize_session=False)
+
+                    if drop:
+                        # Full views embed the progress history
+                        record_changes(db, "lab_request", page)
+                    db.commit()
+
+                    requests += len(page)
+                    after_id = page[-1]
+
+                self._compacted_until = cutoff
+
+            finally:
+                if own_session:
+                    db.close()
+
+        if deleted:
+            print(f"📊 Progress compaction: {deleted} row(s) removed across {requests} lab request(s)")
+
+        return {"requests": requests, "deleted": deleted}
+
+
+settings = get_settings()
+
+progress_compactor = ProgressCompactor(
+    after_days=settings.PROGRESS_COMPACT_AFTER_DAYS,
+    min_step=settings.PROGRESS_COMPACT_MIN_STEP,
+    batch_size=settings.PROGRESS_COMPACT_BATCH_SIZE
+)
+
+progress_compaction_job = register_job(
+    "progress_compaction",
+    settings.PROGRESS_COMPACTION_SECONDS,
+    progress_compactor.compact
+)
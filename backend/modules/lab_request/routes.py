@@ -1,12 +1,42 @@
 # backend/modules/lab_request/routes.py
 
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from core.database import get_db
-from . import services, schemas
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from core.database import get_db, SessionLocal
+from core.batching import batch_response
+from core.events import event_broker, sse_stream
+from core.http_cache import cached_json_response
+from core.serialization import FastJSONResponse
+from core.single_flight import single_flight, request_key
+from modules.auth.dependencies import (
+    get_current_user,
+    get_optional_user_id,
+    get_owner_scope,
+    owned_ids,
+    require_owner,
+    require_staff
+)
+from modules.auth.token_cache import CurrentUser
+from .models import LabRequest
+from . import services, schemas, sla
+from .engineer_load import engineer_load
+from .eta import eta_predictor
+from .status_config import STATUS_CONFIG
 
 router = APIRouter(prefix="/lab-requests", tags=["Lab Requests"])
+status_config_router = APIRouter(tags=["Status Config"])
+
+
+# ------------------------------------------------------------
+# STATUS CONFIG (compiled once; cacheable by ETag)
+# ------------------------------------------------------------
+@status_config_router.get("/status-config")
+def get_status_config(request: Request):
+    return cached_json_response(request, STATUS_CONFIG, max_age=3600)
 
 
 # ------------------------------------------------------------
@@ -15,32 +45,114 @@ router = APIRouter(prefix="/lab-requests", tags=["Lab Requests"])
 @router.post("/")
 def create_lab_request(
     payload: schemas.LabRequestCreateSchema,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    owner_id: Optional[int] = Depends(get_optional_user_id)
 ):
     return services.create_lab_request(
         db,
         product_name=payload.product_name,
-        service_type=payload.service_type
+        service_type=payload.service_type,
+        owner_id=owner_id
     )
 
 
 # ------------------------------------------------------------
 # GET ALL LAB REQUESTS
 # ------------------------------------------------------------
-@router.get("/")
-def get_lab_requests(db: Session = Depends(get_db)):
-    return services.get_all_lab_requests(db)
+@router.get("/", response_model=List[schemas.LabRequestRowView], response_class=FastJSONResponse)
+def get_lab_requests(
+    db: Session = Depends(get_db),
+    owner_id: Optional[int] = Depends(get_owner_scope)
+):
+    # ✅ Identical concurrent calls (same owner scope) share one computation
+    return FastJSONResponse(single_flight.do(
+        request_key("lab_requests:list", scope=owner_id),
+        lambda: services.get_all_lab_requests(db, owner_id=owner_id)
+    ))
+
+
+# ------------------------------------------------------------
+# PER-LAB INBOX (newest first; page with ?before=<created_date>)
+# ------------------------------------------------------------
+@router.get(
+    "/inbox/{lab_id}",
+    response_model=List[schemas.LabRequestRowView],
+    response_class=FastJSONResponse,
+    dependencies=[Depends(require_staff)]
+)
+def get_lab_inbox(
+    lab_id: int,
+    status: Optional[str] = None,
+    before: Optional[datetime] = None,
+    limit: int = Query(50, gt=0, le=500),
+    db: Session = Depends(get_db)
+):
+    return FastJSONResponse(services.get_lab_inbox(db, lab_id, status=status, before=before, limit=limit))
 
 
 # ------------------------------------------------------------
 # GET FULL REQUEST DETAILS
 # ------------------------------------------------------------
-@router.get("/{lab_request_id}/full")
-def get_full_lab_request(lab_request_id: int, db: Session = Depends(get_db)):
+@router.get("/{lab_request_id}/full", response_model=schemas.LabRequestFullResponse, response_class=FastJSONResponse)
+def get_full_lab_request(
+    lab_request_id: int,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    require_owner(db, LabRequest, lab_request_id, user)
     data = services.get_full_lab_request(db, lab_request_id)
     if not data:
         raise HTTPException(status_code=404, detail="Lab request not found")
-    return data
+    return FastJSONResponse(data)
+
+
+# ------------------------------------------------------------
+# GET FULL DETAILS FOR MANY REQUESTS
+# ------------------------------------------------------------
+@router.post("/full:batch", response_class=FastJSONResponse)
+def get_full_lab_requests_batch(
+    payload: schemas.LabFullBatchSchema,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    data = services.get_full_lab_requests(db, owned_ids(db, LabRequest, payload.ids, user))
+    return FastJSONResponse(batch_response(payload.ids, data))
+
+
+# ------------------------------------------------------------
+# LIVE STATUS / PROGRESS STREAM (Server-Sent Events)
+# ------------------------------------------------------------
+def _check_stream_access(lab_request_id: int, user: CurrentUser):
+    # Short-lived session: a Depends(get_db) session would keep its pooled
+    # connection checked out until the event stream ends
+    db = SessionLocal()
+    try:
+        require_owner(db, LabRequest, lab_request_id, user)
+    finally:
+        db.close()
+
+
+@router.get("/{lab_request_id}/events")
+async def stream_lab_request_events(
+    lab_request_id: int,
+    request: Request,
+    user: CurrentUser = Depends(get_current_user)
+):
+    await run_in_threadpool(_check_stream_access, lab_request_id, user)
+
+    # Subscribe before reading the snapshot so no update falls in between
+    subscription = event_broker.subscribe(services.lab_request_topic(lab_request_id))
+    snapshot = await run_in_threadpool(services.load_lab_request_snapshot, lab_request_id)
+
+    if not snapshot:
+        event_broker.unsubscribe(subscription)
+        raise HTTPException(status_code=404, detail="Lab request not found")
+
+    return StreamingResponse(
+        sse_stream(request, subscription, initial=snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 # ------------------------------------------------------------
@@ -52,12 +164,41 @@ def update_status(
     payload: schemas.LabStatusUpdateSchema,
     db: Session = Depends(get_db)
 ):
-    updated = services.update_lab_request_status(
-        db,
-        lab_request_id,
-        new_status=payload.new_status,
-        changed_by=payload.changed_by
-    )
+    try:
+        updated = services.update_lab_request_status(
+            db,
+            lab_request_id,
+            new_status=payload.new_status,
+            changed_by=payload.changed_by
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if not updated:
+        raise HTTPException(status_code=404, detail="Lab request not found")
+
+    return {"status": "updated", "request": updated}
+
+
+# ------------------------------------------------------------
+# UPDATE DETAILED STATUS (validated against the transition table)
+# ------------------------------------------------------------
+@router.put("/{lab_request_id}/detailed-status")
+def update_detailed_status(
+    lab_request_id: int,
+    payload: schemas.LabDetailedStatusUpdateSchema,
+    db: Session = Depends(get_db)
+):
+    try:
+        updated = services.update_lab_request_detailed_status(
+            db,
+            lab_request_id,
+            detailed_status=payload.detailed_status,
+            reason=payload.reason,
+            updated_by=payload.updated_by
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
     if not updated:
         raise HTTPException(status_code=404, detail="Lab request not found")
@@ -65,6 +206,17 @@ def update_status(
     return {"status": "updated", "request": updated}
 
 
+# ------------------------------------------------------------
+# BULK STATUS / PROGRESS UPDATE (one transaction, per-item errors)
+# ------------------------------------------------------------
+@router.post("/bulk-update")
+def bulk_update(
+    payload: schemas.LabBulkUpdateSchema,
+    db: Session = Depends(get_db)
+):
+    return services.bulk_update_lab_requests(db, payload.items, updated_by=payload.updated_by)
+
+
 # ------------------------------------------------------------
 # ADD PROGRESS UPDATE
 # ------------------------------------------------------------
@@ -74,7 +226,7 @@ def add_progress(
     payload: schemas.LabProgressSchema,
     db: Session = Depends(get_db)
 ):
-    return services.add_lab_progress(
+    progress = services.add_lab_progress(
         db,
         lab_request_id,
         percent=payload.progress_percent,
@@ -82,6 +234,11 @@ def add_progress(
         updated_by=payload.updated_by
     )
 
+    if not progress:
+        raise HTTPException(status_code=404, detail="Lab request not found")
+
+    return progress
+
 
 # ------------------------------------------------------------
 # ASSIGN / REASSIGN ENGINEER
@@ -92,12 +249,15 @@ def assign_engineer(
     payload: schemas.LabAssignmentSchema,
     db: Session = Depends(get_db)
 ):
-    result = services.assign_lab_engineer(
-        db,
-        lab_request_id,
-        engineer_id=payload.engineer_id,
-        assigned_by=payload.assigned_by
-    )
+    try:
+        result = services.assign_lab_engineer(
+            db,
+            lab_request_id,
+            engineer_id=payload.engineer_id,
+            assigned_by=payload.assigned_by
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
     if not result:
         raise HTTPException(status_code=404, detail="Lab request not found")
@@ -105,6 +265,79 @@ def assign_engineer(
     return {"status": "assigned", "assignment": result}
 
 
+# ------------------------------------------------------------
+# AUTO-ASSIGN LEAST-LOADED ENGINEER
+# ------------------------------------------------------------
+@router.put("/{lab_request_id}/assign/auto")
+def auto_assign_engineer(
+    lab_request_id: int,
+    payload: schemas.LabAutoAssignSchema,
+    db: Session = Depends(get_db)
+):
+    try:
+        result = services.auto_assign_lab_engineer(
+            db,
+            lab_request_id,
+            assigned_by=payload.assigned_by,
+            engineer_ids=payload.engineer_ids
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Lab request not found")
+
+    return {"status": "assigned", "assignment": result}
+
+
+@router.post("/assign/auto")
+def auto_assign_engineers(
+    payload: schemas.LabBulkAutoAssignSchema,
+    db: Session = Depends(get_db)
+):
+    return services.auto_assign_lab_requests(
+        db,
+        payload.lab_request_ids,
+        assigned_by=payload.assigned_by,
+        engineer_ids=payload.engineer_ids
+    )
+
+
+@router.get("/engineers/load")
+def get_engineer_load(db: Session = Depends(get_db)):
+    return engineer_load.snapshot(db)
+
+
+# ------------------------------------------------------------
+# STAGE DURATION STATS BEHIND estimated_completion
+# ------------------------------------------------------------
+@router.get("/eta/stats")
+def get_eta_stats():
+    return eta_predictor.stats()
+
+
+# ------------------------------------------------------------
+# SLA BREACH ALERTS
+# ------------------------------------------------------------
+@router.get("/sla/alerts", dependencies=[Depends(require_staff)])
+def get_sla_alerts(
+    open_only: bool = True,
+    limit: int = Query(200, gt=0, le=1000),
+    db: Session = Depends(get_db)
+):
+    return sla.get_sla_alerts(db, open_only=open_only, limit=limit)
+
+
+@router.get("/sla/alerts/events", dependencies=[Depends(require_staff)])
+async def stream_sla_alerts(request: Request):
+    subscription = event_broker.subscribe(sla.SLA_ALERTS_TOPIC)
+    return StreamingResponse(
+        sse_stream(request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # ------------------------------------------------------------
 # CREATE SCHEDULE ENTRY
 # ------------------------------------------------------------
@@ -114,15 +347,60 @@ def create_schedule(
     payload: schemas.LabScheduleSchema,
     db: Session = Depends(get_db)
 ):
-    return services.create_lab_schedule(
+    try:
+        return services.create_lab_schedule(
+            db,
+            lab_request_id,
+            engineer_id=payload.engineer_id,
+            start=payload.start_datetime,
+            end=payload.end_datetime,
+            status=payload.schedule_status
+        )
+    except services.ScheduleConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+# ------------------------------------------------------------
+# EARLIEST COMMON FREE SLOT ACROSS ENGINEERS
+# ------------------------------------------------------------
+@router.get("/schedule/free-slots")
+def get_free_slot(
+    duration: int = Query(..., gt=0, le=7 * 24 * 60, description="Minutes"),
+    engineers: str = Query(..., description="Comma-separated engineer ids"),
+    after: Optional[datetime] = None,
+    horizon_days: int = Query(30, gt=0, le=365),
+    db: Session = Depends(get_db)
+):
+    try:
+        engineer_ids = sorted({int(e) for e in engineers.split(",") if e.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="engineers must be comma-separated integers")
+    if not engineer_ids:
+        raise HTTPException(status_code=400, detail="At least one engineer is required")
+
+    if after is None:
+        after = datetime.utcnow()
+    elif after.tzinfo is not None:
+        after = after.astimezone(timezone.utc).replace(tzinfo=None)
+
+    slot = services.find_common_free_slot(
         db,
-        lab_request_id,
-        engineer_id=payload.engineer_id,
-        start=payload.start_datetime,
-        end=payload.end_datetime,
-        status=payload.schedule_status
+        engineer_ids,
+        duration=timedelta(minutes=duration),
+        after=after,
+        horizon=timedelta(days=horizon_days)
     )
 
+    if not slot:
+        raise HTTPException(status_code=404, detail=f"No common free slot within {horizon_days} days")
+
+    return {
+        "engineers": engineer_ids,
+        "duration_minutes": duration,
+        "start_datetime": slot[0],
+        "end_datetime": slot[1]
+    }
+
 
 # ------------------------------------------------------------
 # UPLOAD DOCUMENTS
@@ -1,7 +1,10 @@
 # backend/modules/lab_request/schemas.py
 
-from pydantic import BaseModel
-from typing import Optional, List
+from datetime import datetime, timezone
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_serializer, field_validator, model_validator
+from typing import Any, Dict, Optional, List, Tuple
+
+from .status_config import CATEGORY_BY_STATUS, get_customer_timeline
 
 
 # -----------------------------
@@ -12,6 +15,13 @@ class LabRequestCreateSchema(BaseModel):
     service_type: str  # EMC / Safety / Thermal
 
 
+# -----------------------------
+# Batch full view
+# -----------------------------
+class LabFullBatchSchema(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=200)
+
+
 # -----------------------------
 # Status Update
 # -----------------------------
@@ -20,6 +30,12 @@ class LabStatusUpdateSchema(BaseModel):
     changed_by: str  # auth.users.id
 
 
+class LabDetailedStatusUpdateSchema(BaseModel):
+    detailed_status: str  # must be an allowed transition (see /status-config)
+    reason: Optional[str] = None
+    updated_by: str  # auth.users.id
+
+
 # -----------------------------
 # Progress Updates
 # -----------------------------
@@ -29,6 +45,29 @@ class LabProgressSchema(BaseModel):
     updated_by: str  # auth.users.id
 
 
+# -----------------------------
+# Bulk status / progress updates
+# -----------------------------
+class LabBulkUpdateItem(BaseModel):
+    lab_request_id: int
+    new_status: Optional[str] = None        # Pending / In Progress / Completed / Rejected
+    detailed_status: Optional[str] = None   # Sample Received / Testing Started / ...
+    progress_percent: Optional[int] = Field(None, ge=0, le=100)
+    notes: Optional[str] = None
+    reason: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_has_update(self):
+        if self.new_status is None and self.detailed_status is None and self.progress_percent is None:
+            raise ValueError("Provide new_status, detailed_status or progress_percent")
+        return self
+
+
+class LabBulkUpdateSchema(BaseModel):
+    items: List[LabBulkUpdateItem] = Field(..., min_length=1, max_length=500)
+    updated_by: str  # auth.users.id
+
+
 # -----------------------------
 # Assignment
 # -----------------------------
@@ -37,15 +76,38 @@ class LabAssignmentSchema(BaseModel):
     assigned_by: str  # auth.users.id
 
 
+class LabAutoAssignSchema(BaseModel):
+    assigned_by: str  # auth.users.id
+    engineer_ids: Optional[List[int]] = None  # limit the pick to these engineers
+
+
+class LabBulkAutoAssignSchema(LabAutoAssignSchema):
+    lab_request_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
 # -----------------------------
 # Schedule
 # -----------------------------
 class LabScheduleSchema(BaseModel):
     engineer_id: int
-    start_datetime: str  # ISO format
-    end_datetime: str    # ISO format
+    start_datetime: datetime  # ISO format
+    end_datetime: datetime    # ISO format
     schedule_status: str  # Scheduled / Completed / Cancelled
 
+    @field_validator("start_datetime", "end_datetime")
+    @classmethod
+    def to_naive_utc(cls, value: datetime):
+        # SQLite stores naive datetimes; keep comparisons consistent
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @model_validator(mode="after")
+    def check_window(self):
+        if self.end_datetime <= self.start_datetime:
+            raise ValueError("end_datetime must be after start_datetime")
+        return self
+
 
 # -----------------------------
 # Document Upload Metadata
@@ -58,13 +120,109 @@ class LabDocumentSchema(BaseModel):
     uploaded_by: str  # auth.users.id
 
 
+# -----------------------------
+# Read views (built from ORM rows, see core.serialization)
+# -----------------------------
+class _ReadView(BaseModel):
+    # Cached and shared between requests: never mutate
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
+class LabRequestRowView(_ReadView):
+    """One row of the lab request list / per-lab inbox"""
+    id: int
+    request_code: Optional[str]
+    product_name: str
+    service_type: str
+    status: Optional[str]
+    detailed_status: Optional[str]
+    customer_message: Optional[str]
+    created_date: Optional[datetime]
+    assigned_engineer_id: Optional[int]
+    lab_id: Optional[int]
+    lab_name: Optional[str]
+    current_progress: Optional[int]
+
+    @field_serializer("request_code")
+    def default_request_code(self, value):
+        return value or f"LR-{self.id}"
+
+    # ✅ Precomputed per status in status_config; no per-row work
+    @computed_field
+    @property
+    def category(self) -> str:
+        return CATEGORY_BY_STATUS.get(self.detailed_status, "unknown")
+
+    @computed_field
+    @property
+    def timeline(self) -> Tuple[Dict[str, Any], ...]:
+        return get_customer_timeline(self.detailed_status)
+
+
+class LabRequestInfoView(_ReadView):
+    id: int
+    product_name: str
+    service_type: str
+    status: Optional[str]
+    detailed_status: Optional[str]
+    customer_message: Optional[str]
+    created_date: Optional[datetime]
+    assigned_engineer_id: Optional[int]
+    current_progress: Optional[int]
+    estimated_completion: Optional[datetime]
+
+
+class LabProgressView(_ReadView):
+    id: int
+    progress_percent: int
+    notes: Optional[str]
+    updated_by: str
+    updated_at: Optional[datetime]
+
+
+class LabScheduleView(_ReadView):
+    id: int
+    engineer_id: int
+    start_datetime: Optional[datetime]
+    end_datetime: Optional[datetime]
+    schedule_status: Optional[str]
+
+
+class LabStatusLogView(_ReadView):
+    id: int
+    previous_status: Optional[str]
+    current_status: str
+    previous_detailed_status: Optional[str]
+    current_detailed_status: Optional[str]
+    changed_by: str
+    changed_at: Optional[datetime]
+    notes: Optional[str]
+
+
+class LabAssignmentView(_ReadView):
+    id: int
+    engineer_id: int
+    assigned_by: str
+    assigned_at: Optional[datetime]
+
+
+class LabDocumentView(_ReadView):
+    id: int
+    document_type: str
+    file_name: str
+    file_path: str
+    file_size: int
+    uploaded_by: str
+    uploaded_at: Optional[datetime]
+
+
 # -----------------------------
 # For returning full request details
 # -----------------------------
-class LabRequestFullResponse(BaseModel):
-    request: dict
-    progress: List[dict]
-    schedule: List[dict]
-    status_logs: List[dict]
-    assignments: List[dict]
-    documents: List[dict]
+class LabRequestFullResponse(_ReadView):
+    request: LabRequestInfoView
+    progress: List[LabProgressView]
+    schedule: List[LabScheduleView]
+    status_logs: List[LabStatusLogView]
+    assignments: List[LabAssignmentView]
+    documents: List[LabDocumentView]
@@ -1,92 +1,393 @@
 # backend/modules/lab_request/services.py
 
 import os
+from datetime import datetime, timedelta
 from pathlib import Path
+from sqlalchemy import event, insert
 from sqlalchemy.orm import Session
 
+from core.background import register_job
+from core.batching import unique_ids, index_by, group_by
+from core.cache import full_view_cache
+from core.config import get_settings
+from core.database import SessionLocal
+from core.events import publish_on_commit
+from modules.changes.services import record_change, record_changes
+
 from .models import (
     LabRequest,
     LabRequestProgress,
     LabSchedule,
     LabRequestStatusLog,
     LabRequestAssignment,
-    LabDocument
+    LabDocument,
+    LabSyncOutbox
+)
+from .schemas import LabRequestFullResponse, LabRequestRowView
+from .engineer_load import engineer_load, is_open
+from .eta import eta_predictor
+from .status_config import (
+    STATUS_DEFINITIONS,
+    get_status_info,
+    is_transition_allowed
+)
+
+settings = get_settings()
+
+
+# ✅ Sync lab changes back to the linked service request (transactional outbox)
+#
+# Write paths call enqueue_lab_sync() before their commit, so the outbox row
+# lands in the same transaction as the lab change. The dispatcher below drains
+# the outbox in batches off the request path and mirrors the lab status onto
+# whichever service request created the lab request. A service request fanned
+# out to several labs gets the aggregate of all its lab requests.
+_OUTBOX_PENDING_KEY = "lab_sync_outbox_pending"
+
+LAB_TO_SERVICE_STATUS = {
+    "Pending": "submitted",
+    "In Progress": "in_progress",
+    "Completed": "completed",
+    "Rejected": "rejected",
+}
+
+
+def aggregate_service_status(lab_statuses):
+    """
+    Service request status for the high-level statuses of all its lab
+    requests: rejected only when every lab rejected, completed once every lab
+    has finished (completed or rejected), submitted while none has started,
+    otherwise in progress.
+    """
+    statuses = {LAB_TO_SERVICE_STATUS.get(status, "submitted") for status in lab_statuses}
+    if not statuses:
+        return "submitted"
+    if statuses == {"rejected"}:
+        return "rejected"
+    if statuses <= {"completed", "rejected"}:
+        return "completed"
+    if statuses == {"submitted"}:
+        return "submitted"
+    return "in_progress"
+
+
+def enqueue_lab_sync(db: Session, lab_request_id: int, event_type: str):
+    db.add(LabSyncOutbox(lab_request_id=lab_request_id, event_type=event_type))
+    db.info[_OUTBOX_PENDING_KEY] = True
+
+
+def enqueue_lab_syncs(db: Session, events: dict):
+    """Queue {lab_request_id: event_type} with a single multi-row INSERT."""
+    if not events:
+        return
+    db.execute(insert(LabSyncOutbox).values([
+        {"lab_request_id": lab_request_id, "event_type": event_type}
+        for lab_request_id, event_type in events.items()
+    ]))
+    db.info[_OUTBOX_PENDING_KEY] = True
+
+
+def _service_request_models():
+    # Import here to avoid circular imports
+    from modules.calibration_request.models import CalibrationRequest
+    from modules.testing_request.models import TestingRequest
+    from modules.design_request.models import DesignRequest
+    from modules.certification_request.models import CertificationRequest
+    from modules.debugging_request.models import DebuggingRequest
+    from modules.simulation_request.models import SimulationRequest
+
+    return {
+        "calibration": CalibrationRequest,
+        "testing": TestingRequest,
+        "design": DesignRequest,
+        "certification": CertificationRequest,
+        "debugging": DebuggingRequest,
+        "simulation": SimulationRequest,
+    }
+
+
+def _resolve_sync_targets(db: Session, lab_requests: list):
+    """
+    Map lab_request_id -> (service, service request row), one IN query per
+    service. Lab requests created before source_service existed fall back to
+    CalibrationRequest.lab_request_id.
+    """
+    models = _service_request_models()
+    targets = {}
+
+    by_service = group_by(
+        [lab for lab in lab_requests if lab.source_service in models],
+        "source_service"
+    )
+    for service, labs in by_service.items():
+        model = models[service]
+        rows = index_by(
+            db.query(model).filter(model.id.in_([lab.source_request_id for lab in labs])).all(),
+            "id"
+        )
+        for lab in labs:
+            if lab.source_request_id in rows:
+                targets[lab.id] = (service, rows[lab.source_request_id])
+
+    legacy_ids = [lab.id for lab in lab_requests if lab.id not in targets and not lab.source_service]
+    if legacy_ids:
+        calibration_model = models["calibration"]
+        for row in db.query(calibration_model).filter(
+            calibration_model.lab_request_id.in_(legacy_ids)
+        ).all():
+            targets.setdefault(row.lab_request_id, ("calibration", row))
+
+    return targets
+
+
+def _sibling_statuses(db: Session, lab_requests: list, targets: dict):
+    """
+    (service, service request id) -> high-level statuses of every lab request
+    fanned out from it, one IN query per service. Legacy lab requests (no
+    source_service) are the only lab of their service request.
+    """
+    statuses = {}
+    wanted = {}
+    for lab in lab_requests:
+        if lab.id not in targets:
+            continue
+        service, target = targets[lab.id]
+        if lab.source_service:
+            wanted.setdefault(service, set()).add(target.id)
+        else:
+            statuses[(service, target.id)] = [lab.status]
+
+    for service, request_ids in wanted.items():
+        for source_request_id, status in db.query(
+            LabRequest.source_request_id, LabRequest.status
+        ).filter(
+            LabRequest.source_service == service,
+            LabRequest.source_request_id.in_(request_ids)
+        ):
+            statuses.setdefault((service, source_request_id), []).append(status)
+
+    return statuses
+
+
+def dispatch_lab_sync_outbox(batch_size: int = None):
+    """
+    Drain one batch of pending outbox rows. Several rows for the same lab
+    request (or for sibling lab requests of one service request) collapse
+    into a single update, since only the latest aggregate state is mirrored.
+    Dispatched rows are deleted so the outbox only holds pending work and
+    rows that ran out of attempts. Returns the number of outbox rows processed.
+    """
+    batch_size = batch_size or settings.LAB_SYNC_BATCH_SIZE
+    db = SessionLocal()
+    try:
+        rows = db.query(LabSyncOutbox).filter(
+            LabSyncOutbox.processed_at.is_(None),
+            LabSyncOutbox.attempts < settings.LAB_SYNC_MAX_ATTEMPTS
+        ).order_by(LabSyncOutbox.id).limit(batch_size).all()
+
+        if not rows:
+            return 0
+
+        row_ids = [row.id for row in rows]
+        lab_ids = unique_ids(row.lab_request_id for row in rows)
+
+        try:
+            lab_requests = db.query(LabRequest).filter(LabRequest.id.in_(lab_ids)).all()
+            targets = _resolve_sync_targets(db, lab_requests)
+            sibling_statuses = _sibling_statuses(db, lab_requests, targets)
+
+            synced = 0
+            for service, target in {(s, t.id): (s, t) for s, t in targets.values()}.values():
+                new_status = aggregate_service_status(sibling_statuses[(service, target.id)])
+                if target.status != new_status:
+                    target.status = new_status
+                    record_change(db, service, target.id)
+                    synced += 1
+
+            # ✅ Also sweeps rows only stamped processed_at by older versions
+            db.query(LabSyncOutbox).filter(
+                LabSyncOutbox.id.in_(row_ids) | LabSyncOutbox.processed_at.isnot(None)
+            ).delete(synchronize_session=False)
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            db.query(LabSyncOutbox).filter(LabSyncOutbox.id.in_(row_ids)).update(
+                {
+                    LabSyncOutbox.attempts: LabSyncOutbox.attempts + 1,
+                    LabSyncOutbox.last_error: str(e)
+                },
+                synchronize_session=False
+            )
+            db.commit()
+            raise
+
+        if synced:
+            print(f"✅ Lab sync: {len(rows)} outbox rows, {synced} service requests updated")
+
+        return len(rows)
+
+    finally:
+        db.close()
+
+
+lab_sync_job = register_job(
+    "lab_sync_outbox",
+    settings.LAB_SYNC_INTERVAL_SECONDS,
+    dispatch_lab_sync_outbox
 )
-from .status_config import get_status_info, get_customer_timeline
 
 
-# ✅ Helper function to sync lab changes back to calibration
-def sync_to_calibration(db: Session, lab_request_id: int):
+@event.listens_for(Session, "after_commit")
+def _wake_lab_sync(session):
+    if session.info.pop(_OUTBOX_PENDING_KEY, False):
+        lab_sync_job.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_lab_sync(session):
+    session.info.pop(_OUTBOX_PENDING_KEY, None)
+
+
+# ✅ Push lab changes to SSE subscribers once the transaction commits
+def lab_request_topic(lab_request_id: int) -> str:
+    return f"lab_request:{lab_request_id}"
+
+
+def service_request_topic(service: str, request_id: int) -> str:
+    """Updates of every lab request fanned out from one service request"""
+    return f"{service}_request:{request_id}"
+
+
+def lab_request_event(req: LabRequest, event_type: str, **extra):
+    return {
+        "type": event_type,
+        "lab_request_id": req.id,
+        "status": req.status,
+        "detailed_status": req.detailed_status,
+        "customer_message": req.customer_message,
+        "assigned_engineer_id": req.assigned_engineer_id,
+        **extra
+    }
+
+
+def publish_lab_update(db: Session, req: LabRequest, event_type: str, **extra):
+    payload = lab_request_event(req, event_type, **extra)
+    publish_on_commit(db, lab_request_topic(req.id), payload)
+    if req.source_service and req.source_request_id:
+        publish_on_commit(db, service_request_topic(req.source_service, req.source_request_id), payload)
+
+
+def get_lab_request_snapshot(db: Session, lab_request_id: int):
+    """Current state sent as the first SSE frame"""
+    req = db.query(LabRequest).filter(LabRequest.id == lab_request_id).first()
+    if not req:
+        return None
+
+    return lab_request_event(req, "snapshot", progress_percent=req.current_progress)
+
+
+def get_linked_lab_requests(db: Session, service: str, request_ids, primary_lab_request_ids=()):
     """
-    Sync lab request status and progress back to calibration request
+    {service request id: [LabRequest, ...]} for every lab a batch of service
+    requests was sent to, in one query. ``primary_lab_request_ids`` maps
+    service request id -> its primary lab_request_id so requests created
+    before lab requests carried source_service are still covered.
     """
+    request_ids = unique_ids(request_ids)
+    primary_lab_request_ids = dict(primary_lab_request_ids)
+    if not request_ids:
+        return {}
+
+    condition = (LabRequest.source_service == service) & LabRequest.source_request_id.in_(request_ids)
+    legacy_ids = [i for i in primary_lab_request_ids.values() if i]
+    if legacy_ids:
+        condition = condition | LabRequest.id.in_(legacy_ids)
+
+    by_id = {lab.id: lab for lab in db.query(LabRequest).filter(condition).order_by(LabRequest.id)}
+    linked = {request_id: [] for request_id in request_ids}
+    for lab in by_id.values():
+        if lab.source_service == service and lab.source_request_id in linked:
+            linked[lab.source_request_id].append(lab)
+    for request_id, lab_request_id in primary_lab_request_ids.items():
+        lab = by_id.get(lab_request_id)
+        if lab is not None and request_id in linked and lab not in linked[request_id]:
+            linked[request_id].insert(0, lab)
+    return linked
+
+
+def load_service_request_snapshot(service: str, request_id: int, primary_lab_request_id: int):
+    """
+    First SSE frame for a service request, read on a short-lived session: the
+    primary lab request at the top level and every linked lab request under
+    ``lab_requests``.
+    """
+    db = SessionLocal()
     try:
-        # Import here to avoid circular imports
-        from modules.calibration_request.models import CalibrationRequest
-        
-        # Find calibration request linked to this lab request
-        calibration_req = db.query(CalibrationRequest).filter(
-            CalibrationRequest.lab_request_id == lab_request_id
-        ).first()
-        
-        if not calibration_req:
-            print(f"⚠️ No calibration request found for lab request {lab_request_id}")
-            return
-        
-        # Get lab request details
-        lab_req = db.query(LabRequest).filter(
-            LabRequest.id == lab_request_id
-        ).first()
-        
-        if not lab_req:
-            return
-        
-        # Get latest progress
-        latest_progress = db.query(LabRequestProgress).filter(
-            LabRequestProgress.lab_request_id == lab_request_id
-        ).order_by(LabRequestProgress.updated_at.desc()).first()
-        
-        # Map lab status to calibration status
-        status_mapping = {
-            "Pending": "submitted",
-            "In Progress": "in_progress",
-            "Completed": "completed",
-            "Rejected": "rejected",
-        }
-        
-        new_cal_status = status_mapping.get(lab_req.status, "submitted")
-        
-        # Update calibration request status
-        old_status = calibration_req.status
-        calibration_req.status = new_cal_status
-        
-        db.commit()
-        
-        print(f"✅ Synced lab request {lab_request_id} → calibration request {calibration_req.id}")
-        print(f"   Status: {old_status} → {new_cal_status}")
-        print(f"   Detailed Status: {lab_req.detailed_status}")
-        if latest_progress:
-            print(f"   Progress: {latest_progress.progress_percent}%")
-        
-    except Exception as e:
-        print(f"⚠️ Failed to sync to calibration: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        labs = get_linked_lab_requests(
+            db, service, [request_id], {request_id: primary_lab_request_id}
+        )[request_id]
+        if not labs:
+            return None
+
+        primary = next((lab for lab in labs if lab.id == primary_lab_request_id), labs[0])
+        snapshot = lab_request_event(primary, "snapshot", progress_percent=primary.current_progress)
+        snapshot["lab_requests"] = [
+            lab_request_event(lab, "snapshot", progress_percent=lab.current_progress)
+            for lab in labs
+        ]
+        return snapshot
+    finally:
+        db.close()
+
+
+def load_lab_request_snapshot(lab_request_id: int):
+    """
+    get_lab_request_snapshot on a short-lived session. SSE routes must not hold
+    a request-scoped session: it would keep a pooled connection checked out
+    for as long as the client stays subscribed.
+    """
+    db = SessionLocal()
+    try:
+        return get_lab_request_snapshot(db, lab_request_id)
+    finally:
+        db.close()
 
 
 # --------------------------------------------------------
 # CREATE NEW LAB REQUEST
 # --------------------------------------------------------
-def create_lab_request(db: Session, product_name: str, service_type: str):
-    req = LabRequest(
+def _new_lab_request(product_name, service_type, source_service=None, source_request_id=None, lab=None, owner_id=None):
+    return LabRequest(
         product_name=product_name,
         service_type=service_type,
+        source_service=source_service,
+        source_request_id=source_request_id,
+        owner_id=owner_id,
+        lab_id=lab["id"] if lab else None,
+        lab_name=lab["lab_name"] if lab else None,
         status="Pending",
         detailed_status="Submitted",
-        customer_message="Your calibration request has been submitted and is awaiting lab review."
+        customer_message="Your calibration request has been submitted and is awaiting lab review.",
+        # Set explicitly: migrated databases have the column without a default,
+        # and a NULL never matches the SLA check
+        status_entered_at=datetime.utcnow()
     )
 
+
+def create_lab_request(
+    db: Session,
+    product_name: str,
+    service_type: str,
+    source_service: str = None,
+    source_request_id: int = None,
+    owner_id: int = None
+):
+    req = _new_lab_request(product_name, service_type, source_service, source_request_id, owner_id=owner_id)
+
     db.add(req)
+    db.flush()
+    record_change(db, "lab_request", req.id)
     db.commit()
     db.refresh(req)
     
@@ -95,135 +396,201 @@ def create_lab_request(db: Session, product_name: str, service_type: str):
     return req
 
 
+# --------------------------------------------------------
+# FAN OUT ONE LAB REQUEST PER SELECTED LAB (caller commits)
+# --------------------------------------------------------
+def create_lab_requests_for_labs(
+    db: Session,
+    product_name: str,
+    service_type: str,
+    labs: list,
+    source_service: str = None,
+    source_request_id: int = None,
+    owner_id: int = None
+):
+    """
+    Add one lab request per lab ({"id", "lab_name"} from the labs
+    directory) to the caller's transaction. With no labs, a single
+    unrouted request is created so the submission is never lost.
+    """
+    requests = [
+        _new_lab_request(product_name, service_type, source_service, source_request_id, lab, owner_id)
+        for lab in (labs or [None])
+    ]
+
+    db.add_all(requests)
+    db.flush()
+    record_changes(db, "lab_request", [req.id for req in requests])
+
+    print(f"✅ Lab requests created: IDs={[req.id for req in requests]}, Product={product_name}, Service={service_type}")
+
+    return requests
+
+
 # --------------------------------------------------------
 # GET ALL LAB REQUESTS
 # --------------------------------------------------------
-def get_all_lab_requests(db: Session):
+def get_all_lab_requests(db: Session, owner_id: int = None):
     """
     Get all lab requests with enhanced information
+    (owner_id: only that customer's)
     """
-    requests = db.query(LabRequest).all()
+    query = db.query(LabRequest)
+    if owner_id is not None:
+        query = query.filter(LabRequest.owner_id == owner_id)
+    requests = query.all()
     
     print(f"📊 Found {len(requests)} lab requests in database")
     
-    result = []
-    for req in requests:
-        result.append({
-            "id": req.id,
-            "request_code": req.request_code or f"LR-{req.id}",
-            "product_name": req.product_name,
-            "service_type": req.service_type,
-            "status": req.status,
-            "detailed_status": req.detailed_status,
-            "customer_message": req.customer_message,
-            "created_date": req.created_date.isoformat() if req.created_date else None,
-            "assigned_engineer_id": req.assigned_engineer_id
-        })
-    
-    return result
+    return [_lab_request_row(req) for req in requests]
+
+
+def _lab_request_row(req: LabRequest):
+    return LabRequestRowView.model_validate(req)
+
+
+# --------------------------------------------------------
+# PER-LAB INBOX
+# --------------------------------------------------------
+def get_lab_inbox(db: Session, lab_id: int, status: str = None, before=None, limit: int = 50):
+    """
+    Newest-first queue of one lab, served by ix_lab_requests_inbox
+    (lab_id, status, created_date). Pass the last row's created_date as
+    ``before`` to page.
+    """
+    query = db.query(LabRequest).filter(LabRequest.lab_id == lab_id)
+    if status:
+        query = query.filter(LabRequest.status == status)
+    if before is not None:
+        query = query.filter(LabRequest.created_date < before)
+
+    rows = query.order_by(LabRequest.created_date.desc(), LabRequest.id.desc()).limit(limit).all()
+    return [_lab_request_row(req) for req in rows]
 
 
 # --------------------------------------------------------
 # GET FULL LAB REQUEST DETAILS
 # --------------------------------------------------------
 def get_full_lab_request(db: Session, lab_request_id: int):
-    req = db.query(LabRequest).filter(
-        LabRequest.id == lab_request_id
-    ).first()
+    return get_full_lab_requests(db, [lab_request_id]).get(lab_request_id)
 
-    if not req:
-        return None
 
-    progress = db.query(LabRequestProgress).filter(
-        LabRequestProgress.lab_request_id == lab_request_id
-    ).all()
+# --------------------------------------------------------
+# GET FULL DETAILS FOR MANY LAB REQUESTS (one query per table)
+# --------------------------------------------------------
+def get_full_lab_requests(db: Session, lab_request_ids: list):
+    ids = unique_ids(lab_request_ids)
+    if not ids:
+        return {}
+
+    return full_view_cache.get_many(
+        "lab_request", ids, lambda missing: _load_full_lab_requests(db, missing)
+    )
 
-    schedule = db.query(LabSchedule).filter(
-        LabSchedule.lab_request_id == lab_request_id
-    ).all()
 
-    logs = db.query(LabRequestStatusLog).filter(
-        LabRequestStatusLog.lab_request_id == lab_request_id
-    ).all()
+def _load_full_lab_requests(db: Session, ids: list):
+    reqs = db.query(LabRequest).filter(LabRequest.id.in_(ids)).all()
+    if not reqs:
+        return {}
 
-    assignments = db.query(LabRequestAssignment).filter(
-        LabRequestAssignment.lab_request_id == lab_request_id
-    ).all()
+    found_ids = [r.id for r in reqs]
 
-    documents = db.query(LabDocument).filter(
-        LabDocument.lab_request_id == lab_request_id
-    ).all()
+    def _children(model):
+        return group_by(
+            db.query(model).filter(
+                model.lab_request_id.in_(found_ids)
+            ).order_by(model.id).all(),
+            "lab_request_id"
+        )
+
+    progress = _children(LabRequestProgress)
+    schedule = _children(LabSchedule)
+    logs = _children(LabRequestStatusLog)
+    assignments = _children(LabRequestAssignment)
+    documents = _children(LabDocument)
 
-    # Return unified structured response
     return {
-        "request": {
-            "id": req.id,
-            "product_name": req.product_name,
-            "service_type": req.service_type,
-            "status": req.status,
-            "detailed_status": req.detailed_status,
-            "customer_message": req.customer_message,
-            "created_date": req.created_date.isoformat() if req.created_date else None,
-            "assigned_engineer_id": req.assigned_engineer_id,
-            "estimated_completion": req.estimated_completion.isoformat() if req.estimated_completion else None
-        },
-        "progress": [
-            {
-                "id": p.id,
-                "progress_percent": p.progress_percent,
-                "notes": p.notes,
-                "updated_by": p.updated_by,
-                "updated_at": p.updated_at.isoformat() if p.updated_at else None
-            }
-            for p in progress
-        ],
-        "schedule": [
-            {
-                "id": s.id,
-                "engineer_id": s.engineer_id,
-                "start_datetime": s.start_datetime.isoformat() if s.start_datetime else None,
-                "end_datetime": s.end_datetime.isoformat() if s.end_datetime else None,
-                "schedule_status": s.schedule_status
-            }
-            for s in schedule
-        ],
-        "status_logs": [
-            {
-                "id": l.id,
-                "previous_status": l.previous_status,
-                "current_status": l.current_status,
-                "previous_detailed_status": getattr(l, 'previous_detailed_status', None),
-                "current_detailed_status": getattr(l, 'current_detailed_status', None),
-                "changed_by": l.changed_by,
-                "changed_at": l.changed_at.isoformat() if l.changed_at else None,
-                "notes": getattr(l, 'notes', None)
-            }
-            for l in logs
-        ],
-        "assignments": [
-            {
-                "id": a.id,
-                "engineer_id": a.engineer_id,
-                "assigned_by": a.assigned_by,
-                "assigned_at": a.assigned_at.isoformat() if a.assigned_at else None
-            }
-            for a in assignments
-        ],
-        "documents": [
-            {
-                "id": d.id,
-                "document_type": d.document_type,
-                "file_name": d.file_name,
-                "file_path": d.file_path,
-                "file_size": d.file_size,
-                "uploaded_by": d.uploaded_by,
-                "uploaded_at": d.uploaded_at.isoformat() if d.uploaded_at else None
-            }
-            for d in documents
-        ]
+        req.id: _build_full_lab_view(
+            req,
+            progress=progress.get(req.id, []),
+            schedule=schedule.get(req.id, []),
+            logs=logs.get(req.id, []),
+            assignments=assignments.get(req.id, []),
+            documents=documents.get(req.id, [])
+        )
+        for req in reqs
     }
 
 
+def _build_full_lab_view(req, progress, schedule, logs, assignments, documents):
+    # Return unified structured response (validated straight from the ORM rows)
+    return LabRequestFullResponse(
+        request=req,
+        progress=progress,
+        schedule=schedule,
+        status_logs=logs,
+        assignments=assignments,
+        documents=documents
+    )
+
+
+# --------------------------------------------------------
+# STATUS HELPERS (shared by single and bulk updates)
+# --------------------------------------------------------
+# Auto-update detailed status based on high-level status
+DEFAULT_DETAILED_STATUS = {
+    "Pending": "Submitted",
+    "In Progress": "Testing Started",
+    "Completed": "Completed",
+    "Rejected": "Rejected by Lab"
+}
+
+
+def _status_log_row(req: LabRequest, new_status: str, new_detailed: str, changed_by: str, notes: str = None):
+    # Captures the "previous" values, so build it before changing req
+    return {
+        "lab_request_id": req.id,
+        "previous_status": req.status,
+        "current_status": new_status,
+        "previous_detailed_status": req.detailed_status,
+        "current_detailed_status": new_detailed,
+        "changed_by": changed_by,
+        "notes": notes
+    }
+
+
+def _check_transition(req: LabRequest, detailed_status: str):
+    """Raise ValueError unless the workflow allows req -> detailed_status."""
+    if not is_transition_allowed(req.detailed_status, detailed_status):
+        raise ValueError(f"Cannot move from '{req.detailed_status}' to '{detailed_status}'")
+
+
+def _apply_detailed_status(req: LabRequest, detailed_status: str, test_progress=None, reason=None):
+    status_info = get_status_info(detailed_status, test_progress=test_progress, reason=reason)
+    entering = req.detailed_status != detailed_status
+    req.detailed_status = detailed_status
+    req.customer_message = status_info["message"]
+    if entering:
+        req.status_entered_at = datetime.utcnow()
+
+    # ✅ Re-estimate completion from historical stage durations
+    if entering:
+        eta = eta_predictor.estimate(req.service_type, detailed_status)
+        if eta:
+            req.estimated_completion = eta["median"]
+    return status_info
+
+
+def _apply_high_level_status(req: LabRequest, new_status: str):
+    """Raises ValueError (before changing req) if the mapped detailed status is not allowed."""
+    detailed_status = DEFAULT_DETAILED_STATUS.get(new_status)
+    if detailed_status:
+        _check_transition(req, detailed_status)
+    req.status = new_status
+    if detailed_status:
+        _apply_detailed_status(req, detailed_status)
+
+
 # --------------------------------------------------------
 # UPDATE DETAILED STATUS
 # --------------------------------------------------------
@@ -235,7 +602,8 @@ def update_lab_request_detailed_status(
     updated_by: str = "system"
 ):
     """
-    Update detailed status with customer message
+    Update detailed status with customer message.
+    Raises ValueError if the workflow does not allow the transition.
     """
     req = db.query(LabRequest).filter(
         LabRequest.id == lab_request_id
@@ -243,53 +611,37 @@ def update_lab_request_detailed_status(
     
     if not req:
         return None
+
+    _check_transition(req, detailed_status)
     
-    # Get latest progress for dynamic message
-    latest_progress = db.query(LabRequestProgress).filter(
-        LabRequestProgress.lab_request_id == lab_request_id
-    ).order_by(LabRequestProgress.updated_at.desc()).first()
-    
-    test_progress = latest_progress.progress_percent if latest_progress else None
-    
-    # Get status info
-    status_info = get_status_info(
-        detailed_status,
-        test_progress=test_progress,
-        reason=reason
-    )
-    
-    # Log status change
-    log = LabRequestStatusLog(
-        lab_request_id=lab_request_id,
-        previous_status=req.status,
-        current_status=req.status,
-        previous_detailed_status=req.detailed_status,
-        current_detailed_status=detailed_status,
-        changed_by=updated_by,
-        notes=reason
-    )
+    # Latest progress for dynamic message
+    test_progress = req.current_progress
     
-    # Update request
-    req.detailed_status = detailed_status
-    req.customer_message = status_info["message"]
+    # Log status change, then update request
+    log = LabRequestStatusLog(**_status_log_row(req, req.status, detailed_status, updated_by, reason))
+    status_info = _apply_detailed_status(req, detailed_status, test_progress=test_progress, reason=reason)
     
     db.add(log)
+    record_change(db, "lab_request", lab_request_id)
+    publish_lab_update(db, req, "status")
+    enqueue_lab_sync(db, lab_request_id, "status")
     db.commit()
     db.refresh(req)
     
     print(f"✅ Updated detailed status to: {detailed_status}")
     print(f"   Customer message: {status_info['message']}")
     
-    # Sync to calibration
-    sync_to_calibration(db, lab_request_id)
-    
     return req
 
 
 # --------------------------------------------------------
-# UPDATE STATUS + WRITE STATUS LOG + SYNC TO CALIBRATION
+# UPDATE STATUS + WRITE STATUS LOG + QUEUE SERVICE SYNC
 # --------------------------------------------------------
 def update_lab_request_status(db: Session, lab_request_id: int, new_status: str, changed_by: str):
+    """
+    Set the high-level status (and its default detailed status).
+    Raises ValueError if the workflow does not allow the transition.
+    """
     req = db.query(LabRequest).filter(
         LabRequest.id == lab_request_id
     ).first()
@@ -297,44 +649,30 @@ def update_lab_request_status(db: Session, lab_request_id: int, new_status: str,
     if not req:
         return None
 
-    log = LabRequestStatusLog(
-        lab_request_id=lab_request_id,
-        previous_status=req.status,
-        current_status=new_status,
-        previous_detailed_status=req.detailed_status,
-        current_detailed_status=req.detailed_status,
-        changed_by=changed_by
-    )
-
-    req.status = new_status
-    
-    # Auto-update detailed status based on high-level status
-    detailed_status_map = {
-        "Pending": "Submitted",
-        "In Progress": "Testing Started",
-        "Completed": "Completed",
-        "Rejected": "Rejected by Lab"
-    }
-    
-    if new_status in detailed_status_map:
-        new_detailed = detailed_status_map[new_status]
-        status_info = get_status_info(new_detailed)
-        req.detailed_status = new_detailed
-        req.customer_message = status_info["message"]
+    log = LabRequestStatusLog(**_status_log_row(req, new_status, req.detailed_status, changed_by))
+    was_open = is_open(req.status)
+    _apply_high_level_status(req, new_status)
+    _track_open_change(db, req, was_open)
 
     db.add(log)
+    record_change(db, "lab_request", lab_request_id)
+    publish_lab_update(db, req, "status")
+    enqueue_lab_sync(db, lab_request_id, "status")
     db.commit()
-    
-    # ✅ Sync status change to calibration
-    sync_to_calibration(db, lab_request_id)
+    db.refresh(req)
     
     return req
 
 
 # --------------------------------------------------------
-# ADD PROGRESS UPDATE + SYNC TO CALIBRATION
+# ADD PROGRESS UPDATE + QUEUE SERVICE SYNC
 # --------------------------------------------------------
 def add_lab_progress(db: Session, lab_request_id: int, percent: int, notes: str, updated_by: str):
+    req = db.query(LabRequest).filter(LabRequest.id == lab_request_id).first()
+
+    if not req:
+        return None
+
     progress = LabRequestProgress(
         lab_request_id=lab_request_id,
         progress_percent=percent,
@@ -343,17 +681,19 @@ def add_lab_progress(db: Session, lab_request_id: int, percent: int, notes: str,
     )
 
     db.add(progress)
-    db.commit()
-    
+
     # Update request's detailed status message if in progress
-    req = db.query(LabRequest).filter(LabRequest.id == lab_request_id).first()
-    if req and req.detailed_status == "In Progress":
+    req.current_progress = percent
+    if req.detailed_status == "In Progress":
         status_info = get_status_info("In Progress", test_progress=percent)
         req.customer_message = status_info["message"]
-        db.commit()
-    
-    # ✅ Sync progress to calibration
-    sync_to_calibration(db, lab_request_id)
+
+    publish_lab_update(db, req, "progress", progress_percent=percent, notes=notes)
+
+    record_change(db, "lab_request", lab_request_id)
+    enqueue_lab_sync(db, lab_request_id, "progress")
+    db.commit()
+    db.refresh(progress)
     
     return progress
 
@@ -362,6 +702,7 @@ def add_lab_progress(db: Session, lab_request_id: int, percent: int, notes: str,
 # ASSIGN / REASSIGN ENGINEER + LOG ENTRY + SYNC
 # --------------------------------------------------------
 def assign_lab_engineer(db: Session, lab_request_id: int, engineer_id: int, assigned_by: str):
+    """Raises ValueError if the assignment would make a disallowed status move."""
     req = db.query(LabRequest).filter(
         LabRequest.id == lab_request_id
     ).first()
@@ -369,8 +710,32 @@ def assign_lab_engineer(db: Session, lab_request_id: int, engineer_id: int, assi
     if not req:
         return None
 
+    log = _assign_engineer(db, req, engineer_id, assigned_by)
+
+    record_change(db, "lab_request", lab_request_id)
+    publish_lab_update(db, req, "assignment")
+    enqueue_lab_sync(db, lab_request_id, "assignment")
+    db.commit()
+    db.refresh(log)
+    
+    return log
+
+
+def _assign_engineer(db: Session, req: LabRequest, engineer_id: int, assigned_by: str):
+    """
+    Record the assignment on ``req`` without committing. Raises ValueError
+    (before changing anything) when the automatic Pending -> Testing Started
+    move is not allowed from the current detailed status.
+    """
+    starts_testing = req.status == "Pending"
+    if starts_testing:
+        _check_transition(req, "Testing Started")
+
+    previous_engineer_id = req.assigned_engineer_id
+    was_open = is_open(req.status)
+
     log = LabRequestAssignment(
-        lab_request_id=lab_request_id,
+        lab_request_id=req.id,
         engineer_id=engineer_id,
         assigned_by=assigned_by
     )
@@ -378,25 +743,210 @@ def assign_lab_engineer(db: Session, lab_request_id: int, engineer_id: int, assi
     req.assigned_engineer_id = engineer_id
     
     # Auto-change status to "In Progress" when assigned
-    if req.status == "Pending":
+    if starts_testing:
         req.status = "In Progress"
-        req.detailed_status = "Testing Started"
-        status_info = get_status_info("Testing Started")
-        req.customer_message = status_info["message"]
+        _apply_detailed_status(req, "Testing Started")
+
+    # Move the open request from the previous engineer's load to the new one
+    if previous_engineer_id != engineer_id and is_open(req.status):
+        if was_open:
+            engineer_load.adjust(db, previous_engineer_id, -1)
+        engineer_load.adjust(db, engineer_id, 1)
 
     db.add(log)
-    db.commit()
-    
-    # ✅ Sync assignment to calibration
-    sync_to_calibration(db, lab_request_id)
-    
     return log
 
 
+def _track_open_change(db: Session, req: LabRequest, was_open: bool):
+    # Completing / rejecting a request frees its engineer; reopening re-adds it
+    if was_open != is_open(req.status):
+        engineer_load.adjust(db, req.assigned_engineer_id, -1 if was_open else 1)
+
+
+# --------------------------------------------------------
+# AUTO-ASSIGN LEAST-LOADED ENGINEER
+# --------------------------------------------------------
+def auto_assign_lab_engineer(db: Session, lab_request_id: int, assigned_by: str, engineer_ids: list = None):
+    """
+    Assign the engineer with the lowest current load (open requests +
+    upcoming schedule entries), optionally limited to ``engineer_ids``.
+    Raises ValueError when no engineer is available.
+    """
+    engineer_id = engineer_load.pick(db, engineer_ids)
+    if engineer_id is None:
+        raise ValueError("No engineers available for auto-assignment")
+    return assign_lab_engineer(db, lab_request_id, engineer_id, assigned_by)
+
+
+def auto_assign_lab_requests(db: Session, lab_request_ids: list, assigned_by: str, engineer_ids: list = None):
+    """
+    Auto-assign many lab requests in one transaction; each pick sees the
+    load added by the previous ones. Per-item errors are reported.
+    """
+    ids = unique_ids(lab_request_ids)
+    requests = index_by(db.query(LabRequest).filter(LabRequest.id.in_(ids)).all(), "id")
+
+    results = []
+    assigned = {}
+    for lab_request_id in ids:
+        req = requests.get(lab_request_id)
+        if not req:
+            results.append({"lab_request_id": lab_request_id, "ok": False, "error": "Lab request not found"})
+            continue
+        if not is_open(req.status):
+            results.append({"lab_request_id": lab_request_id, "ok": False, "error": f"Lab request is {req.status}"})
+            continue
+
+        engineer_id = engineer_load.pick(db, engineer_ids)
+        if engineer_id is None:
+            results.append({"lab_request_id": lab_request_id, "ok": False, "error": "No engineers available"})
+            continue
+
+        try:
+            _assign_engineer(db, req, engineer_id, assigned_by)
+        except ValueError as e:
+            results.append({"lab_request_id": lab_request_id, "ok": False, "error": str(e)})
+            continue
+        publish_lab_update(db, req, "assignment")
+        assigned[req.id] = "assignment"
+        results.append({"lab_request_id": req.id, "ok": True, "engineer_id": engineer_id})
+
+    record_changes(db, "lab_request", assigned)
+    enqueue_lab_syncs(db, assigned)
+    db.commit()
+
+    print(f"✅ Auto-assigned {len(assigned)} of {len(ids)} lab requests")
+
+    return {"assigned": len(assigned), "failed": len(ids) - len(assigned), "results": results}
+
+
+# --------------------------------------------------------
+# BULK STATUS / DETAILED STATUS / PROGRESS UPDATE
+# --------------------------------------------------------
+def bulk_update_lab_requests(db: Session, items: list, updated_by: str):
+    """
+    Apply many status / detailed status / progress updates in one
+    transaction. Invalid items are reported and skipped; valid ones are
+    applied in order. Status-log and progress rows go in as one multi-row
+    INSERT each, and every touched lab request gets one outbox row.
+    """
+    ids = unique_ids(item.lab_request_id for item in items)
+    requests = index_by(db.query(LabRequest).filter(LabRequest.id.in_(ids)).all(), "id")
+
+    results = []
+    log_rows = []
+    progress_rows = []
+    touched = {}
+
+    for index, item in enumerate(items):
+        req = requests.get(item.lab_request_id)
+        error = None
+        if not req:
+            error = "Lab request not found"
+        elif item.detailed_status and item.detailed_status not in STATUS_DEFINITIONS:
+            error = f"Unknown detailed status: {item.detailed_status}"
+        elif item.new_status and item.new_status not in DEFAULT_DETAILED_STATUS:
+            error = f"Unknown status: {item.new_status}"
+        elif item.new_status and not is_transition_allowed(
+            req.detailed_status, DEFAULT_DETAILED_STATUS[item.new_status]
+        ):
+            error = f"Cannot move from '{req.detailed_status}' to '{DEFAULT_DETAILED_STATUS[item.new_status]}'"
+        elif item.detailed_status:
+            # Checked from where new_status (if any) leaves the request
+            source_status = DEFAULT_DETAILED_STATUS[item.new_status] if item.new_status else req.detailed_status
+            if not is_transition_allowed(source_status, item.detailed_status):
+                error = f"Cannot move from '{source_status}' to '{item.detailed_status}'"
+
+        if error:
+            results.append({"index": index, "lab_request_id": item.lab_request_id, "ok": False, "error": error})
+            continue
+
+        event_type = "status"
+
+        if item.progress_percent is not None:
+            req.current_progress = item.progress_percent
+            progress_rows.append({
+                "lab_request_id": req.id,
+                "progress_percent": item.progress_percent,
+                "notes": item.notes,
+                "updated_by": updated_by
+            })
+            if req.detailed_status == "In Progress" and not item.detailed_status:
+                _apply_detailed_status(req, "In Progress", test_progress=item.progress_percent)
+            event_type = "progress"
+
+        if item.new_status:
+            log_rows.append(_status_log_row(req, item.new_status, req.detailed_status, updated_by, item.reason))
+            was_open = is_open(req.status)
+            _apply_high_level_status(req, item.new_status)
+            _track_open_change(db, req, was_open)
+            event_type = "status"
+
+        if item.detailed_status:
+            log_rows.append(_status_log_row(req, req.status, item.detailed_status, updated_by, item.reason))
+            _apply_detailed_status(
+                req,
+                item.detailed_status,
+                test_progress=req.current_progress,
+                reason=item.reason
+            )
+            event_type = "status"
+
+        extra = {"progress_percent": item.progress_percent, "notes": item.notes} if event_type == "progress" else {}
+        publish_lab_update(db, req, event_type, **extra)
+        touched[req.id] = event_type
+
+        results.append({
+            "index": index,
+            "lab_request_id": req.id,
+            "ok": True,
+            "status": req.status,
+            "detailed_status": req.detailed_status
+        })
+
+    if log_rows:
+        db.execute(insert(LabRequestStatusLog).values(log_rows))
+    if progress_rows:
+        db.execute(insert(LabRequestProgress).values(progress_rows))
+
+    record_changes(db, "lab_request", touched)
+    enqueue_lab_syncs(db, touched)
+
+    db.commit()
+
+    failed = sum(1 for r in results if not r["ok"])
+    print(f"✅ Bulk lab update: {len(results) - failed} applied, {failed} failed")
+
+    return {"updated": len(results) - failed, "failed": failed, "results": results}
+
+
 # --------------------------------------------------------
 # CREATE SCHEDULE ENTRY
 # --------------------------------------------------------
+def _begin_write(db: Session):
+    """
+    Take SQLite's write lock now (BEGIN IMMEDIATE) instead of at the first
+    INSERT, so a check made afterwards cannot be invalidated by another
+    worker before this transaction commits. A transaction that already
+    wrote holds the lock.
+    """
+    connection = db.connection()
+    if connection.dialect.name != "sqlite":
+        return
+    if not connection.connection.driver_connection.in_transaction:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
 def create_lab_schedule(db: Session, lab_request_id: int, engineer_id: int, start, end, status):
+    if status != "Cancelled":
+        # ✅ Check and insert in one write transaction: two concurrent
+        # bookings for the same engineer cannot both pass the check
+        _begin_write(db)
+        conflicts = find_schedule_conflicts(db, engineer_id, start, end)
+        if conflicts:
+            db.rollback()
+            raise ScheduleConflictError(engineer_id, conflicts)
+
     sched = LabSchedule(
         lab_request_id=lab_request_id,
         engineer_id=engineer_id,
@@ -406,10 +956,70 @@ def create_lab_schedule(db: Session, lab_request_id: int, engineer_id: int, star
     )
 
     db.add(sched)
+    if status != "Cancelled" and end > datetime.utcnow():
+        engineer_load.adjust(db, engineer_id, 1)
+    record_change(db, "lab_request", lab_request_id)
     db.commit()
+    db.refresh(sched)
     return sched
 
 
+# --------------------------------------------------------
+# SCHEDULE CONFLICTS + COMMON FREE SLOTS
+# --------------------------------------------------------
+class ScheduleConflictError(ValueError):
+    def __init__(self, engineer_id: int, conflicts: list):
+        self.engineer_id = engineer_id
+        self.conflicts = conflicts
+        windows = ", ".join(
+            f"#{c.id} {c.start_datetime:%Y-%m-%d %H:%M}-{c.end_datetime:%H:%M}" for c in conflicts
+        )
+        super().__init__(f"Engineer {engineer_id} is already booked: {windows}")
+
+
+def _booked_entries(db: Session, engineer_ids: list, start, end):
+    """
+    Non-cancelled schedule entries of ``engineer_ids`` overlapping [start, end).
+    Served by ix_lab_schedule_engineer_window: the range on end_datetime
+    skips everything that finished before ``start``.
+    """
+    query = db.query(LabSchedule).filter(
+        LabSchedule.engineer_id.in_(engineer_ids),
+        LabSchedule.end_datetime > start,
+        LabSchedule.schedule_status != "Cancelled"
+    )
+    if end is not None:
+        query = query.filter(LabSchedule.start_datetime < end)
+    return query
+
+
+def find_schedule_conflicts(db: Session, engineer_id: int, start, end):
+    return _booked_entries(db, [engineer_id], start, end).order_by(LabSchedule.start_datetime).all()
+
+
+def find_common_free_slot(db: Session, engineer_ids: list, duration: timedelta, after, horizon: timedelta):
+    """
+    Earliest window of ``duration`` starting at or after ``after`` in which
+    none of ``engineer_ids`` is booked. One indexed query, then a sweep over
+    the merged busy intervals. Returns (start, end) or None.
+    """
+    horizon_end = after + horizon
+    busy = _booked_entries(db, engineer_ids, after, horizon_end).with_entities(
+        LabSchedule.start_datetime,
+        LabSchedule.end_datetime
+    ).order_by(LabSchedule.start_datetime).all()
+
+    candidate = after
+    for busy_start, busy_end in busy:
+        if busy_start - candidate >= duration:
+            break
+        candidate = max(candidate, busy_end)
+
+    if candidate + duration > horizon_end:
+        return None
+    return candidate, candidate + duration
+
+
 # --------------------------------------------------------
 # DOCUMENT UPLOAD HANDLER
 # --------------------------------------------------------
@@ -443,6 +1053,7 @@ def upload_lab_documents(db: Session, lab_request_id: int, files, doc_types, upl
         db.add(doc)
         saved.append(doc)
 
+    record_change(db, "lab_request", lab_request_id)
     db.commit()
     return saved
 
@@ -459,5 +1070,6 @@ def delete_lab_document(db: Session, document_id: int):
         return False
 
     db.delete(doc)
+    record_change(db, "lab_request", doc.lab_request_id)
     db.commit()
     return True
\ No newline at end of file
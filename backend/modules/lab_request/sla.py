@@ -0,0 +1,131 @@
+# backend/modules/lab_request/sla.py
+"""
+SLA breach detection for lab requests stuck in a detailed status.
+
+For every status with an SLA the check is one range scan on
+ix_lab_requests_status_entered:
+
+    detailed_status = :status AND status_entered_at < now - sla
+
+so it only reads requests currently sitting in that status past their
+deadline; completed history is never touched. Requests that already have an
+open alert for this stay in the status are skipped by an anti-join, so a
+run only handles new breaches however long the backlog is. New breaches are
+stored in lab_sla_alerts (deduplicated per request/status/entry time) and
+alerts whose request has moved on are resolved.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, exists, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from core.background import register_job
+from core.config import get_settings
+from core.database import SessionLocal
+from core.events import publish_on_commit
+
+from .models import LabRequest, LabSlaAlert
+
+SLA_ALERTS_TOPIC = "lab_sla_alerts"
+
+settings = get_settings()
+
+# 4 bound parameters per row: keep each INSERT well under SQLite's limit
+_INSERT_CHUNK = 500
+
+
+def check_sla_breaches(db: Session = None, now: datetime = None):
+    """Record new breaches and resolve finished ones. Returns counts."""
+    own_session = db is None
+    db = db or SessionLocal()
+    now = now or datetime.utcnow()
+    try:
+        # Open alert for the request's current stay in its status. julianday()
+        # because server defaults and Python-bound values are stored in
+        # slightly different text formats.
+        already_alerted = exists().where(and_(
+            LabSlaAlert.lab_request_id == LabRequest.id,
+            LabSlaAlert.detailed_status == LabRequest.detailed_status,
+            LabSlaAlert.resolved_at.is_(None),
+            func.julianday(LabSlaAlert.status_entered_at) == func.julianday(LabRequest.status_entered_at)
+        ))
+
+        new_alerts = []
+        for detailed_status, hours in settings.LAB_STATUS_SLA_HOURS.items():
+            deadline = now - timedelta(hours=float(hours))
+            for lab_request_id, entered_at in db.query(
+                LabRequest.id, LabRequest.status_entered_at
+            ).filter(
+                LabRequest.detailed_status == detailed_status,
+                LabRequest.status_entered_at < deadline,
+                ~already_alerted
+            ):
+                new_alerts.append({
+                    "lab_request_id": lab_request_id,
+                    "detailed_status": detailed_status,
+                    "status_entered_at": entered_at,
+                    "sla_hours": hours
+                })
+
+        created = 0
+        for i in range(0, len(new_alerts), _INSERT_CHUNK):
+            result = db.execute(
+                sqlite_insert(LabSlaAlert).values(new_alerts[i:i + _INSERT_CHUNK]).on_conflict_do_nothing(
+                    index_elements=["lab_request_id", "detailed_status", "status_entered_at"]
+                ).returning(LabSlaAlert.id, LabSlaAlert.lab_request_id, LabSlaAlert.detailed_status)
+            ).all()
+            created += len(result)
+            for alert_id, lab_request_id, detailed_status in result:
+                publish_on_commit(db, SLA_ALERTS_TOPIC, {
+                    "type": "sla_breach",
+                    "alert_id": alert_id,
+                    "lab_request_id": lab_request_id,
+                    "detailed_status": detailed_status
+                })
+
+        # Resolve open alerts whose request left the status (or re-entered it
+        # later)
+        still_stuck = exists().where(and_(
+            LabRequest.id == LabSlaAlert.lab_request_id,
+            LabRequest.detailed_status == LabSlaAlert.detailed_status,
+            func.julianday(LabRequest.status_entered_at) == func.julianday(LabSlaAlert.status_entered_at)
+        ))
+        resolved = db.query(LabSlaAlert).filter(
+            LabSlaAlert.resolved_at.is_(None),
+            ~still_stuck
+        ).update({LabSlaAlert.resolved_at: now}, synchronize_session=False)
+
+        db.commit()
+
+        if created:
+            print(f"⚠️ SLA: {created} new breach(es), {resolved} resolved")
+
+        return {"new": created, "resolved": resolved}
+
+    finally:
+        if own_session:
+            db.close()
+
+
+def get_sla_alerts(db: Session, open_only: bool = True, limit: int = 200):
+    query = db.query(LabSlaAlert)
+    if open_only:
+        query = query.filter(LabSlaAlert.resolved_at.is_(None))
+    alerts = query.order_by(LabSlaAlert.detected_at.desc(), LabSlaAlert.id.desc()).limit(limit).all()
+
+    return [
+        {
+            "id": a.id,
+            "lab_request_id": a.lab_request_id,
+            "detailed_status": a.detailed_status,
+            "status_entered_at": a.status_entered_at.isoformat() if a.status_entered_at else None,
+            "sla_hours": float(a.sla_hours),
+            "detected_at": a.detected_at.isoformat() if a.detected_at else None,
+            "resolved_at": a.resolved_at.isoformat() if a.resolved_at else None
+        }
+        for a in alerts
+    ]
+
+
+sla_job = register_job("sla_breach_check", settings.SLA_CHECK_SECONDS, check_sla_breaches)
@@ -2,6 +2,9 @@
 """
 Configuration for status mapping between lab and customer views
 """
+from types import MappingProxyType
+
+from core.http_cache import CachedPayload
 
 # Detailed status definitions with customer-facing information
 STATUS_DEFINITIONS = {
@@ -233,6 +236,128 @@ MILESTONE_ORDER = [
 ]
 
 
+# ============================================================
+# COMPILED LOOKUP TABLES
+# Built once at import from the definitions above; read-only afterwards.
+# ============================================================
+STOPPED_CATEGORY = "stopped"
+FINAL_CATEGORY = "final"
+
+# Every table below is derived from the definitions: freeze them too
+STATUS_DEFINITIONS = MappingProxyType({
+    status: MappingProxyType(info) for status, info in STATUS_DEFINITIONS.items()
+})
+
+CATEGORY_BY_STATUS = MappingProxyType({
+    status: info["category"] for status, info in STATUS_DEFINITIONS.items()
+})
+
+STATUSES_BY_CATEGORY = MappingProxyType({
+    category: tuple(s for s, c in CATEGORY_BY_STATUS.items() if c == category)
+    for category in dict.fromkeys(CATEGORY_BY_STATUS.values())
+})
+
+HIGH_LEVEL_BY_DETAILED = MappingProxyType({
+    detailed: high_level
+    for high_level, detailed_list in HIGH_LEVEL_TO_DETAILED.items()
+    for detailed in detailed_list
+})
+
+ACTION_REQUIRED_STATUSES = frozenset(
+    status for status, info in STATUS_DEFINITIONS.items() if info.get("action_required")
+)
+
+# Normal forward path through the workflow (definition order)
+WORKFLOW_PATH = tuple(
+    status for status, category in CATEGORY_BY_STATUS.items()
+    if category not in (STOPPED_CATEGORY, FINAL_CATEGORY)
+)
+FINAL_STATUSES = STATUSES_BY_CATEGORY.get(FINAL_CATEGORY, ())
+STOPPED_STATUSES = STATUSES_BY_CATEGORY.get(STOPPED_CATEGORY, ())
+
+
+def _compile_transitions():
+    """
+    Allowed detailed-status moves:
+    - along the workflow path, forward only (skipping stages is allowed)
+    - from any open status to a final or stopped status
+    - between final statuses in order (Completed -> Certificate Issued)
+    - "On Hold" resumes to any workflow status
+    - other stopped statuses are terminal
+    Staying in the same status is always allowed.
+    """
+    transitions = {}
+    for i, status in enumerate(WORKFLOW_PATH):
+        transitions[status] = frozenset(WORKFLOW_PATH[i:] + FINAL_STATUSES + STOPPED_STATUSES)
+    for i, status in enumerate(FINAL_STATUSES):
+        transitions[status] = frozenset(FINAL_STATUSES[i:])
+    for status in STOPPED_STATUSES:
+        transitions[status] = frozenset((status,))
+    if "On Hold" in transitions:
+        transitions["On Hold"] = frozenset(WORKFLOW_PATH + STOPPED_STATUSES)
+    return MappingProxyType(transitions)
+
+
+ALLOWED_TRANSITIONS = _compile_transitions()
+
+
+def _base_status_info(info):
+    base = dict(info)
+    base["progress"] = info.get("progress_base", 0)
+    return base
+
+
+# Static customer info per status; get_status_info() only copies when a
+# message needs {progress}/{reason} filled in
+_STATUS_INFO = MappingProxyType({
+    status: MappingProxyType(_base_status_info(info)) for status, info in STATUS_DEFINITIONS.items()
+})
+
+
+def _build_timeline(current_detailed_status):
+    timeline = []
+    current_reached = False
+    
+    for milestone in MILESTONE_ORDER:
+        if milestone == current_detailed_status:
+            status = "current"
+            current_reached = True
+        elif not current_reached:
+            status = "completed"
+        else:
+            status = "pending"
+        
+        milestone_info = STATUS_DEFINITIONS.get(milestone, {})
+        timeline.append({
+            "name": milestone,
+            "customer_name": milestone_info.get("customer_status", milestone),
+            "status": status,
+            "icon": milestone_info.get("icon", "circle"),
+            "color": milestone_info.get("color", "gray")
+        })
+    
+    return tuple(timeline)
+
+
+TIMELINES = MappingProxyType({
+    status: _build_timeline(status) for status in STATUS_DEFINITIONS
+})
+
+# Unknown statuses never match a milestone, so they all share one timeline
+_FALLBACK_TIMELINE = _build_timeline(None)
+
+
+def is_transition_allowed(current_status, new_status):
+    """
+    O(1) check against ALLOWED_TRANSITIONS. Unknown current statuses
+    (legacy data) may move to any known status.
+    """
+    if new_status not in STATUS_DEFINITIONS:
+        return False
+    allowed = ALLOWED_TRANSITIONS.get(current_status)
+    return allowed is None or new_status in allowed
+
+
 def get_status_info(detailed_status, test_progress=None, reason=None):
     """
     Get complete status information for customer display
@@ -243,9 +368,12 @@ def get_status_info(detailed_status, test_progress=None, reason=None):
         reason: Optional reason for rejection/hold
     
     Returns:
-        Dictionary with status information
+        Status information: the shared read-only mapping when nothing is
+        filled in, otherwise a fresh dict
     """
-    if detailed_status not in STATUS_DEFINITIONS:
+    info = _STATUS_INFO.get(detailed_status)
+
+    if info is None:
         # Fallback for unknown status
         return {
             "category": "unknown",
@@ -257,21 +385,25 @@ def get_status_info(detailed_status, test_progress=None, reason=None):
             "action_required": False
         }
     
-    info = STATUS_DEFINITIONS[detailed_status].copy()
+    message = info["message"]
+    dynamic_progress = "progress_formula" in info and test_progress is not None
+    fill_progress = "{progress}" in message and test_progress is not None
+    fill_reason = "{reason}" in message and reason
+
+    if not (dynamic_progress or fill_progress or fill_reason):
+        return info
+
+    info = dict(info)
     
     # Calculate progress
-    if "progress_formula" in info and test_progress is not None:
+    if dynamic_progress:
         # Dynamic progress calculation for "In Progress" status
-        progress = 40 + (test_progress * 0.4)
-        info["progress"] = int(progress)
-    else:
-        info["progress"] = info.get("progress_base", 0)
+        info["progress"] = int(40 + (test_progress * 0.4))
     
     # Format message with variables
-    message = info["message"]
-    if "{progress}" in message and test_progress is not None:
+    if fill_progress:
         message = message.format(progress=test_progress)
-    if "{reason}" in message and reason:
+    if fill_reason:
         message = message.format(reason=reason)
     
     info["message"] = message
@@ -287,27 +419,28 @@ def get_customer_timeline(current_detailed_status):
         current_detailed_status: Current detailed status
     
     Returns:
-        List of milestone dictionaries with status (completed, current, pending)
+        Precomputed tuple of milestone dictionaries with status
+        (completed, current, pending); shared, treat as read-only
     """
-    timeline = []
-    current_reached = False
-    
-    for milestone in MILESTONE_ORDER:
-        if milestone == current_detailed_status:
-            status = "current"
-            current_reached = True
-        elif not current_reached:
-            status = "completed"
-        else:
-            status = "pending"
-        
-        milestone_info = STATUS_DEFINITIONS.get(milestone, {})
-        timeline.append({
-            "name": milestone,
-            "customer_name": milestone_info.get("customer_status", milestone),
-            "status": status,
-            "icon": milestone_info.get("icon", "circle"),
-            "color": milestone_info.get("color", "gray")
-        })
-    
-    return timeline
\ No newline at end of file
+    return TIMELINES.get(current_detailed_status, _FALLBACK_TIMELINE)
+
+
+def _public_config():
+    return {
+        "statuses": {
+            status: {key: value for key, value in info.items() if key != "progress_formula"}
+            for status, info in _STATUS_INFO.items()
+        },
+        "high_level_to_detailed": HIGH_LEVEL_TO_DETAILED,
+        "high_level_by_detailed": dict(HIGH_LEVEL_BY_DETAILED),
+        "categories": {category: list(statuses) for category, statuses in STATUSES_BY_CATEGORY.items()},
+        "action_required": sorted(ACTION_REQUIRED_STATUSES),
+        "milestone_order": MILESTONE_ORDER,
+        "workflow_path": list(WORKFLOW_PATH),
+        "transitions": {status: sorted(allowed) for status, allowed in ALLOWED_TRANSITIONS.items()},
+        "timelines": {status: list(timeline) for status, timeline in TIMELINES.items()}
+    }
+
+
+# Serialized once for the /status-config endpoint
+STATUS_CONFIG = CachedPayload(_public_config())
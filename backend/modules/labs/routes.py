@@ -1,7 +1,11 @@
-from fastapi import APIRouter, HTTPException, Query
+import time
+from fastapi import APIRouter, HTTPException, Query, Request
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from pathlib import Path
+from core.config import get_settings
+from core.http_cache import CachedPayload, cached_json_response
+from core.single_flight import single_flight, request_key
 
 router = APIRouter(prefix="/labs", tags=["Labs"])
 
@@ -17,6 +21,12 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+settings = get_settings()
+
+# ✅ labs.db only changes when it is reseeded: keep the filters payload (with
+# its ETag and compressed bytes) for LABS_FILTERS_TTL seconds
+_filters_payload = None   # (expires_at, CachedPayload)
+
 
 # ---------- ROUTES ----------
 
@@ -45,8 +55,12 @@ def get_labs(
             query += " AND LOWER(TRIM(city)) = LOWER(TRIM(:city))"
             params["city"] = city
 
-        with engine.connect() as db:
-            rows = db.execute(text(query), params).fetchall()
+        def load():
+            with engine.connect() as db:
+                return db.execute(text(query), params).fetchall()
+
+        # ✅ Identical concurrent calls share one query
+        rows = single_flight.do(request_key("labs:list", country=country, state=state, city=city), load)
 
         return [
             {
@@ -65,11 +79,12 @@ def get_labs(
 
 
 @router.get("/filters")
-def get_lab_filters():
+def get_lab_filters(request: Request):
     """
     Returns distinct states and cities for dropdown filters.
     """
-    try:
+    global _filters_payload
+    def load():
         with engine.connect() as db:
             states = [
                 r[0]
@@ -95,10 +110,18 @@ def get_lab_filters():
                 )
             ]
 
-        return {"states": states, "cities": cities}
+        return CachedPayload({"states": states, "cities": cities})
 
-    except Exception as e:
-        raise HTTPException(500, f"Failed to load filters: {str(e)}")
+    cached = _filters_payload
+    if cached is None or cached[0] <= time.monotonic():
+        try:
+            # ✅ Identical concurrent calls share one query
+            payload = single_flight.do(request_key("labs:filters"), load)
+        except Exception as e:
+            raise HTTPException(500, f"Failed to load filters: {str(e)}")
+        cached = _filters_payload = (time.monotonic() + settings.LABS_FILTERS_TTL, payload)
+
+    return cached_json_response(request, cached[1], max_age=300)
 
 
 @router.get("/cities")
@@ -120,8 +143,11 @@ def get_cities(state: str | None = Query(None)):
 
         query += " ORDER BY TRIM(city)"
 
-        with engine.connect() as db:
-            rows = db.execute(text(query), params).fetchall()
+        def load():
+            with engine.connect() as db:
+                return db.execute(text(query), params).fetchall()
+
+        rows = single_flight.do(request_key("labs:cities", state=state), load)
 
         return [r[0] for r in rows]
 
@@ -0,0 +1,40 @@
+from sqlalchemy import text, bindparam
+
+from .routes import engine
+
+
+def resolve_labs(selected_labs):
+    """
+    Map the lab names (or ids) a customer selected to rows of the labs
+    directory. Returns [{"id", "lab_name"}] in selection order; entries
+    that match no lab are skipped.
+    """
+    names = [str(s).strip() for s in selected_labs or [] if str(s).strip()]
+    if not names:
+        return []
+
+    ids = [int(n) for n in names if n.isdigit()]
+
+    try:
+        with engine.connect() as db:
+            rows = db.execute(
+                text("SELECT id, TRIM(lab) AS lab FROM labs WHERE TRIM(lab) IN :names OR id IN :ids").bindparams(
+                    bindparam("names", expanding=True),
+                    bindparam("ids", expanding=True)
+                ),
+                {"names": names, "ids": ids or [-1]}
+            ).fetchall()
+    except Exception as e:
+        print(f"⚠️ Could not resolve labs: {str(e)}")
+        return []
+
+    by_name = {r.lab: r for r in rows}
+    by_id = {r.id: r for r in rows}
+
+    resolved = {}
+    for name in names:
+        row = by_name.get(name) or (by_id.get(int(name)) if name.isdigit() else None)
+        if row:
+            resolved.setdefault(row.id, {"id": row.id, "lab_name": row.lab})
+
+    return list(resolved.values())
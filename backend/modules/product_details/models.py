@@ -1,5 +1,5 @@
 # modules/product_details/models.py
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from sqlalchemy.sql import func
 from core.database import Base
 
@@ -40,4 +40,11 @@ class ProductDetailsSubmission(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # ✅ NEW: Authenticated user who submitted the form (None = anonymous)
+    owner_id = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_product_details_submissions_owner_created", "owner_id", "created_at"),
+    )
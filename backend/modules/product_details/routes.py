@@ -2,6 +2,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from core.database import get_db
+from core.single_flight import single_flight, request_key
+from modules.auth.dependencies import (
+    get_current_user,
+    get_optional_user_id,
+    get_owner_scope,
+    owner_scope,
+    require_owner
+)
+from modules.auth.token_cache import CurrentUser
+from .models import ProductDetailsSubmission
 from . import services, schemas
 from typing import List, Optional
 
@@ -16,7 +26,8 @@ router = APIRouter(prefix="/product-details", tags=["Product Details"])
 )
 def submit_product_details(
     payload: schemas.ProductDetailsSubmissionCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    owner_id: Optional[int] = Depends(get_optional_user_id)
 ):
     """
     Submit product details form
@@ -24,7 +35,7 @@ def submit_product_details(
     - Creates a new submission with type 'submit'
     """
     payload.submission_type = 'submit'
-    submission = services.create_product_details_submission(db, payload)
+    submission = services.create_product_details_submission(db, payload, owner_id=owner_id)
     return submission
 
 
@@ -35,7 +46,8 @@ def submit_product_details(
 )
 def request_quote(
     payload: schemas.ProductDetailsSubmissionCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    owner_id: Optional[int] = Depends(get_optional_user_id)
 ):
     """
     Request a quote for product details
@@ -43,7 +55,7 @@ def request_quote(
     - Creates a new submission with type 'quote'
     """
     payload.submission_type = 'quote'
-    submission = services.create_product_details_submission(db, payload)
+    submission = services.create_product_details_submission(db, payload, owner_id=owner_id)
     return submission
 
 
@@ -53,11 +65,13 @@ def request_quote(
 )
 def get_submission(
     submission_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get a specific submission by ID
     """
+    require_owner(db, ProductDetailsSubmission, submission_id, user)
     submission = services.get_submission_by_id(db, submission_id)
     
     if not submission:
@@ -77,14 +91,23 @@ def list_submissions(
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    owner_id: Optional[int] = Depends(get_owner_scope)
 ):
     """
     List all submissions with optional filtering
     - Query params: skip, limit, status
+    - Customers only see their own submissions, staff see all
     """
-    submissions = services.get_all_submissions(db, skip, limit, status)
-    return submissions
+    # ✅ Identical concurrent calls share one query. Rows are converted in the
+    # leader so no caller serializes ORM objects bound to another's session
+    return single_flight.do(
+        request_key("product_details:list", scope=owner_id, skip=skip, limit=limit, status=status),
+        lambda: [
+            schemas.ProductDetailsSubmissionResponse.model_validate(s)
+            for s in services.get_all_submissions(db, skip, limit, status, owner_id=owner_id)
+        ]
+    )
 
 
 @router.get(
@@ -93,12 +116,14 @@ def list_submissions(
 )
 def get_submissions_by_email(
     email: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
     """
     Get all submissions for a specific email
+    - Customers only see their own submissions, staff see all
     """
-    submissions = services.get_submissions_by_email(db, email)
+    submissions = services.get_submissions_by_email(db, email, owner_id=owner_scope(user))
     return submissions
 
 
@@ -2,12 +2,14 @@
 from sqlalchemy.orm import Session
 from .models import ProductDetailsSubmission
 from .schemas import ProductDetailsSubmissionCreate
+from modules.changes.services import record_change
 from typing import Optional
 
 
 def create_product_details_submission(
     db: Session,
-    payload: ProductDetailsSubmissionCreate
+    payload: ProductDetailsSubmissionCreate,
+    owner_id: Optional[int] = None
 ) -> ProductDetailsSubmission:
     """
     Create a new product details submission
@@ -34,10 +36,13 @@ def create_product_details_submission(
         
         # Submission type
         submission_type=payload.submission_type,
-        status='pending'
+        status='pending',
+        owner_id=owner_id
     )
     
     db.add(submission)
+    db.flush()
+    record_change(db, "product_details", submission.id)
     db.commit()
     db.refresh(submission)
     return submission
@@ -59,13 +64,18 @@ def get_all_submissions(
     db: Session,
     skip: int = 0,
     limit: int = 100,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    owner_id: Optional[int] = None
 ):
     """
     Get all submissions with optional filtering
+    (owner_id: only that user's, newest first via the owner/created_at index)
     """
     query = db.query(ProductDetailsSubmission)
     
+    if owner_id is not None:
+        query = query.filter(ProductDetailsSubmission.owner_id == owner_id)
+    
     if status:
         query = query.filter(ProductDetailsSubmission.status == status)
     
@@ -88,6 +98,7 @@ def update_submission_status(
         return None
     
     submission.status = new_status
+    record_change(db, "product_details", submission.id)
     db.commit()
     db.refresh(submission)
     return submission
@@ -95,13 +106,17 @@ def update_submission_status(
 
 def get_submissions_by_email(
     db: Session,
-    email: str
+    email: str,
+    owner_id: Optional[int] = None
 ):
     """
-    Get all submissions by email address
+    Get all submissions by email address (owner_id: only that user's)
     """
-    return db.query(ProductDetailsSubmission).filter(
+    query = db.query(ProductDetailsSubmission).filter(
         ProductDetailsSubmission.email == email
-    ).order_by(
+    )
+    if owner_id is not None:
+        query = query.filter(ProductDetailsSubmission.owner_id == owner_id)
+    return query.order_by(
         ProductDetailsSubmission.created_at.desc()
     ).all()
\ No newline at end of file
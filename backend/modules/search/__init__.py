@@ -0,0 +1,13 @@
+# Global Request Search Module
+from .routes import router
+from .models import SearchIndexEntry
+from .services import normalize_term, index_product, remove_from_index, search_requests
+
+__all__ = [
+    "router",
+    "SearchIndexEntry",
+    "normalize_term",
+    "index_product",
+    "remove_from_index",
+    "search_requests",
+]
@@ -0,0 +1,38 @@
+# backend/modules/search/models.py
+
+from sqlalchemy import Column, Integer, String, DateTime, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from core.database import Base
+
+
+class SearchIndexEntry(Base):
+    """
+    One row per service request with searchable product fields, written
+    by the save_*_product_details services. *_norm columns hold
+    normalize_term() values so lookups are B-tree range scans.
+    """
+    __tablename__ = "search_index"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)        # calibration, testing, design, ...
+    record_id = Column(Integer, nullable=False)
+
+    product_name = Column(String, nullable=True)
+    manufacturer = Column(String, nullable=True)
+    model_no = Column(String, nullable=True)
+    serial_no = Column(String, nullable=True)
+
+    product_name_norm = Column(String, nullable=True)
+    model_no_norm = Column(String, nullable=True)
+    serial_no_norm = Column(String, nullable=True)
+    serial_no_rev_norm = Column(String, nullable=True)  # reversed: "ends with" lookups
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("kind", "record_id", name="uq_search_index_record"),
+        Index("ix_search_index_product_name", "product_name_norm"),
+        Index("ix_search_index_model_no", "model_no_norm"),
+        Index("ix_search_index_serial_no", "serial_no_norm"),
+        Index("ix_search_index_serial_no_rev", "serial_no_rev_norm"),
+    )
@@ -0,0 +1,28 @@
+# backend/modules/search/routes.py
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from core.database import get_db
+from modules.auth.dependencies import get_owner_scope
+from . import services
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+# "" so /search?q= is served directly instead of a redirect to /search/
+@router.get("")
+def search(
+    q: str = Query(..., min_length=2, description="Serial number, model number or product name"),
+    kind: Optional[List[str]] = Query(None, description="Restrict to services, e.g. ?kind=calibration&kind=testing"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    owner_id: Optional[int] = Depends(get_owner_scope)
+):
+    """
+    Requests across all services whose serial number / model number /
+    product name starts with `q` (serial numbers also match on their ending).
+    Punctuation, spaces and case are ignored. Customers only find their own
+    requests.
+    """
+    return {"query": q, "results": services.search_requests(db, q, kinds=kind, limit=limit, owner_id=owner_id)}
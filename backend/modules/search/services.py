@@ -0,0 +1,163 @@
+# backend/modules/search/services.py
+"""
+Global request search over product name, model number and serial number.
+
+Values are normalized (lower-case, letters and digits only) so that
+"SN-123 456", "sn123456" and "SN123456" are the same key. A search is one
+UNION ALL of B-tree range scans:
+
+    serial_no_norm      prefix   "SN1234..."
+    serial_no_rev_norm  prefix   "...456789" (serial ends with)
+    model_no_norm       prefix
+    product_name_norm   prefix
+
+Customers only find their own requests: each branch is restricted to
+record ids from the owner index of the request tables.
+"""
+import re
+
+from sqlalchemy import select, literal, union_all, and_, or_, table, column
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .models import SearchIndexEntry
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+# kind -> request table (lightweight: the service modules import this one)
+_REQUEST_TABLES = {
+    kind: table(f"{kind}_requests", column("id"), column("owner_id"))
+    for kind in ("calibration", "testing", "design", "simulation", "certification", "debugging")
+}
+
+# Ranking of the ways a row can match (lower is better)
+_MATCH_RANK = {"serial_no": 0, "serial_no_suffix": 1, "model_no": 2, "product_name": 3}
+
+
+def normalize_term(value):
+    if value is None:
+        return None
+    return _NON_ALNUM.sub("", str(value).lower()) or None
+
+
+# --------------------------------------------------------
+# SYNC (called from the save_*_product_details services)
+# --------------------------------------------------------
+def index_product(
+    db: Session,
+    kind: str,
+    record_id: int,
+    product_name: str = None,
+    model_no: str = None,
+    serial_no: str = None,
+    manufacturer: str = None
+):
+    """Upsert the search row for (kind, record_id). Call before commit."""
+    serial_norm = normalize_term(serial_no)
+    values = {
+        "kind": kind,
+        "record_id": record_id,
+        "product_name": product_name,
+        "manufacturer": manufacturer,
+        "model_no": model_no,
+        "serial_no": serial_no,
+        "product_name_norm": normalize_term(product_name),
+        "model_no_norm": normalize_term(model_no),
+        "serial_no_norm": serial_norm,
+        "serial_no_rev_norm": serial_norm[::-1] if serial_norm else None
+    }
+    stmt = sqlite_insert(SearchIndexEntry).values(values)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["kind", "record_id"],
+        set_={key: stmt.excluded[key] for key in values if key not in ("kind", "record_id")}
+    ))
+
+
+def remove_from_index(db: Session, kind: str, record_ids):
+    """Drop search rows of deleted requests. Call before commit."""
+    record_ids = list(record_ids)
+    if record_ids:
+        db.query(SearchIndexEntry).filter(
+            SearchIndexEntry.kind == kind,
+            SearchIndexEntry.record_id.in_(record_ids)
+        ).delete(synchronize_session=False)
+
+
+# --------------------------------------------------------
+# SEARCH
+# --------------------------------------------------------
+def _prefix_range(column, term):
+    # term + every longer key that starts with it; "~" sorts after [0-9a-z]
+    return and_(column >= term, column < term + "~")
+
+
+def _owned_by(owner_id: int):
+    return or_(*(
+        and_(
+            SearchIndexEntry.kind == kind,
+            SearchIndexEntry.record_id.in_(select(requests.c.id).where(requests.c.owner_id == owner_id))
+        )
+        for kind, requests in _REQUEST_TABLES.items()
+    ))
+
+
+def search_requests(db: Session, q: str, kinds: list = None, limit: int = 20, owner_id: int = None):
+    """owner_id: only that customer's requests (None: every request, for staff)"""
+    term = normalize_term(q)
+    if not term:
+        return []
+
+    columns = (
+        SearchIndexEntry.kind,
+        SearchIndexEntry.record_id,
+        SearchIndexEntry.product_name,
+        SearchIndexEntry.manufacturer,
+        SearchIndexEntry.model_no,
+        SearchIndexEntry.serial_no,
+        SearchIndexEntry.updated_at
+    )
+    branches = []
+    for matched_on, column, key in (
+        ("serial_no", SearchIndexEntry.serial_no_norm, term),
+        ("serial_no_suffix", SearchIndexEntry.serial_no_rev_norm, term[::-1]),
+        ("model_no", SearchIndexEntry.model_no_norm, term),
+        ("product_name", SearchIndexEntry.product_name_norm, term),
+    ):
+        branch = select(
+            *columns,
+            literal(matched_on).label("matched_on"),
+            (column == key).label("exact")
+        ).where(_prefix_range(column, key))
+        if kinds:
+            branch = branch.where(SearchIndexEntry.kind.in_(kinds))
+        if owner_id is not None:
+            branch = branch.where(_owned_by(owner_id))
+        # Subquery: SQLite only allows LIMIT on a compound member this way
+        branches.append(select(branch.limit(limit).subquery()))
+
+    rows = db.execute(union_all(*branches)).all()
+
+    # A row can match several ways; keep its best match, exact before prefix
+    best = {}
+    for row in rows:
+        rank = (not row.exact, _MATCH_RANK[row.matched_on])
+        key = (row.kind, row.record_id)
+        if key not in best or rank < best[key][0]:
+            best[key] = (rank, row)
+
+    hits = sorted(best.values(), key=lambda item: (item[0], item[1].kind, -item[1].record_id))[:limit]
+
+    return [
+        {
+            "kind": row.kind,
+            "id": row.record_id,
+            "product_name": row.product_name,
+            "manufacturer": row.manufacturer,
+            "model_no": row.model_no,
+            "serial_no": row.serial_no,
+            "matched_on": row.matched_on,
+            "exact": bool(row.exact),
+            "updated_at": row.updated_at
+        }
+        for _, row in hits
+    ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from core.database import Base
 
@@ -10,6 +10,13 @@ class SimulationRequest(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # ✅ NEW: Authenticated user who created the request (None = anonymous)
+    owner_id = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_simulation_requests_owner_created", "owner_id", "created_at"),
+    )
+
 
 class SimulationProductDetails(Base):
     __tablename__ = "simulation_product_details"
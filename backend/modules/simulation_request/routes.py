@@ -1,7 +1,16 @@
 # routes.py
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from typing import Optional
 from core.database import get_db
+from core.batching import batch_response
+from modules.auth.dependencies import (
+    get_current_user,
+    get_optional_user_id,
+    owned_ids,
+    require_owner
+)
+from modules.auth.token_cache import CurrentUser
 from . import services, schemas
 from modules.simulation_request.models import SimulationRequest
 
@@ -21,8 +30,11 @@ def get_request(simulation_request_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/")
-def start_simulation_request(db: Session = Depends(get_db)):
-    return services.create_simulation_request(db)
+def start_simulation_request(
+    db: Session = Depends(get_db),
+    owner_id: Optional[int] = Depends(get_optional_user_id)
+):
+    return services.create_simulation_request(db, owner_id=owner_id)
 
 
 @router.post("/{simulation_request_id}/product")
@@ -68,11 +80,24 @@ def submit(
     return {"status": "submitted"}
 
 
+@router.post("/full:batch")
+def get_full_requests_batch(
+    payload: schemas.SimulationFullBatchSchema,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """Same payload as /{id}/full for every id, loaded with one query per table"""
+    data = services.get_full_simulation_requests(db, owned_ids(db, SimulationRequest, payload.ids, user))
+    return batch_response(payload.ids, data)
+
+
 @router.get("/{simulation_request_id}/full")
 def get_full_request(
     simulation_request_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
+    require_owner(db, SimulationRequest, simulation_request_id, user)
     data = services.get_full_simulation_request(db, simulation_request_id)
 
     if not data:
@@ -1,5 +1,5 @@
 # modules/simulation_request/schemas.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 
 class DimensionsSchema(BaseModel):
@@ -49,3 +49,7 @@ class SimulationTechnicalDocumentsSchema(BaseModel):
 class SimulationDetailsSchema(BaseModel):
     product_type: str
     selected_simulations: List[str]
+
+
+class SimulationFullBatchSchema(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=200)
@@ -1,5 +1,9 @@
 # services.py
 from sqlalchemy.orm import Session
+from core.batching import unique_ids, index_by, group_by
+from core.cache import full_view_cache
+from modules.changes.services import record_change
+from modules.search.services import index_product
 from .models import (
     SimulationRequest,
     SimulationProductDetails,
@@ -11,9 +15,11 @@ from .schemas import (
     SimulationDetailsSchema
 )
 
-def create_simulation_request(db: Session):
-    sr = SimulationRequest(status="submitted")
+def create_simulation_request(db: Session, owner_id: int = None):
+    sr = SimulationRequest(status="submitted", owner_id=owner_id)
     db.add(sr)
+    db.flush()
+    record_change(db, "simulation", sr.id)
     db.commit()
     db.refresh(sr)
     return sr
@@ -27,6 +33,7 @@ def save_draft(db: Session, simulation_request_id: int):
         raise ValueError("SimulationRequest not found")
 
     sr.status = "draft"
+    record_change(db, "simulation", simulation_request_id)
     db.commit()
 
 
@@ -62,6 +69,14 @@ def save_product_details(db: Session,simulation_request_id: int,payload: Simulat
     pd.industry_other = payload.industry_other
     pd.notes = payload.notes
 
+    index_product(
+        db, "simulation", simulation_request_id,
+        product_name=pd.eut_name,
+        model_no=pd.model_no,
+        serial_no=pd.serial_no,
+        manufacturer=pd.manufacturer
+    )
+    record_change(db, "simulation", simulation_request_id)
     db.commit()
 
 
@@ -80,6 +95,7 @@ def save_technical_documents(
         )
         db.add(td)
 
+    record_change(db, "simulation", simulation_request_id)
     db.commit()
 
 def save_simulation_details(db: Session,simulation_request_id: int,payload: SimulationDetailsSchema):
@@ -94,6 +110,7 @@ def save_simulation_details(db: Session,simulation_request_id: int,payload: Simu
     sd.product_type = payload.product_type
     sd.selected_simulations = payload.selected_simulations
 
+    record_change(db, "simulation", simulation_request_id)
     db.commit()
 
 def submit_request(db: Session, simulation_request_id: int):
@@ -105,28 +122,55 @@ def submit_request(db: Session, simulation_request_id: int):
         raise ValueError("SimulationRequest not found")
 
     sr.status = "submitted"
+    record_change(db, "simulation", simulation_request_id)
     db.commit()
 
 def get_full_simulation_request(db: Session, simulation_request_id: int):
-    sr = db.query(SimulationRequest).filter(
-        SimulationRequest.id == simulation_request_id
-    ).first()
+    return get_full_simulation_requests(db, [simulation_request_id]).get(simulation_request_id)
 
-    if not sr:
-        return None
 
-    product = db.query(SimulationProductDetails).filter_by(
-        simulation_request_id=simulation_request_id
-    ).first()
+def get_full_simulation_requests(db: Session, simulation_request_ids: list):
+    """
+    Batch version of get_full_simulation_request: one IN (...) query per table,
+    rows grouped in Python. Returns {simulation_request_id: full_dict}.
+    """
+    ids = unique_ids(simulation_request_ids)
+    if not ids:
+        return {}
 
-    simulation = db.query(SimulationDetails).filter_by(
-        simulation_request_id=simulation_request_id
-    ).first()
+    return full_view_cache.get_many(
+        "simulation", ids, lambda missing: _load_full_simulation_requests(db, missing)
+    )
+
+
+def _load_full_simulation_requests(db: Session, ids: list):
+    srs = db.query(SimulationRequest).filter(SimulationRequest.id.in_(ids)).all()
+    if not srs:
+        return {}
+
+    found_ids = [r.id for r in srs]
+
+    def _children(model):
+        return db.query(model).filter(
+            model.simulation_request_id.in_(found_ids)
+        ).order_by(model.id).all()
+
+    products = index_by(_children(SimulationProductDetails), "simulation_request_id")
+    simulations = index_by(_children(SimulationDetails), "simulation_request_id")
+    documents = group_by(_children(SimulationTechnicalDocument), "simulation_request_id")
+
+    return {
+        sr.id: _build_full_simulation_dict(
+            sr,
+            product=products.get(sr.id),
+            simulation=simulations.get(sr.id),
+            documents=documents.get(sr.id, [])
+        )
+        for sr in srs
+    }
 
-    documents = db.query(SimulationTechnicalDocument).filter(
-        SimulationTechnicalDocument.simulation_request_id == simulation_request_id
-    ).all()
 
+def _build_full_simulation_dict(sr, product, simulation, documents):
     product_dict = None
     if product:
         product_dict = {
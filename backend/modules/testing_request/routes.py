@@ -1,8 +1,16 @@
 # routes.py
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from core.database import get_db
+from core.batching import batch_response
+from modules.auth.dependencies import (
+    get_current_user,
+    get_optional_user_id,
+    owned_ids,
+    require_owner
+)
+from modules.auth.token_cache import CurrentUser
 from . import services, schemas
 from modules.testing_request.models import TestingRequest
 
@@ -21,8 +29,11 @@ def get_request(testing_request_id: int, db: Session = Depends(get_db)):
     return {"id": tr.id, "status": tr.status}
 
 @router.post("/")
-def start_testing_request(db: Session = Depends(get_db)):
-    return services.create_testing_request(db)
+def start_testing_request(
+    db: Session = Depends(get_db),
+    owner_id: Optional[int] = Depends(get_optional_user_id)
+):
+    return services.create_testing_request(db, owner_id=owner_id)
 
 
 @router.post("/{testing_request_id}/product")
@@ -85,7 +96,10 @@ def save_standards(
     payload: schemas.TestingStandardsSchema,
     db: Session = Depends(get_db)
 ):
-    services.save_testing_standards(db, testing_request_id, payload)
+    try:
+        services.save_testing_standards(db, testing_request_id, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {"status": "saved"}
 
 
@@ -109,11 +123,24 @@ def submit(
     return {"status": "submitted"}
 
 
+@router.post("/full:batch")
+def get_full_requests_batch(
+    payload: schemas.TestingFullBatchSchema,
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
+):
+    """Same payload as /{id}/full for every id, loaded with one query per table"""
+    data = services.get_full_testing_requests(db, owned_ids(db, TestingRequest, payload.ids, user))
+    return batch_response(payload.ids, data)
+
+
 @router.get("/{testing_request_id}/full")
 def get_full_request(
     testing_request_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user)
 ):
+    require_owner(db, TestingRequest, testing_request_id, user)
     data = services.get_full_testing_request(db, testing_request_id)
 
     if not data:
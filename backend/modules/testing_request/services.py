@@ -3,6 +3,12 @@
 import os
 from pathlib import Path
 from sqlalchemy.orm import Session
+from core.batching import unique_ids, index_by
+from core.cache import full_view_cache
+from modules.changes.services import record_change
+from modules.search.services import index_product
+from modules.catalog.reference import validate_selection
+from modules.catalog.services import sync_request_standards, sync_request_tests
 from .models import (
     TestingRequest,
     ProductDetails,
@@ -19,9 +25,11 @@ from .schemas import (
     LabSelectionSchema
 )
 
-def create_testing_request(db: Session):
-    tr = TestingRequest(status="submitted")
+def create_testing_request(db: Session, owner_id: int = None):
+    tr = TestingRequest(status="submitted", owner_id=owner_id)
     db.add(tr)
+    db.flush()
+    record_change(db, "testing", tr.id)
     db.commit()
     db.refresh(tr)
     return tr
@@ -35,6 +43,7 @@ def save_draft(db, testing_request_id: int):
         raise ValueError("TestingRequest not found")
 
     tr.status = "draft"
+    record_change(db, "testing", testing_request_id)
     db.commit()
 
 
@@ -71,6 +80,14 @@ def save_product_details(db: Session, testing_request_id: int, payload: ProductD
     pd.preferred_date = payload.preferred_date
     pd.notes = payload.notes
 
+    index_product(
+        db, "testing", testing_request_id,
+        product_name=pd.eut_name,
+        model_no=pd.model_no,
+        serial_no=pd.serial_no,
+        manufacturer=pd.manufacturer
+    )
+    record_change(db, "testing", testing_request_id)
     db.commit()
 
 
@@ -89,6 +106,7 @@ def save_technical_documents(
         )
         db.add(td)
 
+    record_change(db, "testing", testing_request_id)
     db.commit()
 
 def save_uploaded_files(
@@ -145,6 +163,7 @@ def save_uploaded_files(
             "file_size": len(content)
         })
     
+    record_change(db, "testing", testing_request_id)
     db.commit()
     return saved_files
 
@@ -160,9 +179,15 @@ def save_testing_requirements(db: Session, testing_request_id: int, payload: Tes
     tr.test_type = payload.test_type
     tr.selected_tests = payload.selected_tests
 
+    sync_request_tests(db, "testing", testing_request_id, payload.selected_tests)
+    record_change(db, "testing", testing_request_id)
     db.commit()
 
 def save_testing_standards(db: Session, testing_request_id: int, payload: TestingStandardsSchema):
+    # Selections must come from the reference catalog (ids, codes or labels)
+    validate_selection("standard", payload.standards)
+    validate_selection("region", payload.regions)
+
     ts = db.query(TestingStandards).filter(
         TestingStandards.testing_request_id == testing_request_id
     ).first()
@@ -174,6 +199,8 @@ def save_testing_standards(db: Session, testing_request_id: int, payload: Testin
     ts.regions = payload.regions
     ts.standards = payload.standards
 
+    sync_request_standards(db, "testing", testing_request_id, payload.standards, payload.regions)
+    record_change(db, "testing", testing_request_id)
     db.commit()
 
 def save_lab_selection_draft(db: Session, testing_request_id: int, payload: LabSelectionSchema):
@@ -204,6 +231,7 @@ def save_lab_selection_draft(db: Session, testing_request_id: int, payload: LabS
         )
         db.add(lab)
 
+    record_change(db, "testing", testing_request_id)
     db.commit()
     db.refresh(lab)
     return lab
@@ -236,32 +264,57 @@ def submit_request(db: Session, testing_request_id: int, payload: LabSelectionSc
         db.add(lab)
 
     tr.status = "submitted"
+    record_change(db, "testing", testing_request_id)
     db.commit()
 
 def get_full_testing_request(db: Session, testing_request_id: int):
-    tr = db.query(TestingRequest).filter(
-        TestingRequest.id == testing_request_id
-    ).first()
+    return get_full_testing_requests(db, [testing_request_id]).get(testing_request_id)
 
-    if not tr:
-        return None
 
-    product = db.query(ProductDetails).filter_by(
-        testing_request_id=testing_request_id
-    ).first()
+def get_full_testing_requests(db: Session, testing_request_ids: list):
+    """
+    Batch version of get_full_testing_request: one IN (...) query per table,
+    rows grouped in Python. Returns {testing_request_id: full_dict}.
+    """
+    ids = unique_ids(testing_request_ids)
+    if not ids:
+        return {}
 
-    requirements = db.query(TestingRequirements).filter_by(
-        testing_request_id=testing_request_id
-    ).first()
+    return full_view_cache.get_many(
+        "testing", ids, lambda missing: _load_full_testing_requests(db, missing)
+    )
 
-    standards = db.query(TestingStandards).filter_by(
-        testing_request_id=testing_request_id
-    ).first()
 
-    lab = db.query(LabSelection).filter_by(
-        testing_request_id=testing_request_id
-    ).first()
+def _load_full_testing_requests(db: Session, ids: list):
+    trs = db.query(TestingRequest).filter(TestingRequest.id.in_(ids)).all()
+    if not trs:
+        return {}
+
+    found_ids = [r.id for r in trs]
+
+    def _children(model):
+        return db.query(model).filter(
+            model.testing_request_id.in_(found_ids)
+        ).order_by(model.id).all()
+
+    products = index_by(_children(ProductDetails), "testing_request_id")
+    requirements = index_by(_children(TestingRequirements), "testing_request_id")
+    standards = index_by(_children(TestingStandards), "testing_request_id")
+    labs = index_by(_children(LabSelection), "testing_request_id")
+
+    return {
+        tr.id: _build_full_testing_dict(
+            tr,
+            product=products.get(tr.id),
+            requirements=requirements.get(tr.id),
+            standards=standards.get(tr.id),
+            lab=labs.get(tr.id)
+        )
+        for tr in trs
+    }
+
 
+def _build_full_testing_dict(tr, product, requirements, standards, lab):
     # Convert SQLAlchemy objects to dictionaries for proper JSON serialization
     product_dict = None
     if product: